@@ -0,0 +1,86 @@
+from typing import AsyncIterator, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import BaseModel
+
+from app.core.database import get_db
+from app.core.auth import get_current_user
+from app.core.config import settings
+from app.models.user import User
+from app.services.harvest_import import HarvestImporter, iter_csv_rows, iter_ndjson_rows
+
+READ_CHUNK_BYTES = 64 * 1024
+
+
+class RowErrorResponse(BaseModel):
+    row: int
+    message: str
+
+
+class ImportResponse(BaseModel):
+    inserted: int
+    failed: int
+    errors: List[RowErrorResponse]
+
+
+router = APIRouter()
+
+
+def _detect_format(explicit: Optional[str], content_type: str, filename: str = "") -> str:
+    hint = (explicit or f"{content_type} {filename}").lower()
+    if "ndjson" in hint or "jsonl" in hint:
+        return "ndjson"
+    if "csv" in hint:
+        return "csv"
+    raise HTTPException(
+        status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        detail="Send text/csv or application/x-ndjson, or pass ?format=csv|ndjson"
+    )
+
+
+async def _read_upload(upload) -> AsyncIterator[bytes]:
+    while True:
+        chunk = await upload.read(READ_CHUNK_BYTES)
+        if not chunk:
+            break
+        yield chunk
+
+
+@router.post("/import", response_model=ImportResponse)
+async def import_harvests(
+    request: Request,
+    format: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Import harvests from a CSV (with header) or NDJSON body.
+    
+    Accepts a raw streamed body or a multipart upload in the `file` field.
+    Rows are validated and inserted as they are read; invalid rows are
+    reported in `errors` without aborting the import.
+    """
+    content_type = request.headers.get("content-type", "")
+    
+    if content_type.startswith("multipart/form-data"):
+        form = await request.form()
+        upload = form.get("file")
+        if upload is None or isinstance(upload, str):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Missing 'file' upload")
+        file_format = _detect_format(format, upload.content_type or "", upload.filename or "")
+        chunks = _read_upload(upload)
+    else:
+        file_format = _detect_format(format, content_type)
+        chunks = request.stream()
+    
+    rows = iter_csv_rows(chunks) if file_format == "csv" else iter_ndjson_rows(chunks)
+    importer = HarvestImporter(db, current_user.id, chunk_size=settings.HARVEST_IMPORT_CHUNK_SIZE)
+    result = await importer.import_rows(rows)
+    
+    print(f"📥 Imported {result.inserted} harvests for {current_user.id} ({result.failed} rejected)")
+    return ImportResponse(
+        inserted=result.inserted,
+        failed=result.failed,
+        errors=[RowErrorResponse(row=error.row, message=error.message) for error in result.errors]
+    )
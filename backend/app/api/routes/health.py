@@ -1,25 +1,31 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 
 from app.core.database import get_db
 from app.core.hedera import hedera_client
+from app.core.cache import cache_stats
+from app.core.password_hashing import password_hasher
 
 router = APIRouter()
 
 
 @router.get("/health")
-async def health_check(db: Session = Depends(get_db)):
+async def health_check(db: AsyncSession = Depends(get_db)):
     """Health check endpoint"""
     try:
         # Check database connection
-        db.execute(text("SELECT 1"))
+        await db.execute(text("SELECT 1"))
         db_status = "healthy"
     except Exception as e:
         db_status = f"unhealthy: {str(e)}"
     
     # Check Hedera client
-    hedera_status = "healthy" if hedera_client.client else "not configured"
+    # The SDK client is created lazily on the first transaction
+    if hedera_client.client:
+        hedera_status = "healthy"
+    else:
+        hedera_status = "configured" if hedera_client.is_configured else "not configured"
     
     # Check email service configuration
     from app.core.config import settings
@@ -40,6 +46,18 @@ async def health_check(db: Session = Depends(get_db)):
     }
 
 
+@router.get("/health/cache")
+async def cache_health():
+    """Hit/miss counters for the read-through caches"""
+    return cache_stats()
+
+
+@router.get("/health/auth")
+async def auth_health():
+    """bcrypt pool saturation and per-request hashing latency"""
+    return {"password_hashing": password_hasher.stats()}
+
+
 @router.get("/")
 async def root():
     """Root endpoint"""
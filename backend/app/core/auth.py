@@ -4,7 +4,8 @@
 from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.core.database import get_db
@@ -51,7 +52,7 @@ def verify_token(token: str) -> Optional[dict]:
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> User:
     """Get the current authenticated user"""
     credentials_exception = HTTPException(
@@ -78,10 +79,10 @@ async def get_current_user(
     # Try to find user by user_id first (most reliable), then by hedera_account_id
     user = None
     if user_id:
-        user = db.query(User).filter(User.id == user_id).first()
+        user = await db.scalar(select(User).where(User.id == user_id))
     
     if not user and hedera_account_id:
-        user = db.query(User).filter(User.hedera_account_id == hedera_account_id).first()
+        user = await db.scalar(select(User).where(User.hedera_account_id == hedera_account_id))
     
     if user is None:
         raise credentials_exception
@@ -90,7 +91,7 @@ async def get_current_user(
 
 async def get_current_user_optional(
     request: Request,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Optional[User]:
     """Get the current user if authenticated, otherwise return None"""
     try:
@@ -108,13 +109,13 @@ async def get_current_user_optional(
         
         # Try user_id first (most reliable)
         if user_id:
-            user = db.query(User).filter(User.id == user_id).first()
+            user = await db.scalar(select(User).where(User.id == user_id))
             if user:
                 return user
         
         # Fallback to hedera_account_id
         if hedera_account_id:
-            return db.query(User).filter(User.hedera_account_id == hedera_account_id).first()
+            return await db.scalar(select(User).where(User.hedera_account_id == hedera_account_id))
             
         return None
     except:
@@ -0,0 +1,182 @@
+"""
+Tiered read-through cache for external chain API lookups.
+
+Values are kept in a bounded in-process LRU and, when Redis is connected,
+in Redis so every worker shares them. Concurrent misses for the same key
+are coalesced into a single upstream call. Each cache records hit/miss
+counters, exposed through `cache_stats()`.
+"""
+
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Union
+
+from app.core.config import settings
+from app.core.redis_client import redis_client
+
+# TTL policy: seconds, None for "never expires", or a callable deciding per value
+TTL = Union[float, None, Callable[[Any], Optional[float]]]
+
+# Marker returned by TTL callables for values that must not be cached
+NO_CACHE = 0
+
+
+class LocalLRU:
+    """Bounded in-process LRU with per-entry expiry"""
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[Optional[float], Any]]" = OrderedDict()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._entries.pop(key, None)
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def set(self, key: str, value: Any, ttl: Optional[float]) -> None:
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+@dataclass
+class CacheStats:
+    local_hits: int = 0
+    redis_hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    upstream_errors: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.local_hits + self.redis_hits + self.misses
+        return (self.local_hits + self.redis_hits) / lookups if lookups else 0.0
+
+
+class TieredCache:
+    """In-process LRU + Redis read-through cache with request coalescing"""
+
+    def __init__(self, namespace: str, max_size: int = 1024):
+        self.namespace = namespace
+        self.local = LocalLRU(max_size)
+        self.stats = CacheStats()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        _registry[namespace] = self
+
+    def _redis_key(self, key: str) -> str:
+        return f"cache:{self.namespace}:{key}"
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]], ttl: TTL) -> Any:
+        """
+        Return the cached value for `key`, calling `loader` on a miss.
+
+        `None` results are never cached so upstream failures are retried on
+        the next lookup.
+        """
+        found, value = self.local.get(key)
+        if found:
+            self.stats.local_hits += 1
+            return value
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.stats.coalesced += 1
+            return await asyncio.shield(inflight)
+
+        task = asyncio.ensure_future(self._load(key, loader, ttl))
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _load(self, key: str, loader: Callable[[], Awaitable[Any]], ttl: TTL) -> Any:
+        found, value = await self._redis_get(key)
+        if found:
+            self.stats.redis_hits += 1
+            self.local.set(key, value, self._ttl_for(ttl, value))
+            return value
+
+        self.stats.misses += 1
+        try:
+            value = await loader()
+        except Exception:
+            self.stats.upstream_errors += 1
+            raise
+
+        if value is None:
+            return None
+
+        seconds = self._ttl_for(ttl, value)
+        if seconds != NO_CACHE:
+            self.local.set(key, value, seconds)
+            await self._redis_set(key, value, seconds)
+        return value
+
+    async def invalidate(self, key: str) -> None:
+        self.local.pop(key)
+        if redis_client.redis:
+            try:
+                await redis_client.redis.delete(self._redis_key(key))
+            except Exception as e:
+                print(f"⚠️  Cache invalidation failed for {self.namespace}: {e}")
+
+    @staticmethod
+    def _ttl_for(ttl: TTL, value: Any) -> Optional[float]:
+        return ttl(value) if callable(ttl) else ttl
+
+    async def _redis_get(self, key: str) -> Tuple[bool, Any]:
+        if not redis_client.redis:
+            return False, None
+        try:
+            raw = await redis_client.redis.get(self._redis_key(key))
+        except Exception as e:
+            print(f"⚠️  Cache read failed for {self.namespace}: {e}")
+            return False, None
+        if raw is None:
+            return False, None
+        return True, json.loads(raw)
+
+    async def _redis_set(self, key: str, value: Any, ttl: Optional[float]) -> None:
+        if not redis_client.redis:
+            return
+        try:
+            raw = json.dumps(value)
+            if ttl is None:
+                await redis_client.redis.set(self._redis_key(key), raw)
+            else:
+                await redis_client.redis.set(self._redis_key(key), raw, px=max(1, int(ttl * 1000)))
+        except Exception as e:
+            print(f"⚠️  Cache write failed for {self.namespace}: {e}")
+
+
+_registry: Dict[str, TieredCache] = {}
+
+# Shared cache for mirror node and Blockfrost lookups
+chain_cache = TieredCache("chain", max_size=settings.CHAIN_CACHE_MAX_SIZE)
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Hit/miss counters for every registered cache"""
+    return {
+        namespace: {**asdict(cache.stats), "hit_ratio": round(cache.stats.hit_ratio, 4), "size": len(cache.local)}
+        for namespace, cache in _registry.items()
+    }
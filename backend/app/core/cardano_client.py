@@ -133,7 +133,19 @@ class MockApiUrls:
     ApiError = MockApiError
     ApiUrls = MockApiUrls
 
+import httpx
+
 from app.core.config import settings
+from app.core.cardano_errors import BlockfrostError, BlockfrostErrorCode
+
+
+def _to_plain(value: Any) -> Any:
+    """Convert Blockfrost SDK Namespace results into plain dicts/lists"""
+    if isinstance(value, list):
+        return [_to_plain(item) for item in value]
+    if hasattr(value, 'to_dict'):
+        return value.to_dict()
+    return value
 
 
 class CardanoClient:
@@ -141,13 +153,21 @@ class CardanoClient:
     Cardano blockchain client using Blockfrost API.
     Provides methods for querying addresses, assets, transactions, and submitting transactions.
     Includes mock fallback for development environments without Blockfrost credentials.
+    
+    With credentials configured, requests go through a shared httpx.AsyncClient
+    (pooled keep-alive connections) so lookups never block the event loop.
     """
     
     def __init__(self):
         self.api: Optional[BlockFrostApi] = None
+        self.http: Optional[httpx.AsyncClient] = None
         self.network: str = settings.CARDANO_NETWORK
         self.project_id: Optional[str] = None
         self.is_mock: bool = not BLOCKFROST_AVAILABLE
+    
+    @property
+    def is_initialized(self) -> bool:
+        return self.http is not None or self.api is not None
         
     async def initialize(self):
         """Initialize Blockfrost API client with configuration"""
@@ -161,19 +181,18 @@ async def initialize(self):
                 )
                 return
             
-            # Create Blockfrost API client
             self.project_id = settings.BLOCKFROST_PROJECT_ID
+            self.is_mock = False
             
-            # Determine base URL based on network
-            if self.network == "mainnet":
-                base_url = ApiUrls.mainnet.value if BLOCKFROST_AVAILABLE else settings.BLOCKFROST_API_URL
-            else:  # preprod or testnet
-                base_url = ApiUrls.preprod.value if BLOCKFROST_AVAILABLE else settings.BLOCKFROST_API_URL
+            # Determine base URL based on network. ApiUrls stop at /api (the
+            # SDK appends the version); _request sends bare resource paths.
+            if BLOCKFROST_AVAILABLE:
+                network_url = ApiUrls.mainnet.value if self.network == "mainnet" else ApiUrls.preprod.value
+                base_url = f"{network_url}/v0"
+            else:
+                base_url = settings.BLOCKFROST_API_URL
             
-            self.api = BlockFrostApi(
-                project_id=self.project_id,
-                base_url=base_url
-            )
+            self.http = self._create_http_client(base_url, self.project_id)
             
             print(f"✅ Cardano client initialized for {self.network}")
             print(f"🔗 Using Blockfrost API: {base_url}")
@@ -187,6 +206,63 @@ async def initialize(self):
                 base_url=settings.BLOCKFROST_API_URL
             )
     
+    @staticmethod
+    def _create_http_client(base_url: str, project_id: str) -> httpx.AsyncClient:
+        """Create the pooled HTTP client used for Blockfrost requests"""
+        return httpx.AsyncClient(
+            base_url=base_url.rstrip('/'),
+            headers={'project_id': project_id},
+            limits=httpx.Limits(
+                max_connections=settings.BLOCKFROST_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.BLOCKFROST_MAX_CONNECTIONS,
+                keepalive_expiry=30.0
+            ),
+            timeout=httpx.Timeout(settings.BLOCKFROST_TIMEOUT_SECONDS)
+        )
+    
+    async def close(self):
+        """Close pooled HTTP connections"""
+        if self.http:
+            await self.http.aclose()
+            self.http = None
+    
+    async def _request(self, path: str, sdk_method: str, *args, **params) -> Any:
+        """
+        Fetch a Blockfrost resource.
+        
+        Uses the pooled HTTP client when available; otherwise calls the SDK
+        (or mock) method in a worker thread so the event loop stays free.
+        """
+        if self.http is None:
+            result = await asyncio.to_thread(getattr(self.api, sdk_method), *args, **params)
+            return _to_plain(result)
+        
+        try:
+            response = await self.http.get(path, params=params or None)
+        except httpx.HTTPError as e:
+            raise BlockfrostError(
+                BlockfrostErrorCode.NETWORK_ERROR,
+                f"Network error calling Blockfrost: {e}"
+            )
+        
+        if response.status_code >= 400:
+            try:
+                body = response.json()
+            except ValueError:
+                body = None
+            raise BlockfrostError.from_status_code(response.status_code, body)
+        
+        return response.json()
+    
+    @staticmethod
+    def _log_failure(action: str, error: Exception) -> None:
+        if isinstance(error, BlockfrostError):
+            print(f"❌ Blockfrost API error: {error.message} (status: {error.status_code})")
+        elif BLOCKFROST_AVAILABLE and isinstance(error, ApiError):
+            print(f"❌ Blockfrost API error: {error.message} (status: {error.status_code})")
+        else:
+            print(f"❌ Failed to {action}: {error}")
+    
     async def get_address_info(self, address: str) -> Optional[Dict[str, Any]]:
         """
         Get address information including balance and UTxOs.
@@ -197,7 +273,7 @@ async def get_address_info(self, address: str) -> Optional[Dict[str, Any]]:
         Returns:
             Dictionary containing address info, balance, and UTxOs
         """
-        if not self.api:
+        if not self.is_initialized:
             print("❌ Cardano client not initialized")
             return None
         
@@ -207,19 +283,11 @@ async def get_address_info(self, address: str) -> Optional[Dict[str, Any]]:
             else:
                 print(f"🔍 Getting address info for: {address[:20]}...")
             
-            # Get address details
-            address_info = self.api.address(address)
-            
-            # Convert to dict if it's a Namespace object
-            if hasattr(address_info, 'to_dict'):
-                address_info = address_info.to_dict()
-            
-            # Get UTxOs
-            utxos = self.api.address_utxos(address)
-            
-            # Convert UTxOs to dict if needed
-            if utxos and hasattr(utxos[0], 'to_dict'):
-                utxos = [utxo.to_dict() for utxo in utxos]
+            # Address details and UTxOs are independent, fetch them together
+            address_info, utxos = await asyncio.gather(
+                self._request(f"/addresses/{address}", "address", address),
+                self._request(f"/addresses/{address}/utxos", "address_utxos", address)
+            )
             
             # Parse balance
             ada_balance = "0"
@@ -227,9 +295,7 @@ async def get_address_info(self, address: str) -> Optional[Dict[str, Any]]:
             
             if isinstance(address_info, dict) and 'amount' in address_info:
                 for amount in address_info['amount']:
-                    # Convert amount to dict if it's a Namespace
-                    if hasattr(amount, 'to_dict'):
-                        amount = amount.to_dict()
+                    amount = _to_plain(amount)
                     
                     if amount['unit'] == 'lovelace':
                         ada_balance = amount['quantity']
@@ -251,10 +317,7 @@ async def get_address_info(self, address: str) -> Optional[Dict[str, Any]]:
             return result
             
         except Exception as e:
-            if BLOCKFROST_AVAILABLE and isinstance(e, ApiError):
-                print(f"❌ Blockfrost API error: {e.message} (status: {e.status_code})")
-            else:
-                print(f"❌ Failed to get address info: {e}")
+            self._log_failure("get address info", e)
             return None
     
     async def get_asset_info(self, policy_id: str, asset_name: str = "") -> Optional[Dict[str, Any]]:
@@ -268,7 +331,7 @@ async def get_asset_info(self, policy_id: str, asset_name: str = "") -> Optional
         Returns:
             Dictionary containing token metadata and minting info
         """
-        if not self.api:
+        if not self.is_initialized:
             print("❌ Cardano client not initialized")
             return None
         
@@ -281,11 +344,7 @@ async def get_asset_info(self, policy_id: str, asset_name: str = "") -> Optional
             else:
                 print(f"🔍 Getting asset info for: {asset_id[:20]}...")
             
-            asset_info = self.api.asset(asset_id)
-            
-            # Convert to dict if it's a Namespace object
-            if hasattr(asset_info, 'to_dict'):
-                asset_info = asset_info.to_dict()
+            asset_info = await self._request(f"/assets/{asset_id}", "asset", asset_id)
             
             result = {
                 'policy_id': policy_id,
@@ -301,10 +360,7 @@ async def get_asset_info(self, policy_id: str, asset_name: str = "") -> Optional
             return result
             
         except Exception as e:
-            if BLOCKFROST_AVAILABLE and isinstance(e, ApiError):
-                print(f"❌ Blockfrost API error: {e.message} (status: {e.status_code})")
-            else:
-                print(f"❌ Failed to get asset info: {e}")
+            self._log_failure("get asset info", e)
             return None
     
     async def get_transaction(self, tx_hash: str) -> Optional[Dict[str, Any]]:
@@ -317,7 +373,7 @@ async def get_transaction(self, tx_hash: str) -> Optional[Dict[str, Any]]:
         Returns:
             Dictionary containing transaction details and metadata
         """
-        if not self.api:
+        if not self.is_initialized:
             print("❌ Cardano client not initialized")
             return None
         
@@ -327,20 +383,16 @@ async def get_transaction(self, tx_hash: str) -> Optional[Dict[str, Any]]:
             else:
                 print(f"🔍 Getting transaction: {tx_hash[:20]}...")
             
-            # Get transaction details
-            tx_info = self.api.transaction(tx_hash)
-            
-            # Convert to dict if it's a Namespace object
-            if hasattr(tx_info, 'to_dict'):
-                tx_info = tx_info.to_dict()
+            # Fetch details and metadata together; missing metadata is not an error
+            tx_info, metadata = await asyncio.gather(
+                self._request(f"/txs/{tx_hash}", "transaction", tx_hash),
+                self._request(f"/txs/{tx_hash}/metadata", "transaction_metadata", tx_hash),
+                return_exceptions=True
+            )
             
-            # Get transaction metadata
-            try:
-                metadata = self.api.transaction_metadata(tx_hash)
-                # Convert metadata to dict if needed
-                if metadata and hasattr(metadata[0], 'to_dict'):
-                    metadata = [m.to_dict() for m in metadata]
-            except:
+            if isinstance(tx_info, Exception):
+                raise tx_info
+            if isinstance(metadata, Exception):
                 metadata = []
             
             result = {
@@ -355,10 +407,7 @@ async def get_transaction(self, tx_hash: str) -> Optional[Dict[str, Any]]:
             return result
             
         except Exception as e:
-            if BLOCKFROST_AVAILABLE and isinstance(e, ApiError):
-                print(f"❌ Blockfrost API error: {e.message} (status: {e.status_code})")
-            else:
-                print(f"❌ Failed to get transaction: {e}")
+            self._log_failure("get transaction", e)
             return None
     
     async def get_address_transactions(
@@ -378,7 +427,7 @@ async def get_address_transactions(
         Returns:
             List of transaction summaries
         """
-        if not self.api:
+        if not self.is_initialized:
             print("❌ Cardano client not initialized")
             return None
         
@@ -388,20 +437,19 @@ async def get_address_transactions(
             else:
                 print(f"🔍 Getting transactions for address: {address[:20]}...")
             
-            transactions = self.api.address_transactions(address, count=count, page=page)
-            
-            # Convert Namespace objects to dictionaries
-            if transactions and hasattr(transactions[0], 'to_dict'):
-                transactions = [tx.to_dict() for tx in transactions]
+            transactions = await self._request(
+                f"/addresses/{address}/transactions",
+                "address_transactions",
+                address,
+                count=count,
+                page=page
+            )
             
             print(f"✅ Retrieved {len(transactions) if transactions else 0} transactions")
             return transactions if transactions else []
             
         except Exception as e:
-            if BLOCKFROST_AVAILABLE and isinstance(e, ApiError):
-                print(f"❌ Blockfrost API error: {e.message} (status: {e.status_code})")
-            else:
-                print(f"❌ Failed to get address transactions: {e}")
+            self._log_failure("get address transactions", e)
             return None
     
     async def submit_transaction(self, tx_cbor: str) -> Optional[str]:
@@ -414,7 +462,7 @@ async def submit_transaction(self, tx_cbor: str) -> Optional[str]:
         Returns:
             Transaction hash if successful
         """
-        if not self.api:
+        if not self.is_initialized:
             print("❌ Cardano client not initialized")
             return None
         
@@ -436,10 +484,7 @@ async def submit_transaction(self, tx_cbor: str) -> Optional[str]:
             return tx_hash
             
         except Exception as e:
-            if BLOCKFROST_AVAILABLE and isinstance(e, ApiError):
-                print(f"❌ Blockfrost API error: {e.message} (status: {e.status_code})")
-            else:
-                print(f"❌ Failed to submit transaction: {e}")
+            self._log_failure("submit transaction", e)
             return None
     
     async def get_transaction_metadata(self, tx_hash: str) -> Optional[Dict[str, Any]]:
@@ -452,7 +497,7 @@ async def get_transaction_metadata(self, tx_hash: str) -> Optional[Dict[str, Any
         Returns:
             Decoded metadata dictionary
         """
-        if not self.api:
+        if not self.is_initialized:
             print("❌ Cardano client not initialized")
             return None
         
@@ -462,11 +507,7 @@ async def get_transaction_metadata(self, tx_hash: str) -> Optional[Dict[str, Any
             else:
                 print(f"🔍 Getting metadata for transaction: {tx_hash[:20]}...")
             
-            metadata_list = self.api.transaction_metadata(tx_hash)
-            
-            # Convert to dict if needed
-            if metadata_list and hasattr(metadata_list[0], 'to_dict'):
-                metadata_list = [m.to_dict() for m in metadata_list]
+            metadata_list = await self._request(f"/txs/{tx_hash}/metadata", "transaction_metadata", tx_hash)
             
             if not metadata_list:
                 print("ℹ️  No metadata found for transaction")
@@ -484,10 +525,7 @@ async def get_transaction_metadata(self, tx_hash: str) -> Optional[Dict[str, Any
             return result
             
         except Exception as e:
-            if BLOCKFROST_AVAILABLE and isinstance(e, ApiError):
-                print(f"❌ Blockfrost API error: {e.message} (status: {e.status_code})")
-            else:
-                print(f"❌ Failed to get transaction metadata: {e}")
+            self._log_failure("get transaction metadata", e)
             return None
     
     async def monitor_address(
@@ -504,7 +542,7 @@ async def monitor_address(
             callback: Async function to call when new transactions found
             interval: Polling interval in seconds
         """
-        if not self.api:
+        if not self.is_initialized:
             print("❌ Cardano client not initialized")
             return
         
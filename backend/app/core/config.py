@@ -11,11 +11,18 @@ class Settings(BaseSettings):
     DB_NAME: str = "harvest_ledger"
     DB_USER: str = "harvest_user"
     DB_PASSWORD: str = "harvest_pass"
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
     
     # JWT
     JWT_SECRET: str = "your-secret-key-change-in-production"
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 14  # rotating, tracked in the ephemeral store
+    
+    # bcrypt pool (legacy email/password auth); excess requests get 429
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 32
     
     # CORS
     CORS_ORIGINS: str = "http://localhost:3000,http://localhost:3001"
@@ -32,14 +39,61 @@ class Settings(BaseSettings):
     
     # Mirror Node
     MIRROR_NODE_URL: str = "https://testnet.mirrornode.hedera.com/api/v1"
+    MIRROR_NODE_MAX_CONNECTIONS: int = 20
+    MIRROR_NODE_TIMEOUT_SECONDS: float = 10.0
+    MIRROR_NODE_MAX_RETRIES: int = 3
+    # Threads for blocking SDK execute/receipt calls (max concurrent submissions)
+    HEDERA_SDK_MAX_WORKERS: int = 16
+    
+    # HCS outbox worker (record_harvest submits asynchronously)
+    HCS_OUTBOX_BATCH_SIZE: int = 200
+    HCS_OUTBOX_POLL_INTERVAL_SECONDS: float = 1.0
+    HCS_OUTBOX_MAX_ATTEMPTS: int = 5
+    HCS_MAX_MESSAGE_BYTES: int = 1024  # single-chunk topic message
+    
+    # Bulk harvest import (rows per INSERT/commit)
+    HARVEST_IMPORT_CHUNK_SIZE: int = 1000
     
     # Cardano Configuration
     CARDANO_NETWORK: str = "preprod"  # 'preprod' or 'mainnet'
     BLOCKFROST_PROJECT_ID: str = ""
     BLOCKFROST_API_URL: str = "https://cardano-preprod.blockfrost.io/api/v0"
+    BLOCKFROST_MAX_CONNECTIONS: int = 20
+    BLOCKFROST_TIMEOUT_SECONDS: float = 10.0
+    
+    # Wallet signature verification worker processes (0 = one per CPU)
+    SIGNATURE_VERIFY_PROCESSES: int = 0
+    
+    # Login nonces: "redis" (stored and consumed with GETDEL) or "stateless"
+    # (HMAC-signed, replay-checked by an in-process bloom filter)
+    NONCE_MODE: str = "redis"
+    NONCE_SECRET: str = ""  # empty = derive from JWT_SECRET
+    NONCE_TTL_SECONDS: int = 300
+    NONCE_REPLAY_CAPACITY: int = 100000  # consumed nonces per TTL window
     
     # Redis
     REDIS_URL: str = "redis://localhost:6379"
+    # Nonces, OTPs and email markers: "redis" (shared) or "memory" (single node)
+    EPHEMERAL_STORE_BACKEND: str = "redis"
+    # Wallet sessions live in the ephemeral store; Postgres is written behind
+    SESSION_FLUSH_INTERVAL_SECONDS: float = 5.0
+    SESSION_IDLE_CLOSE_SECONDS: int = 1800  # idle sessions are folded into behavior patterns
+    SESSION_FLUSH_MAX_ATTEMPTS: int = 12  # failed flushes before buffered rows are dropped
+    # Device identification: exact fingerprint first, then the MinHash LSH index
+    DEVICE_FUZZY_MATCH: bool = True
+    DEVICE_MATCH_MIN_SIMILARITY: float = 0.8
+    BEHAVIOR_MAX_CANDIDATES: int = 500
+    BEHAVIOR_MATCH_MIN_SCORE: float = 0.6
+    
+    # Authenticated user cache (keyed on JWT sub)
+    USER_CACHE_TTL_SECONDS: int = 30
+    USER_CACHE_MAX_SIZE: int = 1024
+    
+    # Chain lookup cache (mirror node / Blockfrost); confirmed txs never expire
+    CHAIN_CACHE_MAX_SIZE: int = 4096
+    CHAIN_CACHE_TOKEN_TTL_SECONDS: int = 30
+    CHAIN_CACHE_TOPIC_TTL_SECONDS: int = 5
+    CHAIN_CACHE_PENDING_TX_TTL_SECONDS: int = 10
     
     # API URLs
     BACKEND_URL: str = "http://localhost:8000"
@@ -58,6 +112,15 @@ def cors_origins_list(self) -> List[str]:
         """Convert CORS_ORIGINS string to list"""
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
     
+    @property
+    def async_database_url(self) -> str:
+        """DATABASE_URL rewritten for the asyncpg driver"""
+        url = self.DATABASE_URL
+        for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+            if url.startswith(prefix):
+                return "postgresql+asyncpg://" + url[len(prefix):]
+        return url
+    
     @property
     def smtp_host(self) -> str:
         return self.SMTP_HOST
@@ -1,9 +1,14 @@
+import asyncio
+import inspect
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Optional, Union
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
-# Create database engine
+# Create database engine (used for schema creation and maintenance scripts)
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,
@@ -14,14 +19,123 @@
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Create async database engine (asyncpg) used by request handlers
+async_engine = create_async_engine(
+    settings.async_database_url,
+    pool_pre_ping=True,
+    pool_recycle=300,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    echo=False  # Set to True for SQL debugging
+)
+
+# Create async session factory. Objects stay usable after commit because
+# attribute refreshes cannot be lazy-loaded outside of an awaited call.
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 # Create base class for models
 Base = declarative_base()
 
 
-def get_db() -> Session:
-    """Dependency to get database session"""
-    db = SessionLocal()
-    try:
+async def get_db() -> AsyncIterator[AsyncSession]:
+    """Dependency to get an async database session"""
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
\ No newline at end of file
+
+
+class RequestSession:
+    """
+    Unit-of-work session shared by everything one GraphQL request touches.
+
+    The AsyncSession is only created on first use, so requests that never
+    hit the database never check out a connection. Resolvers flush rather
+    than commit; `finish` commits (or rolls back) once when the operation
+    is done and then runs the callbacks registered with `after_commit`.
+    Nothing else may commit or roll back the shared session: a mutation
+    that reports failure in its payload instead of raising undoes its own
+    work with a savepoint (`begin_nested()`), leaving earlier mutations'
+    flushed work in place.
+
+    Sibling query fields resolve concurrently and an AsyncSession allows
+    one operation at a time, so awaitable session methods are serialized.
+    """
+
+    _SERIALIZED = {
+        "execute", "scalar", "scalars", "get", "flush", "refresh",
+        "commit", "rollback", "delete", "merge"
+    }
+
+    def __init__(self, session_factory: Callable[[], AsyncSession] = AsyncSessionLocal):
+        self._session_factory = session_factory
+        self._session: Optional[AsyncSession] = None
+        self._lock = asyncio.Lock()
+        self._after_commit: List[Callable[[], Union[None, Awaitable[None]]]] = []
+
+    @property
+    def checked_out(self) -> bool:
+        return self._session is not None
+
+    @property
+    def session(self) -> AsyncSession:
+        if self._session is None:
+            self._session = self._session_factory()
+        return self._session
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self.session, name)
+        if name not in self._SERIALIZED:
+            return attribute
+
+        async def serialized(*args, **kwargs):
+            async with self._lock:
+                return await attribute(*args, **kwargs)
+        return serialized
+
+    def after_commit(self, callback: Callable[[], Union[None, Awaitable[None]]]) -> None:
+        """Run `callback` once the request's transaction has committed"""
+        self._after_commit.append(callback)
+
+    async def finish(self, failed: bool = False) -> None:
+        """Commit (or roll back) the request's work and release the connection"""
+        callbacks, self._after_commit = self._after_commit, []
+        session, self._session = self._session, None
+        if session is not None:
+            try:
+                if failed:
+                    await session.rollback()
+                else:
+                    await session.commit()
+            finally:
+                await session.close()
+        if failed:
+            return
+        for callback in callbacks:
+            result = callback()
+            if inspect.isawaitable(result):
+                await result
+
+
+_request_session: ContextVar[Optional[RequestSession]] = ContextVar("request_session", default=None)
+
+
+def begin_request(session_factory: Callable[[], AsyncSession] = AsyncSessionLocal) -> RequestSession:
+    """Start the current request's unit of work"""
+    request = RequestSession(session_factory)
+    _request_session.set(request)
+    return request
+
+
+def current_request() -> Optional[RequestSession]:
+    return _request_session.get()
+
+
+def request_session() -> RequestSession:
+    """The current request's shared session"""
+    request = _request_session.get()
+    if request is None:
+        raise RuntimeError("No request session: call begin_request() first")
+    return request
@@ -0,0 +1,212 @@
+"""
+Short-lived auth state: login nonces, OTPs and their attempt counters,
+verified/pending email markers.
+
+`ephemeral_store` delegates to one of two backends chosen by
+EPHEMERAL_STORE_BACKEND:
+
+- "redis": shared across workers; multi-key steps are single round-trips
+  (GETDEL, MULTI/EXEC pipelines, the Lua scripts in redis_scripts).
+- "memory": a per-process dict with timer-wheel expiry. Reads and writes
+  are O(1); expired keys are dropped lazily on read and swept one
+  one-second slot at a time on write. Every method runs without awaiting,
+  so each call is atomic on the event loop. Suitable for single-node
+  deployments and tests.
+"""
+
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.redis_client import redis_client
+
+
+class RedisEphemeralStore:
+    """Backend on the shared Redis connection"""
+
+    @property
+    def available(self) -> bool:
+        return redis_client.redis is not None
+
+    async def set(self, key: str, value: str, ttl_seconds: int) -> None:
+        await redis_client.redis.setex(key, ttl_seconds, value)
+
+    async def set_many(self, items: Dict[str, str], ttl_seconds: int) -> None:
+        async with redis_client.redis.pipeline(transaction=True) as pipe:
+            for key, value in items.items():
+                pipe.setex(key, ttl_seconds, value)
+            await pipe.execute()
+
+    async def get(self, key: str) -> Optional[str]:
+        return await redis_client.redis.get(key)
+
+    async def getdel(self, key: str) -> Optional[str]:
+        return await redis_client.redis.getdel(key)
+
+    async def delete(self, *keys: str) -> None:
+        await redis_client.redis.delete(*keys)
+
+    async def claim(self, key: str, ttl_seconds: int) -> bool:
+        return bool(await redis_client.redis.set(key, "1", ex=ttl_seconds, nx=True))
+
+    async def verify_otp(self, key: str, attempts_key: str, otp: str, max_attempts: int) -> Tuple[int, int]:
+        status, attempts = await redis_client.run_script(
+            "verify_otp", keys=[key, attempts_key], args=[otp, max_attempts]
+        )
+        return int(status), int(attempts)
+
+    async def consume_linked(self, key: str, prefix: str) -> Optional[str]:
+        return await redis_client.run_script("consume_verified_email", keys=[key], args=[prefix])
+
+
+class MemoryEphemeralStore:
+    """In-process backend with one-second timer-wheel expiry"""
+
+    available = True
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[str, float]] = {}
+        self._wheel: Dict[int, Set[str]] = {}
+        self._swept = int(time.monotonic())
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _sweep(self, now: float) -> None:
+        until = int(now)
+        if until - self._swept > len(self._wheel):
+            # Long idle gap: visit only occupied slots
+            slots: List[int] = [slot for slot in self._wheel if slot < until]
+        else:
+            slots = range(self._swept, until)
+        for slot in slots:
+            for key in self._wheel.pop(slot, ()):
+                entry = self._data.get(key)
+                if entry is not None and entry[1] <= now:
+                    del self._data[key]
+        self._swept = max(self._swept, until)
+
+    def _set(self, key: str, value: str, ttl_seconds: int, now: float) -> None:
+        expires_at = now + ttl_seconds
+        self._data[key] = (value, expires_at)
+        # Slot after expiry, so a sweep never visits it early
+        self._wheel.setdefault(int(expires_at) + 1, set()).add(key)
+
+    def _get(self, key: str, now: float) -> Optional[str]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= now:
+            del self._data[key]
+            return None
+        return entry[0]
+
+    async def set(self, key: str, value: str, ttl_seconds: int) -> None:
+        now = time.monotonic()
+        self._sweep(now)
+        self._set(key, value, ttl_seconds, now)
+
+    async def set_many(self, items: Dict[str, str], ttl_seconds: int) -> None:
+        now = time.monotonic()
+        self._sweep(now)
+        for key, value in items.items():
+            self._set(key, value, ttl_seconds, now)
+
+    async def get(self, key: str) -> Optional[str]:
+        return self._get(key, time.monotonic())
+
+    async def getdel(self, key: str) -> Optional[str]:
+        value = self._get(key, time.monotonic())
+        if value is not None:
+            del self._data[key]
+        return value
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._data.pop(key, None)
+
+    async def claim(self, key: str, ttl_seconds: int) -> bool:
+        now = time.monotonic()
+        if self._get(key, now) is not None:
+            return False
+        self._sweep(now)
+        self._set(key, "1", ttl_seconds, now)
+        return True
+
+    async def verify_otp(self, key: str, attempts_key: str, otp: str, max_attempts: int) -> Tuple[int, int]:
+        """Same contract as redis_scripts.VERIFY_OTP"""
+        now = time.monotonic()
+        stored = self._get(key, now)
+        if stored is None:
+            return 0, 0
+        attempts = int(self._get(attempts_key, now) or 0)
+        if attempts >= max_attempts:
+            await self.delete(key, attempts_key)
+            return -1, attempts
+        if stored != otp:
+            # Like INCR, keep the counter's expiry (or the OTP's, if it had none)
+            expires_at = self._data.get(attempts_key, self._data[key])[1]
+            self._set(attempts_key, str(attempts + 1), expires_at - now, now)
+            return -2, attempts + 1
+        await self.delete(key, attempts_key)
+        return 1, attempts
+
+    async def consume_linked(self, key: str, prefix: str) -> Optional[str]:
+        """Same contract as redis_scripts.CONSUME_VERIFIED_EMAIL"""
+        now = time.monotonic()
+        token = self._get(key, now)
+        if token is None:
+            return None
+        value = self._get(prefix + token, now)
+        if value is not None:
+            await self.delete(key, prefix + token)
+        return value
+
+
+class EphemeralStore:
+    """Facade over the configured backend"""
+
+    def __init__(self, backend=None):
+        if backend is None:
+            backend = MemoryEphemeralStore() if settings.EPHEMERAL_STORE_BACKEND == "memory" else RedisEphemeralStore()
+        self.backend = backend
+
+    def use(self, backend) -> None:
+        """Swap the backend (tests, or falling back to memory on a single node)"""
+        self.backend = backend
+
+    @property
+    def available(self) -> bool:
+        return self.backend.available
+
+    async def set(self, key: str, value: str, ttl_seconds: int) -> None:
+        await self.backend.set(key, value, ttl_seconds)
+
+    async def set_many(self, items: Dict[str, str], ttl_seconds: int) -> None:
+        """Write several keys with one expiry, atomically"""
+        await self.backend.set_many(items, ttl_seconds)
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self.backend.get(key)
+
+    async def getdel(self, key: str) -> Optional[str]:
+        return await self.backend.getdel(key)
+
+    async def delete(self, *keys: str) -> None:
+        await self.backend.delete(*keys)
+
+    async def claim(self, key: str, ttl_seconds: int) -> bool:
+        """SET NX: True for the first caller until the key expires"""
+        return await self.backend.claim(key, ttl_seconds)
+
+    async def verify_otp(self, key: str, attempts_key: str, otp: str, max_attempts: int) -> Tuple[int, int]:
+        """Returns (status, attempts): 1 valid, 0 missing/expired, -1 locked out, -2 mismatch"""
+        return await self.backend.verify_otp(key, attempts_key, otp, max_attempts)
+
+    async def consume_linked(self, key: str, prefix: str) -> Optional[str]:
+        """Read key -> token -> value at prefix + token, deleting both keys"""
+        return await self.backend.consume_linked(key, prefix)
+
+
+# Global ephemeral store instance
+ephemeral_store = EphemeralStore()
@@ -0,0 +1,49 @@
+"""
+Fast EIP-191 (personal_sign) address recovery for EVM wallets.
+
+Uses libsecp256k1 through coincurve and pycryptodome's C keccak instead of
+eth_account's pure-Python path. Recovered addresses are cached on
+(message hash, signature) so retried and duplicate logins cost a dict
+lookup. When either library is missing, callers fall back to eth_account.
+"""
+
+from functools import lru_cache
+
+try:
+    from coincurve import PublicKey as CurvePublicKey
+    from Crypto.Hash import keccak as _keccak
+    FAST_ECRECOVER_AVAILABLE = True
+except ImportError:
+    FAST_ECRECOVER_AVAILABLE = False
+    print("⚠️  coincurve or pycryptodome not available. EVM signatures use the eth_account fallback.")
+
+
+def keccak256(data: bytes) -> bytes:
+    return _keccak.new(data=data, digest_bits=256).digest()
+
+
+def personal_message_hash(message: str) -> bytes:
+    """EIP-191 version 0x45 hash, as signed by MetaMask personal_sign"""
+    data = message.encode('utf-8')
+    return keccak256(b"\x19Ethereum Signed Message:\n" + str(len(data)).encode() + data)
+
+
+@lru_cache(maxsize=4096)
+def recover_address(message_hash: bytes, signature: bytes) -> str:
+    """Recover the lowercase 0x address from a 65-byte r || s || v signature; raises ValueError"""
+    if len(signature) != 65:
+        raise ValueError(f"Expected a 65-byte signature, got {len(signature)}")
+    v = signature[64]
+    if v >= 27:
+        v -= 27
+    if v not in (0, 1):
+        raise ValueError(f"Invalid recovery id {signature[64]}")
+
+    try:
+        public_key = CurvePublicKey.from_signature_and_message(
+            signature[:64] + bytes([v]), message_hash, hasher=None
+        )
+    except Exception as e:
+        raise ValueError(f"Signature recovery failed: {e}")
+    # Address = last 20 bytes of keccak256(uncompressed point without 0x04 prefix)
+    return "0x" + keccak256(public_key.format(compressed=False)[1:])[-20:].hex()
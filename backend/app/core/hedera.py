@@ -1,144 +1,214 @@
 import asyncio
-from typing import Optional, Dict, Any
-# Try to import real Hedera SDK, fall back to mock for Docker
-try:
-    from hedera import (
-        Client, 
-        AccountId, 
-        PrivateKey,
-        TopicCreateTransaction,
-        TopicMessageSubmitTransaction,
-        TokenCreateTransaction,
-        TokenType,
-        TokenSupplyType,
-        Hbar,
-        Status
-    )
-    HEDERA_AVAILABLE = True
-    print("✅ Hedera SDK loaded successfully")
-except ImportError:
-    print("⚠️  Hedera SDK not available in Docker. Using mock implementation.")
-    HEDERA_AVAILABLE = False
-    
-    # Mock implementations for Docker environment
-    class MockClient:
-        @classmethod
-        def forTestnet(cls): return cls()
-        @classmethod
-        def forMainnet(cls): return cls()
-        def setOperator(self, account_id, private_key): pass
-        def close(self): pass
-    
-    class MockAccountId:
-        def __init__(self, account_id): self.account_id = account_id
-        @classmethod
-        def fromString(cls, account_id): return cls(account_id)
-        def __str__(self): return self.account_id
-    
-    class MockPrivateKey:
-        def __init__(self, key): self.key = key
-        @classmethod
-        def fromString(cls, key): return cls(key)
-        def getPublicKey(self): return f"public_key_for_{self.key[:10]}..."
-    
-    class MockTransaction:
-        def setTopicMemo(self, memo): return self
-        def setMaxTransactionFee(self, fee): return self
-        def setTopicId(self, topic_id): return self
-        def setMessage(self, message): return self
-        def setTokenName(self, name): return self
-        def setTokenSymbol(self, symbol): return self
-        def setTokenType(self, token_type): return self
-        def setSupplyType(self, supply_type): return self
-        def setInitialSupply(self, supply): return self
-        def setTreasuryAccountId(self, account_id): return self
-        def setAdminKey(self, key): return self
-        def setSupplyKey(self, key): return self
-        def execute(self, client): return MockResponse()
-    
-    class MockResponse:
-        def __init__(self):
-            self.transactionId = MockTransactionId()
-        def getReceipt(self, client): return MockReceipt()
-    
-    class MockReceipt:
-        def __init__(self):
-            self.status = MockStatus.SUCCESS
-            self.topicId = MockTopicId("0.0.123456")
-            self.tokenId = MockTokenId("0.0.789012")
-    
-    class MockTopicId:
-        def __init__(self, topic_id): self.topic_id = topic_id
-        def toString(self): return self.topic_id
-        @classmethod
-        def fromString(cls, topic_id): return cls(topic_id)
-    
-    class MockTokenId:
-        def __init__(self, token_id): self.token_id = token_id
-        def toString(self): return self.token_id
-    
-    class MockTransactionId:
-        def toString(self): return "0.0.123456@1234567890.123456789"
-    
-    class MockStatus:
-        SUCCESS = "SUCCESS"
-    
-    class MockHbar:
-        def __init__(self, amount): self.amount = amount
-    
-    class MockTokenType:
-        FUNGIBLE_COMMON = "FUNGIBLE_COMMON"
-    
-    class MockTokenSupplyType:
-        INFINITE = "INFINITE"
-    
-    # Assign mock classes
-    Client = MockClient
-    AccountId = MockAccountId
-    PrivateKey = MockPrivateKey
-    TopicCreateTransaction = MockTransaction
-    TopicMessageSubmitTransaction = MockTransaction
-    TokenCreateTransaction = MockTransaction
-    TokenType = MockTokenType
-    TokenSupplyType = MockTokenSupplyType
-    Hbar = MockHbar
-    Status = MockStatus
 import json
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import Optional, Dict, Any
+
+import httpx
+
 from app.core.config import settings
+from app.core.cardano_errors import RetryConfig, retry_with_backoff
+
+SDK_NAMES = (
+    "Client",
+    "AccountId",
+    "PrivateKey",
+    "TopicId",
+    "TopicCreateTransaction",
+    "TopicMessageSubmitTransaction",
+    "TokenCreateTransaction",
+    "TokenType",
+    "TokenSupplyType",
+    "Hbar",
+    "Status",
+)
+
+
+# Mock implementations used when the SDK is not installed (Docker)
+class MockClient:
+    @classmethod
+    def forTestnet(cls): return cls()
+    @classmethod
+    def forMainnet(cls): return cls()
+    def setOperator(self, account_id, private_key): pass
+    def close(self): pass
+
+class MockAccountId:
+    def __init__(self, account_id): self.account_id = account_id
+    @classmethod
+    def fromString(cls, account_id): return cls(account_id)
+    def __str__(self): return self.account_id
+
+class MockPrivateKey:
+    def __init__(self, key): self.key = key
+    @classmethod
+    def fromString(cls, key): return cls(key)
+    def getPublicKey(self): return f"public_key_for_{self.key[:10]}..."
+
+class MockTransaction:
+    def setTopicMemo(self, memo): return self
+    def setMaxTransactionFee(self, fee): return self
+    def setTopicId(self, topic_id): return self
+    def setMessage(self, message): return self
+    def setTokenName(self, name): return self
+    def setTokenSymbol(self, symbol): return self
+    def setTokenType(self, token_type): return self
+    def setSupplyType(self, supply_type): return self
+    def setInitialSupply(self, supply): return self
+    def setTreasuryAccountId(self, account_id): return self
+    def setAdminKey(self, key): return self
+    def setSupplyKey(self, key): return self
+    def execute(self, client): return MockResponse()
+
+class MockResponse:
+    def __init__(self):
+        self.transactionId = MockTransactionId()
+    def getReceipt(self, client): return MockReceipt()
+
+class MockReceipt:
+    def __init__(self):
+        self.status = MockStatus.SUCCESS
+        self.topicId = MockTopicId("0.0.123456")
+        self.tokenId = MockTokenId("0.0.789012")
+
+class MockTopicId:
+    def __init__(self, topic_id): self.topic_id = topic_id
+    def toString(self): return self.topic_id
+    @classmethod
+    def fromString(cls, topic_id): return cls(topic_id)
+
+class MockTokenId:
+    def __init__(self, token_id): self.token_id = token_id
+    def toString(self): return self.token_id
+
+class MockTransactionId:
+    def toString(self): return "0.0.123456@1234567890.123456789"
+
+class MockStatus:
+    SUCCESS = "SUCCESS"
+
+class MockHbar:
+    def __init__(self, amount): self.amount = amount
+
+class MockTokenType:
+    FUNGIBLE_COMMON = "FUNGIBLE_COMMON"
+
+class MockTokenSupplyType:
+    INFINITE = "INFINITE"
+
+
+_sdk: Optional[SimpleNamespace] = None
+
+
+def load_sdk() -> SimpleNamespace:
+    """
+    Import the Hedera SDK on first use.
+    
+    The SDK runs on a JVM bridge that costs seconds of startup and a lot of
+    resident memory, so it is only loaded once a transaction has to be
+    submitted. Falls back to the mock implementation when not installed.
+    """
+    global _sdk
+    if _sdk is None:
+        try:
+            import hedera
+            _sdk = SimpleNamespace(available=True, **{name: getattr(hedera, name) for name in SDK_NAMES})
+            print("✅ Hedera SDK loaded successfully")
+        except ImportError:
+            print("⚠️  Hedera SDK not available in Docker. Using mock implementation.")
+            _sdk = SimpleNamespace(
+                available=False,
+                Client=MockClient,
+                AccountId=MockAccountId,
+                PrivateKey=MockPrivateKey,
+                TopicId=MockTopicId,
+                TopicCreateTransaction=MockTransaction,
+                TopicMessageSubmitTransaction=MockTransaction,
+                TokenCreateTransaction=MockTransaction,
+                TokenType=MockTokenType,
+                TokenSupplyType=MockTokenSupplyType,
+                Hbar=MockHbar,
+                Status=MockStatus
+            )
+    return _sdk
+
+
+def _is_retryable_mirror_error(error: Exception) -> bool:
+    """Retry transport failures, rate limits and server errors, not 4xx"""
+    if isinstance(error, httpx.TransportError):
+        return True
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return False
 
 
 class HederaClient:
     def __init__(self):
-        self.client: Optional[Client] = None
-        self.operator_id: Optional[AccountId] = None
-        self.operator_key: Optional[PrivateKey] = None
+        self.client = None
+        self.operator_id = None
+        self.operator_key = None
         self.topic_id: Optional[str] = None
+        self.mirror: Optional[httpx.AsyncClient] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._connect_lock = asyncio.Lock()
         
+    @property
+    def is_configured(self) -> bool:
+        return bool(settings.OPERATOR_ID and settings.OPERATOR_KEY)
+    
     async def initialize(self):
-        """Initialize Hedera client with testnet configuration"""
+        """Prepare mirror node access; the SDK client is created on first submission"""
+        # Mirror node reads need no operator credentials
+        if not self.mirror:
+            self.mirror = self._create_mirror_client()
+        
+        if not self.is_configured:
+            print("Warning: Hedera credentials not configured. Some features will be disabled.")
+            return
+        
+        # Set topic ID if configured
+        if settings.HCS_TOPIC_ID:
+            self.topic_id = settings.HCS_TOPIC_ID
+        
+        print(f"✅ Hedera configured for {settings.HEDERA_NETWORK} (SDK loads on first transaction)")
+        print(f"🔑 Using Account: {settings.OPERATOR_ID}")
+    
+    async def connect(self) -> bool:
+        """Load the SDK and create the operator client if not done yet"""
+        if self.client:
+            return True
+        if not self.is_configured:
+            print("❌ Hedera client not initialized")
+            return False
+        
+        async with self._connect_lock:
+            if not self.client:
+                try:
+                    # Starting the JVM blocks, so keep it off the event loop
+                    await asyncio.get_running_loop().run_in_executor(self._get_executor(), self._create_client)
+                except Exception:
+                    return False
+        return True
+    
+    def _create_client(self) -> None:
         try:
-            if not settings.OPERATOR_ID or not settings.OPERATOR_KEY:
-                print("Warning: Hedera credentials not configured. Some features will be disabled.")
-                return
-                
+            sdk = load_sdk()
+            
             # Create client for testnet
             if settings.HEDERA_NETWORK == "testnet":
-                self.client = Client.forTestnet()
+                client = sdk.Client.forTestnet()
             else:
-                self.client = Client.forMainnet()
+                client = sdk.Client.forMainnet()
             
             # Set operator
-            self.operator_id = AccountId.fromString(settings.OPERATOR_ID)
-            self.operator_key = PrivateKey.fromString(settings.OPERATOR_KEY)
-            
-            self.client.setOperator(self.operator_id, self.operator_key)
+            self.operator_id = sdk.AccountId.fromString(settings.OPERATOR_ID)
+            self.operator_key = sdk.PrivateKey.fromString(settings.OPERATOR_KEY)
             
-            # Set topic ID if configured
-            if settings.HCS_TOPIC_ID:
-                self.topic_id = settings.HCS_TOPIC_ID
+            client.setOperator(self.operator_id, self.operator_key)
+            self.client = client
             
             print(f"✅ Hedera client initialized for {settings.HEDERA_NETWORK}")
-            print(f"🔑 Using Account: {settings.OPERATOR_ID}")
             
         except Exception as e:
             print(f"❌ Failed to initialize Hedera client: {e}")
@@ -148,29 +218,71 @@ async def close(self):
         """Close Hedera client connection"""
         if self.client:
             self.client.close()
+            self.client = None
+        if self.mirror:
+            await self.mirror.aclose()
+            self.mirror = None
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+    
+    @staticmethod
+    def _create_mirror_client(base_url: Optional[str] = None) -> httpx.AsyncClient:
+        """Create the long-lived pooled client used for mirror node queries"""
+        return httpx.AsyncClient(
+            base_url=(base_url or settings.MIRROR_NODE_URL).rstrip("/"),
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=settings.MIRROR_NODE_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.MIRROR_NODE_MAX_CONNECTIONS,
+                keepalive_expiry=30.0
+            ),
+            timeout=httpx.Timeout(settings.MIRROR_NODE_TIMEOUT_SECONDS)
+        )
+    
+    async def _execute(self, transaction):
+        """
+        Execute a transaction and wait for its receipt on the SDK thread pool.
+        
+        Both calls block for the consensus round-trip, so they run on a
+        bounded pool of HEDERA_SDK_MAX_WORKERS threads instead of the event
+        loop; submissions beyond that limit queue for a free worker.
+        """
+        def execute_and_wait():
+            print("🔄 Executing transaction...")
+            response = transaction.execute(self.client)
+            print("⏳ Waiting for receipt...")
+            return response, response.getReceipt(self.client)
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), execute_and_wait)
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if not self._executor:
+            self._executor = ThreadPoolExecutor(
+                max_workers=settings.HEDERA_SDK_MAX_WORKERS,
+                thread_name_prefix="hedera-sdk"
+            )
+        return self._executor
             
     async def create_topic(self, memo: str = "HarvestLedger Supply Chain Topic") -> Optional[str]:
         """Create a new HCS topic for logging events"""
-        if not self.client:
-            print("❌ Hedera client not initialized")
+        if not await self.connect():
             return None
+        sdk = load_sdk()
             
         try:
             print(f"📝 Creating HCS topic with memo: {memo}")
             
             transaction = (
-                TopicCreateTransaction()
+                sdk.TopicCreateTransaction()
                 .setTopicMemo(memo)
-                .setMaxTransactionFee(Hbar(2))
+                .setMaxTransactionFee(sdk.Hbar(2))
             )
             
-            print("🔄 Executing transaction...")
-            response = transaction.execute(self.client)
-            
-            print("⏳ Waiting for receipt...")
-            receipt = response.getReceipt(self.client)
+            response, receipt = await self._execute(transaction)
             
-            if receipt.status == Status.SUCCESS:
+            if receipt.status == sdk.Status.SUCCESS:
                 topic_id = receipt.topicId.toString()
                 print(f"✅ Created HCS topic: {topic_id}")
                 return topic_id
@@ -184,9 +296,9 @@ async def create_topic(self, memo: str = "HarvestLedger Supply Chain Topic") ->
             
     async def submit_message(self, message: Dict[str, Any], topic_id: Optional[str] = None) -> Optional[str]:
         """Submit a message to HCS topic"""
-        if not self.client:
-            print("❌ Hedera client not initialized")
+        if not await self.connect():
             return None
+        sdk = load_sdk()
             
         target_topic = topic_id or self.topic_id
         if not target_topic:
@@ -199,26 +311,21 @@ async def submit_message(self, message: Dict[str, Any], topic_id: Optional[str]
             print(f"📄 Message: {message_json[:100]}...")
             
             # Convert topic ID string to TopicId object if needed
-            from hedera import TopicId
             if isinstance(target_topic, str):
-                topic_id_obj = TopicId.fromString(target_topic)
+                topic_id_obj = sdk.TopicId.fromString(target_topic)
             else:
                 topic_id_obj = target_topic
             
             transaction = (
-                TopicMessageSubmitTransaction()
+                sdk.TopicMessageSubmitTransaction()
                 .setTopicId(topic_id_obj)
                 .setMessage(message_json.encode('utf-8'))
-                .setMaxTransactionFee(Hbar(1))
+                .setMaxTransactionFee(sdk.Hbar(1))
             )
             
-            print("🔄 Executing transaction...")
-            response = transaction.execute(self.client)
-            
-            print("⏳ Waiting for receipt...")
-            receipt = response.getReceipt(self.client)
+            response, receipt = await self._execute(transaction)
             
-            if receipt.status == Status.SUCCESS:
+            if receipt.status == sdk.Status.SUCCESS:
                 tx_id = response.transactionId.toString()
                 print(f"✅ Message submitted! Transaction ID: {tx_id}")
                 return tx_id
@@ -232,34 +339,30 @@ async def submit_message(self, message: Dict[str, Any], topic_id: Optional[str]
             
     async def create_token(self, name: str, symbol: str, initial_supply: int = 1000000) -> Optional[str]:
         """Create an HTS token for crop tokenization"""
-        if not self.client:
-            print("❌ Hedera client not initialized")
+        if not await self.connect():
             return None
+        sdk = load_sdk()
             
         try:
             print(f"🪙 Creating HTS token: {name} ({symbol})")
             print(f"📊 Initial supply: {initial_supply}")
             
             transaction = (
-                TokenCreateTransaction()
+                sdk.TokenCreateTransaction()
                 .setTokenName(name)
                 .setTokenSymbol(symbol)
-                .setTokenType(TokenType.FUNGIBLE_COMMON)
-                .setSupplyType(TokenSupplyType.INFINITE)
+                .setTokenType(sdk.TokenType.FUNGIBLE_COMMON)
+                .setSupplyType(sdk.TokenSupplyType.INFINITE)
                 .setInitialSupply(initial_supply)
                 .setTreasuryAccountId(self.operator_id)
                 .setAdminKey(self.operator_key.getPublicKey())
                 .setSupplyKey(self.operator_key.getPublicKey())
-                .setMaxTransactionFee(Hbar(30))
+                .setMaxTransactionFee(sdk.Hbar(30))
             )
             
-            print("🔄 Executing transaction...")
-            response = transaction.execute(self.client)
-            
-            print("⏳ Waiting for receipt...")
-            receipt = response.getReceipt(self.client)
+            response, receipt = await self._execute(transaction)
             
-            if receipt.status == Status.SUCCESS:
+            if receipt.status == sdk.Status.SUCCESS:
                 token_id = receipt.tokenId.toString()
                 print(f"✅ Created HTS token: {token_id}")
                 return token_id
@@ -273,13 +376,24 @@ async def create_token(self, name: str, symbol: str, initial_supply: int = 10000
             
     async def get_mirror_data(self, endpoint: str) -> Optional[Dict[str, Any]]:
         """Fetch data from Hedera mirror node"""
+        if not self.mirror:
+            self.mirror = self._create_mirror_client()
+        
+        async def fetch() -> Dict[str, Any]:
+            response = await self.mirror.get(f"/{endpoint}")
+            response.raise_for_status()
+            return response.json()
+        
         try:
-            import httpx
-            url = f"{settings.MIRROR_NODE_URL}/{endpoint}"
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url)
-                response.raise_for_status()
-                return response.json()
+            return await retry_with_backoff(
+                fetch,
+                RetryConfig(
+                    max_attempts=settings.MIRROR_NODE_MAX_RETRIES,
+                    initial_delay=0.2,
+                    max_delay=2.0
+                ),
+                should_retry=_is_retryable_mirror_error
+            )
         except Exception as e:
             print(f"Failed to fetch mirror data: {e}")
             return None
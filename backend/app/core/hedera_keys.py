@@ -0,0 +1,79 @@
+"""
+Native Hedera public key parsing and signature verification.
+
+Covers the key encodings Hedera wallets hand out, so verifying a wallet
+login never needs the JVM-backed SDK:
+
+- ED25519: raw 32-byte keys or DER (`302a300506032b6570032100...`)
+- ECDSA(secp256k1): raw compressed/uncompressed points, Hedera's short DER
+  (`302d300706052b8104000a032200...`) or standard SubjectPublicKeyInfo
+
+ED25519 signatures cover the message bytes; ECDSA signatures cover the
+keccak256 digest of the message, matching the Hedera SDKs. Parsed keys are
+cached because the same wallets log in again and again.
+"""
+
+from functools import lru_cache
+from typing import Tuple, Union
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+from cryptography.hazmat.primitives.asymmetric.utils import Prehashed, encode_dss_signature
+from cryptography.hazmat.primitives.serialization import load_der_public_key
+from eth_utils import keccak
+
+ED25519_DER_PREFIX = bytes.fromhex("302a300506032b6570032100")
+ECDSA_DER_PREFIX = bytes.fromhex("302d300706052b8104000a032200")
+
+PublicKey = Union[ed25519.Ed25519PublicKey, ec.EllipticCurvePublicKey]
+
+
+@lru_cache(maxsize=4096)
+def parse_public_key(public_key_str: str) -> Tuple[str, PublicKey]:
+    """Parse a hex-encoded Hedera public key into ('ed25519' | 'ecdsa', key); raises ValueError"""
+    text = public_key_str.strip().lower()
+    if text.startswith("0x"):
+        text = text[2:]
+    data = bytes.fromhex(text)
+
+    if len(data) == 32:
+        return "ed25519", ed25519.Ed25519PublicKey.from_public_bytes(data)
+    if len(data) == 44 and data.startswith(ED25519_DER_PREFIX):
+        return "ed25519", ed25519.Ed25519PublicKey.from_public_bytes(data[len(ED25519_DER_PREFIX):])
+    if len(data) in (33, 65):
+        return "ecdsa", ec.EllipticCurvePublicKey.from_encoded_point(ec.SECP256K1(), data)
+    if len(data) == 47 and data.startswith(ECDSA_DER_PREFIX):
+        point = data[len(ECDSA_DER_PREFIX):]
+        return "ecdsa", ec.EllipticCurvePublicKey.from_encoded_point(ec.SECP256K1(), point)
+
+    try:
+        key = load_der_public_key(data)
+    except Exception:
+        raise ValueError(f"Unsupported Hedera public key encoding ({len(data)} bytes)")
+    if isinstance(key, ed25519.Ed25519PublicKey):
+        return "ed25519", key
+    if isinstance(key, ec.EllipticCurvePublicKey) and isinstance(key.curve, ec.SECP256K1):
+        return "ecdsa", key
+    raise ValueError("Hedera public keys must be ED25519 or ECDSA(secp256k1)")
+
+
+def verify_signature(public_key_str: str, message: bytes, signature: bytes) -> bool:
+    """Verify a Hedera wallet signature over `message`; raises ValueError for bad keys"""
+    kind, key = parse_public_key(public_key_str)
+    try:
+        if kind == "ed25519":
+            key.verify(signature, message)
+            return True
+
+        if len(signature) == 64:
+            # Raw r || s as produced by the Hedera SDKs and wallets
+            signature = encode_dss_signature(
+                int.from_bytes(signature[:32], "big"),
+                int.from_bytes(signature[32:], "big")
+            )
+        # keccak256 and SHA-256 digests are both 32 bytes, which is all Prehashed checks
+        key.verify(signature, keccak(message), ec.ECDSA(Prehashed(hashes.SHA256())))
+        return True
+    except InvalidSignature:
+        return False
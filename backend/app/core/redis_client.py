@@ -1,14 +1,35 @@
 import redis.asyncio as redis
-from typing import Optional
+from redis.commands.core import AsyncScript
+from typing import Dict, Optional, Sequence, Any
 from app.core.config import settings
+from app.core.redis_scripts import SCRIPTS
 
 class RedisClient:
     def __init__(self):
         self.redis: Optional[redis.Redis] = None
+        self.scripts: Dict[str, AsyncScript] = {}
     
     async def connect(self):
         """Connect to Redis"""
-        self.redis = redis.from_url(settings.REDIS_URL, decode_responses=True)
+        self.attach(redis.from_url(settings.REDIS_URL, decode_responses=True))
+        await self.preload_scripts()
+    
+    def attach(self, connection: redis.Redis) -> None:
+        """Use an existing connection and register the Lua scripts on it"""
+        self.redis = connection
+        self.scripts = {name: connection.register_script(lua) for name, lua in SCRIPTS.items()}
+    
+    async def preload_scripts(self) -> None:
+        """SCRIPT LOAD every script so the first calls are already EVALSHA"""
+        try:
+            for lua in SCRIPTS.values():
+                await self.redis.script_load(lua)
+        except Exception as e:
+            print(f"⚠️  Redis script preload failed (scripts load on first use): {e}")
+    
+    async def run_script(self, name: str, keys: Sequence[str], args: Sequence[Any] = ()) -> Any:
+        """Run a registered script in one round-trip"""
+        return await self.scripts[name](keys=list(keys), args=list(args))
     
     async def disconnect(self):
         """Disconnect from Redis"""
@@ -26,17 +47,14 @@ async def set_nonce(self, nonce: str, address: str, expire_seconds: int = 300):
                 raise
     
     async def get_nonce(self, nonce: str) -> Optional[str]:
-        """Get and delete nonce (one-time use)"""
+        """Get and delete nonce (one-time use) in a single GETDEL"""
         if self.redis:
             try:
-                address = await self.redis.get(f"nonce:{nonce}")
-                print(f"🔍 Redis get nonce: {nonce[:10]}... -> {address[:20] if address else 'None'}...")
-                if address:
-                    await self.redis.delete(f"nonce:{nonce}")
-                    print(f"✅ Nonce deleted from Redis")
+                address = await self.redis.getdel(f"nonce:{nonce}")
+                print(f"🔍 Redis consume nonce: {nonce[:10]}... -> {address[:20] if address else 'None'}...")
                 return address
             except Exception as e:
-                print(f"❌ Redis get failed: {e}")
+                print(f"❌ Redis getdel failed: {e}")
                 return None
         print(f"⚠️  Redis client not connected")
         return None
@@ -0,0 +1,47 @@
+"""
+Lua scripts for multi-key auth steps.
+
+Each script makes one logical auth step atomic and a single round-trip.
+RedisClient registers every script on connect, which preloads them with
+SCRIPT LOAD so calls go out as EVALSHA; redis-py reloads a script
+transparently if the server was flushed.
+"""
+
+# KEYS: otp, attempts   ARGV: submitted otp, max attempts
+# Returns {status, attempts}: 1 valid, 0 missing/expired, -1 locked out, -2 mismatch
+VERIFY_OTP = """
+local stored = redis.call('GET', KEYS[1])
+if not stored then
+    return {0, 0}
+end
+local attempts = tonumber(redis.call('GET', KEYS[2]) or '0')
+if attempts >= tonumber(ARGV[2]) then
+    redis.call('DEL', KEYS[1], KEYS[2])
+    return {-1, attempts}
+end
+if stored ~= ARGV[1] then
+    return {-2, redis.call('INCR', KEYS[2])}
+end
+redis.call('DEL', KEYS[1], KEYS[2])
+return {1, attempts}
+"""
+
+# KEYS: email -> token mapping   ARGV: prefix of the token -> email key
+# Returns the verified email and deletes both keys, or nil
+CONSUME_VERIFIED_EMAIL = """
+local token = redis.call('GET', KEYS[1])
+if not token then
+    return false
+end
+local token_key = ARGV[1] .. token
+local email = redis.call('GET', token_key)
+if email then
+    redis.call('DEL', KEYS[1], token_key)
+end
+return email
+"""
+
+SCRIPTS = {
+    "verify_otp": VERIFY_OTP,
+    "consume_verified_email": CONSUME_VERIFIED_EMAIL,
+}
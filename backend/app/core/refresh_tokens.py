@@ -0,0 +1,127 @@
+"""
+Rotating refresh tokens.
+
+A refresh token is "<family>.<secret>". The ephemeral store keeps, under
+the token's SHA-256, the access-token claims it was issued for, and under
+the family id the digest of the family's current token. Refreshing
+consumes the presented token (GETDEL) and issues its successor in the same
+family, so minting a new access token is a couple of O(1) store lookups
+with no wallet signature, database or Redis nonce work.
+
+A token that was already rotated is evidence that it leaked: presenting
+it revokes the whole family, including the successor held by whoever
+refreshed first.
+
+A family lives for REFRESH_TOKEN_EXPIRE_DAYS from its first token.
+Successors inherit the family's expiry rather than starting a new
+lifetime, so a stolen token cannot be kept alive by refreshing it.
+"""
+
+import hashlib
+import hmac
+import json
+import secrets
+import time
+from functools import partial
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.ephemeral_store import ephemeral_store
+
+
+def _digest(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def _token_key(digest: str) -> str:
+    return f"refresh:{digest}"
+
+
+def _family_key(family: str) -> str:
+    return f"refresh_family:{family}"
+
+
+class RefreshTokens:
+    """Issues, rotates and revokes refresh token families"""
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def _new_token(family: Optional[str] = None) -> str:
+        return f"{family or secrets.token_urlsafe(12)}.{secrets.token_urlsafe(32)}"
+
+    async def _save(self, token: str, claims: Dict[str, Any], expires_at: Optional[float] = None) -> bool:
+        family = token.partition(".")[0]
+        expires_at = expires_at or time.time() + self.ttl_seconds
+        ttl = int(expires_at - time.time())
+        if ttl <= 0:
+            return False
+        digest = _digest(token)
+        await ephemeral_store.set_many({
+            _token_key(digest): json.dumps({"family": family, "claims": claims, "expires_at": expires_at}),
+            _family_key(family): digest,
+        }, ttl)
+        return True
+
+    async def issue(self, claims: Dict[str, Any]) -> Optional[str]:
+        """New refresh token family for access-token claims (None if the store is down)"""
+        if not ephemeral_store.available:
+            return None
+        token = self._new_token()
+        await self._save(token, claims)
+        return token
+
+    def issue_after_commit(self, db, claims: Dict[str, Any]) -> Optional[str]:
+        """
+        New refresh token that only becomes valid once the request session commits
+
+        For logins that create or change the user: if the transaction rolls
+        back, the returned token was never stored and cannot be redeemed.
+        """
+        if not ephemeral_store.available:
+            return None
+        token = self._new_token()
+        db.after_commit(partial(self._save, token, claims))
+        return token
+
+    async def rotate(self, token: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Consume a refresh token; returns (successor token, claims)
+
+        Returns None for unknown, expired or reused tokens. Reuse revokes
+        the token's family.
+        """
+        family, separator, _ = token.partition(".")
+        if not separator or not family or not ephemeral_store.available:
+            return None
+
+        digest = _digest(token)
+        raw = await ephemeral_store.getdel(_token_key(digest))
+        current = await ephemeral_store.get(_family_key(family))
+        data = json.loads(raw) if raw else None
+
+        if not data or data["family"] != family or not current or not hmac.compare_digest(current, digest):
+            if current:
+                print(f"⚠️  Refresh token reuse detected, revoking family {family}")
+                await self.revoke_family(family, current)
+            return None
+
+        successor = self._new_token(family)
+        # Tokens written before family expiry was tracked get a full lifetime
+        if not await self._save(successor, data["claims"], data.get("expires_at")):
+            await self.revoke_family(family)
+            return None
+        return successor, data["claims"]
+
+    async def revoke_family(self, family: str, current: Optional[str] = None) -> None:
+        """Invalidate every token of a family"""
+        current = current or await ephemeral_store.get(_family_key(family))
+        keys = [_family_key(family)]
+        if current:
+            keys.append(_token_key(current))
+        await ephemeral_store.delete(*keys)
+
+
+# Global refresh token instance
+refresh_tokens = RefreshTokens(settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 3600)
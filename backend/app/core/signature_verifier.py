@@ -0,0 +1,123 @@
+"""
+Wallet signature verification off the event loop.
+
+ecrecover, Ed25519 and CBOR/COSE parsing are CPU-bound, so verification
+is dispatched to a process pool instead of running inline in request
+handlers. `verify_many` splits large batches into one task per worker,
+which keeps the pickling overhead per signature low.
+"""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+from app.core.config import settings
+
+EVM_WALLETS = {'METAMASK', 'BLADE_EVM'}
+HEDERA_WALLETS = {'HASHPACK', 'KABILA', 'PORTAL', 'BLADE_NATIVE'}
+CARDANO_WALLETS = {'NAMI', 'ETERNL', 'LACE', 'FLINT', 'TYPHON'}
+
+
+@dataclass(frozen=True)
+class SignatureRequest:
+    """
+    One signature to verify.
+
+    `signer` is the address for EVM and Cardano wallets and the public key
+    for native Hedera wallets.
+    """
+    kind: str  # 'evm', 'hedera' or 'cardano'
+    message: str
+    signature: str
+    signer: str
+
+
+def signature_kind(wallet_type: str) -> Optional[str]:
+    wallet_type = wallet_type.upper()
+    if wallet_type in EVM_WALLETS:
+        return 'evm'
+    if wallet_type in HEDERA_WALLETS:
+        return 'hedera'
+    if wallet_type in CARDANO_WALLETS:
+        return 'cardano'
+    return None
+
+
+def verify_signature(request: SignatureRequest) -> bool:
+    """Verify one signature in the current process"""
+    from app.core.wallet_auth import WalletAuthenticator
+
+    if request.kind == 'evm':
+        return WalletAuthenticator.verify_evm_signature(request.message, request.signature, request.signer)
+    if request.kind == 'hedera':
+        return WalletAuthenticator.verify_hedera_signature(request.message, request.signature, request.signer)
+    if request.kind == 'cardano':
+        return WalletAuthenticator.verify_cardano_signature(request.message, request.signature, request.signer)
+    return False
+
+
+def _verify_batch(requests: Sequence[SignatureRequest]) -> List[bool]:
+    return [verify_signature(request) for request in requests]
+
+
+def _warm_up() -> None:
+    # Pay the crypto library imports once per worker, not on the first login
+    import app.core.wallet_auth  # noqa: F401
+
+
+class SignatureVerifier:
+    """Process-pool backed signature verification"""
+
+    def __init__(self, processes: int = 0):
+        self.processes = processes or os.cpu_count() or 1
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if not self._executor:
+            # spawn: forking a process that already hosts the JVM and
+            # event loop threads is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.processes,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm_up
+            )
+        return self._executor
+
+    async def verify(self, request: SignatureRequest) -> bool:
+        return (await self.verify_many([request]))[0]
+
+    async def verify_many(self, requests: Sequence[SignatureRequest]) -> List[bool]:
+        """Verify signatures in parallel; results keep the input order"""
+        if not requests:
+            return []
+
+        size = -(-len(requests) // self.processes)  # ceil division
+        batches = [requests[i:i + size] for i in range(0, len(requests), size)]
+
+        loop = asyncio.get_running_loop()
+        try:
+            executor = self._get_executor()
+            results = await asyncio.gather(*[
+                loop.run_in_executor(executor, _verify_batch, batch) for batch in batches
+            ])
+        except BrokenProcessPool as e:
+            print(f"⚠️  Signature verification pool failed, restarting: {e}")
+            self._executor = None
+            results = await asyncio.gather(*[
+                asyncio.to_thread(_verify_batch, batch) for batch in batches
+            ])
+
+        return [valid for batch in results for valid in batch]
+
+    def close(self) -> None:
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Global signature verifier instance
+signature_verifier = SignatureVerifier(processes=settings.SIGNATURE_VERIFY_PROCESSES)
@@ -0,0 +1,124 @@
+"""
+Stateless HMAC-signed login nonces.
+
+A nonce is hex(issued_at || random || HMAC(secret, address || issued_at || random)),
+so it can be checked without a Redis round-trip and keeps matching the
+`Nonce: [a-f0-9]+` pattern in the sign-in message. Single use is enforced by
+ReplayFilter, a pair of bloom filters keyed on the TTL bucket a nonce was
+issued in: anything older than the previous bucket is already expired, so
+buckets are simply dropped as time moves on.
+
+The replay filter is per process. With several API workers, a captured
+signed message could be replayed once per worker within the TTL; keep
+NONCE_MODE=redis where that matters.
+"""
+
+import hashlib
+import hmac
+import math
+import secrets
+import struct
+import time
+from typing import Dict, Optional
+
+from app.core.config import settings
+
+RANDOM_BYTES = 8
+MAC_BYTES = 16
+NONCE_HEX_LENGTH = (8 + RANDOM_BYTES + MAC_BYTES) * 2
+# Tolerated clock skew for nonces issued by another API instance
+MAX_CLOCK_SKEW_SECONDS = 30
+
+
+class BloomFilter:
+    """Fixed-size bloom filter over bytes keys"""
+
+    def __init__(self, capacity: int, error_rate: float = 1e-6):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: bytes):
+        digest = hashlib.blake2b(key, digest_size=16).digest()
+        h1, h2 = struct.unpack("<QQ", digest)
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, key: bytes) -> bool:
+        """Add key; returns False if it was (probably) already present"""
+        present = True
+        for position in self._positions(key):
+            byte, bit = divmod(position, 8)
+            if not self.bits[byte] & (1 << bit):
+                present = False
+                self.bits[byte] |= 1 << bit
+        return not present
+
+
+class ReplayFilter:
+    """Consumed-nonce set bucketed by issue time (current and previous TTL window)"""
+
+    def __init__(self, ttl_seconds: int, capacity: int):
+        self.ttl_seconds = ttl_seconds
+        self.capacity = capacity
+        self.buckets: Dict[int, BloomFilter] = {}
+
+    def consume(self, nonce: bytes, issued_at: int, now: Optional[float] = None) -> bool:
+        """Mark nonce as used; False if it was seen before"""
+        current = int(now if now is not None else time.time()) // self.ttl_seconds
+        for bucket in [b for b in self.buckets if b < current - 1]:
+            del self.buckets[bucket]
+
+        bucket = issued_at // self.ttl_seconds
+        if bucket not in self.buckets:
+            self.buckets[bucket] = BloomFilter(self.capacity)
+        return self.buckets[bucket].add(nonce)
+
+
+class StatelessNonces:
+    """Issues and verifies HMAC-signed nonces bound to a wallet address"""
+
+    def __init__(self, secret: bytes, ttl_seconds: int, capacity: int):
+        self.secret = secret
+        self.ttl_seconds = ttl_seconds
+        self.replay_filter = ReplayFilter(ttl_seconds, capacity)
+
+    def _mac(self, address: str, issued_at: bytes, random: bytes) -> bytes:
+        payload = address.encode("utf-8") + b"\x00" + issued_at + random
+        return hmac.new(self.secret, payload, hashlib.sha256).digest()[:MAC_BYTES]
+
+    def issue(self, address: str, now: Optional[float] = None) -> str:
+        issued_at = struct.pack(">Q", int(now if now is not None else time.time()))
+        random = secrets.token_bytes(RANDOM_BYTES)
+        return (issued_at + random + self._mac(address, issued_at, random)).hex()
+
+    def verify(self, nonce: str, address: str, now: Optional[float] = None) -> bool:
+        """Check signature, age and single use"""
+        if len(nonce) != NONCE_HEX_LENGTH:
+            return False
+        try:
+            raw = bytes.fromhex(nonce)
+        except ValueError:
+            return False
+
+        issued_at_bytes, random, mac = raw[:8], raw[8:8 + RANDOM_BYTES], raw[8 + RANDOM_BYTES:]
+        if not hmac.compare_digest(mac, self._mac(address, issued_at_bytes, random)):
+            return False
+
+        now = now if now is not None else time.time()
+        issued_at = struct.unpack(">Q", issued_at_bytes)[0]
+        if not -MAX_CLOCK_SKEW_SECONDS <= now - issued_at <= self.ttl_seconds:
+            return False
+
+        return self.replay_filter.consume(raw, issued_at, now)
+
+
+def _secret() -> bytes:
+    if settings.NONCE_SECRET:
+        return settings.NONCE_SECRET.encode("utf-8")
+    # Domain-separated from JWT signing
+    return hmac.new(settings.JWT_SECRET.encode("utf-8"), b"harvestledger-login-nonce", hashlib.sha256).digest()
+
+
+# Global stateless nonce instance
+stateless_nonces = StatelessNonces(_secret(), settings.NONCE_TTL_SECONDS, settings.NONCE_REPLAY_CAPACITY)
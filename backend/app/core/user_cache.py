@@ -0,0 +1,122 @@
+"""
+Cache of authenticated user snapshots keyed on the JWT `sub` claim.
+
+Every authenticated GraphQL request needs the current user. Snapshots are
+kept in a small in-process LRU and, when Redis is connected, shared across
+workers so most requests skip the users table entirely. Mutations that
+change user fields must call `invalidate` after committing.
+"""
+
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from app.core.cache import LocalLRU
+from app.core.config import settings
+from app.core.redis_client import redis_client
+from app.models.user import User as UserModel
+
+# Columns that never leave the database through the cache
+EXCLUDED_COLUMNS = {"hashed_password"}
+
+
+def _snapshot(user: UserModel) -> Dict[str, Any]:
+    return {
+        column.key: getattr(user, column.key)
+        for column in UserModel.__table__.columns
+        if column.key not in EXCLUDED_COLUMNS
+    }
+
+
+def _to_json(snapshot: Dict[str, Any]) -> str:
+    def encode(value):
+        if isinstance(value, datetime):
+            return value.isoformat()
+        if isinstance(value, uuid.UUID):
+            return str(value)
+        if hasattr(value, "value"):  # Enum
+            return value.value
+        return value
+
+    return json.dumps({key: encode(value) for key, value in snapshot.items()})
+
+
+def _from_json(raw: str) -> Dict[str, Any]:
+    data = json.loads(raw)
+    snapshot = {}
+    for column in UserModel.__table__.columns:
+        if column.key not in data:
+            continue
+        value = data[column.key]
+        if value is not None:
+            python_type = column.type.python_type
+            if python_type is datetime:
+                value = datetime.fromisoformat(value)
+            elif python_type is not str:
+                value = python_type(value)
+        snapshot[column.key] = value
+    return snapshot
+
+
+class UserCache:
+    """Two-level (in-process LRU + Redis) cache of user snapshots"""
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: int = 30):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._local = LocalLRU(max_size)
+
+    @staticmethod
+    def _redis_key(sub: str) -> str:
+        return f"user_snapshot:{sub}"
+
+    async def get(self, sub: str) -> Optional[UserModel]:
+        """Return a detached User built from the cached snapshot, if any"""
+        found, snapshot = self._local.get(sub)
+        if found:
+            return UserModel(**snapshot)
+
+        if redis_client.redis:
+            try:
+                raw = await redis_client.redis.get(self._redis_key(sub))
+                if raw:
+                    snapshot = _from_json(raw)
+                    self._local.set(sub, snapshot, self.ttl_seconds)
+                    return UserModel(**snapshot)
+            except Exception as e:
+                print(f"⚠️  User cache read failed: {e}")
+
+        return None
+
+    async def set(self, sub: str, user: UserModel) -> None:
+        """Cache a snapshot of `user` under the token subject"""
+        snapshot = _snapshot(user)
+        self._local.set(sub, snapshot, self.ttl_seconds)
+
+        if redis_client.redis:
+            try:
+                await redis_client.redis.setex(self._redis_key(sub), self.ttl_seconds, _to_json(snapshot))
+            except Exception as e:
+                print(f"⚠️  User cache write failed: {e}")
+
+    async def invalidate(self, user_id) -> None:
+        """Drop the cached snapshot for a user after their row changes"""
+        sub = str(user_id)
+        self._local.pop(sub)
+
+        if redis_client.redis:
+            try:
+                await redis_client.redis.delete(self._redis_key(sub))
+            except Exception as e:
+                print(f"⚠️  User cache invalidation failed: {e}")
+
+    def clear(self) -> None:
+        self._local.clear()
+
+
+# Global user cache instance
+user_cache = UserCache(
+    max_size=settings.USER_CACHE_MAX_SIZE,
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS
+)
@@ -5,10 +5,15 @@
 from typing import Optional, Tuple
 from eth_account import Account
 from eth_account.messages import encode_defunct
-from hedera import PublicKey, PrivateKey
 import hashlib
 from app.core.config import settings
-from app.core.redis_client import redis_client
+from app.core.ephemeral_store import ephemeral_store
+from app.core.stateless_nonce import stateless_nonces
+from app.core import hedera_keys
+from app.core import evm_signatures
+from app.core.signature_verifier import (
+    SignatureRequest, signature_kind, signature_verifier, CARDANO_WALLETS
+)
 
 # Cardano imports
 try:
@@ -25,8 +30,10 @@ class WalletAuthenticator:
     """Handles wallet signature verification for different wallet types"""
     
     @staticmethod
-    def generate_nonce() -> str:
-        """Generate a cryptographically secure nonce"""
+    def generate_nonce(address: Optional[str] = None) -> str:
+        """Generate a cryptographically secure nonce (HMAC-signed in stateless mode)"""
+        if settings.NONCE_MODE == "stateless" and address is not None:
+            return stateless_nonces.issue(address)
         return secrets.token_hex(16)
     
     @staticmethod
@@ -46,13 +53,26 @@ def create_siwe_message(address: str, nonce: str) -> str:
     
     @staticmethod
     async def store_nonce(nonce: str, address: str) -> None:
-        """Store nonce in Redis with 5-minute expiration"""
-        await redis_client.set_nonce(nonce, address, 300)
+        """Store nonce with 5-minute expiration (no-op for stateless nonces)"""
+        if settings.NONCE_MODE == "stateless" or not ephemeral_store.available:
+            return
+        await ephemeral_store.set(f"nonce:{nonce}", address, 300)
     
     @staticmethod
     async def verify_nonce(nonce: str, address: str) -> bool:
         """Verify and consume nonce (one-time use)"""
-        stored_address = await redis_client.get_nonce(nonce)
+        if settings.NONCE_MODE == "stateless":
+            is_valid = stateless_nonces.verify(nonce, address)
+            print(f"🔍 Stateless nonce verification: nonce={nonce[:10]}..., address={address[:20]}..., valid={is_valid}")
+            return is_valid
+        if not ephemeral_store.available:
+            print("⚠️  Ephemeral store not available")
+            return False
+        try:
+            stored_address = await ephemeral_store.getdel(f"nonce:{nonce}")
+        except Exception as e:
+            print(f"❌ Nonce lookup failed: {e}")
+            return False
         print(f"🔍 Nonce verification: nonce={nonce[:10]}..., address={address[:20]}..., stored={stored_address[:20] if stored_address else 'None'}...")
         return stored_address == address
     
@@ -60,11 +80,19 @@ async def verify_nonce(nonce: str, address: str) -> bool:
     def verify_evm_signature(message: str, signature: str, address: str) -> bool:
         """Verify EVM wallet signature (MetaMask, Blade EVM mode)"""
         try:
-            # Create message hash
-            message_hash = encode_defunct(text=message)
+            signature_bytes = bytes.fromhex(signature.removeprefix('0x'))
             
-            # Recover address from signature
-            recovered_address = Account.recover_message(message_hash, signature=signature)
+            if evm_signatures.FAST_ECRECOVER_AVAILABLE and len(signature_bytes) == 65:
+                # libsecp256k1 fast path with recovered-address cache
+                recovered_address = evm_signatures.recover_address(
+                    evm_signatures.personal_message_hash(message), signature_bytes
+                )
+            else:
+                # Create message hash
+                message_hash = encode_defunct(text=message)
+                
+                # Recover address from signature
+                recovered_address = Account.recover_message(message_hash, signature=signature_bytes)
             
             # Compare addresses (case-insensitive)
             return recovered_address.lower() == address.lower()
@@ -76,17 +104,14 @@ def verify_evm_signature(message: str, signature: str, address: str) -> bool:
     def verify_hedera_signature(message: str, signature: str, public_key_str: str) -> bool:
         """Verify native Hedera wallet signature (HashPack, Kabila, Portal) - REAL VERIFICATION"""
         try:
-            # Parse public key using official Hedera SDK
-            public_key = PublicKey.fromString(public_key_str)
-            
             # Convert message to bytes
             message_bytes = message.encode('utf-8')
             
             # Convert signature from hex to bytes
-            signature_bytes = bytes.fromhex(signature)
+            signature_bytes = bytes.fromhex(signature.removeprefix('0x'))
             
-            # Verify signature using real Hedera cryptography
-            is_valid = public_key.verify(message_bytes, signature_bytes)
+            # Verify ED25519/ECDSA(secp256k1) natively; no JVM-backed SDK needed
+            is_valid = hedera_keys.verify_signature(public_key_str, message_bytes, signature_bytes)
             
             if is_valid:
                 print(f"✅ Hedera signature verified for public key: {public_key_str[:20]}...")
@@ -419,21 +444,20 @@ async def authenticate_wallet(
             
             print("✅ Nonce verified")
             
-            # Verify signature based on wallet type
-            signature_valid = False
-            
-            if wallet_type.upper() in ['METAMASK', 'BLADE_EVM']:
-                signature_valid = WalletAuthenticator.verify_evm_signature(message, signature, address)
-            elif wallet_type.upper() in ['HASHPACK', 'KABILA', 'PORTAL', 'BLADE_NATIVE']:
-                if not public_key:
-                    return False, None
-                signature_valid = WalletAuthenticator.verify_hedera_signature(message, signature, public_key)
-            elif wallet_type.upper() in ['NAMI', 'ETERNL', 'LACE', 'FLINT', 'TYPHON']:
-                # Cardano wallets
-                signature_valid = WalletAuthenticator.verify_cardano_signature(message, signature, address)
-            else:
+            # Verify signature based on wallet type (off the event loop)
+            kind = signature_kind(wallet_type)
+            if kind is None:
                 print(f"❌ Unsupported wallet type: {wallet_type}")
                 return False, None
+            if kind == 'hedera' and not public_key:
+                return False, None
+            
+            signature_valid = await signature_verifier.verify(SignatureRequest(
+                kind=kind,
+                message=message,
+                signature=signature,
+                signer=public_key if kind == 'hedera' else address
+            ))
             
             if not signature_valid:
                 return False, None
@@ -441,7 +465,7 @@ async def authenticate_wallet(
             # Extract account identifier based on wallet type
             # For Cardano wallets, use the address directly
             # For Hedera/EVM wallets, extract Hedera account ID
-            if wallet_type.upper() in ['NAMI', 'ETERNL', 'LACE', 'FLINT', 'TYPHON']:
+            if wallet_type.upper() in CARDANO_WALLETS:
                 # Cardano address - use as-is
                 account_id = address
             else:
@@ -6,11 +6,13 @@
 import strawberry
 from typing import List, Optional
 from datetime import datetime
-from sqlalchemy.orm import Session
+from sqlalchemy import select, func
 from fastapi import HTTPException
 
-from app.core.database import SessionLocal
+from app.core.database import request_session
 from app.core.cardano_client import cardano_client
+from app.core.cache import chain_cache
+from app.core.config import settings
 from app.models.user import User as UserModel
 from app.models.cardano import (
     CardanoWallet as CardanoWalletModel,
@@ -30,10 +32,19 @@
     TransferCardanoTokenInput,
     CardanoWalletResponse,
     CardanoTokenResponse,
-    CardanoTransactionResponse
+    CardanoTransactionResponse,
+    cardano_token_from_model,
+    cardano_transaction_from_model
 )
 
 
+def _transaction_ttl(tx_info: dict) -> Optional[int]:
+    """Confirmed transactions are immutable and cached indefinitely"""
+    if tx_info.get('block_height') is not None:
+        return None
+    return settings.CHAIN_CACHE_PENDING_TX_TTL_SECONDS
+
+
 @strawberry.type
 class CardanoQuery:
     """GraphQL queries for Cardano blockchain data"""
@@ -53,43 +64,40 @@ async def cardano_wallet(
         if not current_user:
             raise HTTPException(status_code=401, detail="Authentication required")
         
-        db = SessionLocal()
-        try:
-            query = db.query(CardanoWalletModel)
-            
-            if wallet_id:
-                query = query.filter(CardanoWalletModel.id == wallet_id)
-            elif address:
-                query = query.filter(CardanoWalletModel.address == address)
-            else:
-                # Get primary wallet for current user
-                query = query.filter(
-                    CardanoWalletModel.user_id == current_user.id,
-                    CardanoWalletModel.is_primary == True
-                )
-            
-            wallet = query.first()
-            
-            if not wallet:
-                return None
-            
-            # Verify user owns this wallet
-            if wallet.user_id != current_user.id:
-                raise HTTPException(status_code=403, detail="Access denied")
-            
-            return CardanoWallet(
-                id=wallet.id,
-                user_id=wallet.user_id,
-                address=wallet.address,
-                stake_address=wallet.stake_address,
-                wallet_type=wallet.wallet_type,
-                is_primary=wallet.is_primary,
-                created_at=wallet.created_at,
-                updated_at=wallet.updated_at,
-                last_synced_at=wallet.last_synced_at
+        db = request_session()
+        query = select(CardanoWalletModel)
+        
+        if wallet_id:
+            query = query.where(CardanoWalletModel.id == wallet_id)
+        elif address:
+            query = query.where(CardanoWalletModel.address == address)
+        else:
+            # Get primary wallet for current user
+            query = query.where(
+                CardanoWalletModel.user_id == current_user.id,
+                CardanoWalletModel.is_primary == True
             )
-        finally:
-            db.close()
+        
+        wallet = await db.scalar(query.limit(1))
+        
+        if not wallet:
+            return None
+        
+        # Verify user owns this wallet
+        if wallet.user_id != current_user.id:
+            raise HTTPException(status_code=403, detail="Access denied")
+        
+        return CardanoWallet(
+            id=wallet.id,
+            user_id=wallet.user_id,
+            address=wallet.address,
+            stake_address=wallet.stake_address,
+            wallet_type=wallet.wallet_type,
+            is_primary=wallet.is_primary,
+            created_at=wallet.created_at,
+            updated_at=wallet.updated_at,
+            last_synced_at=wallet.last_synced_at
+        )
     
     @strawberry.field
     async def cardano_tokens(
@@ -106,38 +114,23 @@ async def cardano_tokens(
         if not current_user:
             raise HTTPException(status_code=401, detail="Authentication required")
         
-        db = SessionLocal()
-        try:
-            # Build query
-            query = db.query(CardanoTokenModel).join(CardanoWalletModel)
-            
-            # Filter by user
-            query = query.filter(CardanoWalletModel.user_id == current_user.id)
-            
-            # Optional filters
-            if wallet_id:
-                query = query.filter(CardanoTokenModel.owner_wallet_id == wallet_id)
-            
-            if policy_id:
-                query = query.filter(CardanoTokenModel.policy_id == policy_id)
-            
-            tokens = query.all()
-            
-            return [CardanoToken(
-                id=token.id,
-                policy_id=token.policy_id,
-                asset_name=token.asset_name,
-                asset_name_readable=token.asset_name_readable,
-                fingerprint=token.fingerprint,
-                owner_wallet_id=token.owner_wallet_id,
-                quantity=token.quantity,
-                metadata=token.token_metadata,
-                minting_tx_hash=token.minting_tx_hash,
-                created_at=token.created_at,
-                updated_at=token.updated_at
-            ) for token in tokens]
-        finally:
-            db.close()
+        db = request_session()
+        # Build query
+        query = select(CardanoTokenModel).join(CardanoWalletModel)
+        
+        # Filter by user
+        query = query.where(CardanoWalletModel.user_id == current_user.id)
+        
+        # Optional filters
+        if wallet_id:
+            query = query.where(CardanoTokenModel.owner_wallet_id == wallet_id)
+        
+        if policy_id:
+            query = query.where(CardanoTokenModel.policy_id == policy_id)
+        
+        tokens = (await db.scalars(query)).all()
+        
+        return [cardano_token_from_model(token) for token in tokens]
     
     @strawberry.field
     async def cardano_transactions(
@@ -155,44 +148,29 @@ async def cardano_transactions(
         if not current_user:
             raise HTTPException(status_code=401, detail="Authentication required")
         
-        db = SessionLocal()
-        try:
-            # Build query
-            query = db.query(CardanoTransactionModel).join(CardanoWalletModel)
-            
-            # Filter by user
-            query = query.filter(CardanoWalletModel.user_id == current_user.id)
-            
-            # Optional filters
-            if wallet_id:
-                query = query.filter(CardanoTransactionModel.wallet_id == wallet_id)
-            
-            if transaction_type:
-                query = query.filter(CardanoTransactionModel.transaction_type == transaction_type)
-            
-            # Order by most recent first
-            query = query.order_by(CardanoTransactionModel.created_at.desc())
-            
-            # Limit results
-            query = query.limit(limit)
-            
-            transactions = query.all()
-            
-            return [CardanoTransaction(
-                id=tx.id,
-                tx_hash=tx.tx_hash,
-                wallet_id=tx.wallet_id,
-                transaction_type=tx.transaction_type,
-                amount_ada=tx.amount_ada,
-                fee=tx.fee,
-                metadata=tx.tx_metadata,
-                block_height=tx.block_height,
-                block_time=tx.block_time,
-                status=tx.status,
-                created_at=tx.created_at
-            ) for tx in transactions]
-        finally:
-            db.close()
+        db = request_session()
+        # Build query
+        query = select(CardanoTransactionModel).join(CardanoWalletModel)
+        
+        # Filter by user
+        query = query.where(CardanoWalletModel.user_id == current_user.id)
+        
+        # Optional filters
+        if wallet_id:
+            query = query.where(CardanoTransactionModel.wallet_id == wallet_id)
+        
+        if transaction_type:
+            query = query.where(CardanoTransactionModel.transaction_type == transaction_type)
+        
+        # Order by most recent first
+        query = query.order_by(CardanoTransactionModel.created_at.desc())
+        
+        # Limit results
+        query = query.limit(limit)
+        
+        transactions = (await db.scalars(query)).all()
+        
+        return [cardano_transaction_from_model(tx) for tx in transactions]
     
     @strawberry.field
     async def cardano_token_info(
@@ -205,7 +183,12 @@ async def cardano_token_info(
         Public query - no authentication required.
         """
         # Query Blockfrost for token info
-        asset_info = await cardano_client.get_asset_info(policy_id, asset_name)
+        # Quantity changes on mint/burn, so asset info only gets a short TTL
+        asset_info = await chain_cache.get_or_load(
+            f"cardano:asset:{policy_id}{asset_name}",
+            lambda: cardano_client.get_asset_info(policy_id, asset_name),
+            ttl=settings.CHAIN_CACHE_TOKEN_TTL_SECONDS
+        )
         
         if not asset_info:
             return None
@@ -235,7 +218,11 @@ async def cardano_transaction_details(
         Public query - no authentication required.
         """
         # Query Blockfrost for transaction details
-        tx_info = await cardano_client.get_transaction(tx_hash)
+        tx_info = await chain_cache.get_or_load(
+            f"cardano:tx:{tx_hash}",
+            lambda: cardano_client.get_transaction(tx_hash),
+            ttl=_transaction_ttl
+        )
         
         if not tx_info:
             return None
@@ -278,12 +265,13 @@ async def connect_cardano_wallet(
                 wallet=None
             )
         
-        db = SessionLocal()
+        db = request_session()
+        savepoint = await db.begin_nested()
         try:
             # Check if wallet already exists
-            existing_wallet = db.query(CardanoWalletModel).filter(
+            existing_wallet = await db.scalar(select(CardanoWalletModel).where(
                 CardanoWalletModel.address == input.address
-            ).first()
+            ))
             
             if existing_wallet:
                 if existing_wallet.user_id != current_user.id:
@@ -321,9 +309,11 @@ async def connect_cardano_wallet(
                 )
             
             # Check if user has any Cardano wallets
-            user_wallets_count = db.query(CardanoWalletModel).filter(
-                CardanoWalletModel.user_id == current_user.id
-            ).count()
+            user_wallets_count = await db.scalar(
+                select(func.count()).select_from(CardanoWalletModel).where(
+                    CardanoWalletModel.user_id == current_user.id
+                )
+            )
             
             # First wallet is primary by default
             is_primary = user_wallets_count == 0
@@ -339,8 +329,8 @@ async def connect_cardano_wallet(
             )
             
             db.add(new_wallet)
-            db.commit()
-            db.refresh(new_wallet)
+            await db.flush()
+            await db.refresh(new_wallet)
             
             return CardanoWalletResponse(
                 success=True,
@@ -359,14 +349,12 @@ async def connect_cardano_wallet(
             )
             
         except Exception as e:
-            db.rollback()
+            await savepoint.rollback()
             return CardanoWalletResponse(
                 success=False,
                 message=f"Failed to connect wallet: {str(e)}",
                 wallet=None
             )
-        finally:
-            db.close()
     
     @strawberry.mutation
     async def mint_cardano_token(
@@ -387,13 +375,14 @@ async def mint_cardano_token(
                 token=None
             )
         
-        db = SessionLocal()
+        db = request_session()
+        savepoint = await db.begin_nested()
         try:
             # Verify wallet belongs to user
-            wallet = db.query(CardanoWalletModel).filter(
+            wallet = await db.scalar(select(CardanoWalletModel).where(
                 CardanoWalletModel.id == input.wallet_id,
                 CardanoWalletModel.user_id == current_user.id
-            ).first()
+            ))
             
             if not wallet:
                 return CardanoTokenResponse(
@@ -403,11 +392,11 @@ async def mint_cardano_token(
                 )
             
             # Check if token already exists
-            existing_token = db.query(CardanoTokenModel).filter(
+            existing_token = await db.scalar(select(CardanoTokenModel).where(
                 CardanoTokenModel.policy_id == input.policy_id,
                 CardanoTokenModel.asset_name == input.asset_name,
                 CardanoTokenModel.owner_wallet_id == input.wallet_id
-            ).first()
+            ))
             
             if existing_token:
                 return CardanoTokenResponse(
@@ -443,8 +432,8 @@ async def mint_cardano_token(
             )
             
             db.add(transaction)
-            db.commit()
-            db.refresh(new_token)
+            await db.flush()
+            await db.refresh(new_token)
             
             return CardanoTokenResponse(
                 success=True,
@@ -465,14 +454,12 @@ async def mint_cardano_token(
             )
             
         except Exception as e:
-            db.rollback()
+            await savepoint.rollback()
             return CardanoTokenResponse(
                 success=False,
                 message=f"Failed to record minted token: {str(e)}",
                 token=None
             )
-        finally:
-            db.close()
     
     @strawberry.mutation
     async def transfer_cardano_token(
@@ -493,13 +480,14 @@ async def transfer_cardano_token(
                 transaction=None
             )
         
-        db = SessionLocal()
+        db = request_session()
+        savepoint = await db.begin_nested()
         try:
             # Verify sender wallet belongs to user
-            from_wallet = db.query(CardanoWalletModel).filter(
+            from_wallet = await db.scalar(select(CardanoWalletModel).where(
                 CardanoWalletModel.id == input.from_wallet_id,
                 CardanoWalletModel.user_id == current_user.id
-            ).first()
+            ))
             
             if not from_wallet:
                 return CardanoTransactionResponse(
@@ -509,9 +497,9 @@ async def transfer_cardano_token(
                 )
             
             # Find or create recipient wallet
-            to_wallet = db.query(CardanoWalletModel).filter(
+            to_wallet = await db.scalar(select(CardanoWalletModel).where(
                 CardanoWalletModel.address == input.to_address
-            ).first()
+            ))
             
             if not to_wallet:
                 # Create wallet record for recipient (external wallet)
@@ -522,13 +510,13 @@ async def transfer_cardano_token(
                     is_primary=False
                 )
                 db.add(to_wallet)
-                db.flush()
+                await db.flush()
             
             # Find token
-            token = db.query(CardanoTokenModel).filter(
+            token = await db.scalar(select(CardanoTokenModel).where(
                 CardanoTokenModel.id == input.token_id,
                 CardanoTokenModel.owner_wallet_id == input.from_wallet_id
-            ).first()
+            ))
             
             if not token:
                 return CardanoTransactionResponse(
@@ -550,7 +538,7 @@ async def transfer_cardano_token(
             )
             
             db.add(transaction)
-            db.flush()
+            await db.flush()
             
             # Create transfer record
             transfer = CardanoTokenTransferModel(
@@ -569,7 +557,7 @@ async def transfer_cardano_token(
             new_quantity = current_quantity - transfer_quantity
             
             if new_quantity < 0:
-                db.rollback()
+                await savepoint.rollback()
                 return CardanoTransactionResponse(
                     success=False,
                     message="Insufficient token balance",
@@ -580,11 +568,11 @@ async def transfer_cardano_token(
             
             # If transferring to another user in our system, create/update their token record
             if to_wallet.user_id:
-                recipient_token = db.query(CardanoTokenModel).filter(
+                recipient_token = await db.scalar(select(CardanoTokenModel).where(
                     CardanoTokenModel.policy_id == token.policy_id,
                     CardanoTokenModel.asset_name == token.asset_name,
                     CardanoTokenModel.owner_wallet_id == to_wallet.id
-                ).first()
+                ))
                 
                 if recipient_token:
                     recipient_quantity = int(recipient_token.quantity)
@@ -601,8 +589,8 @@ async def transfer_cardano_token(
                     )
                     db.add(recipient_token)
             
-            db.commit()
-            db.refresh(transaction)
+            await db.flush()
+            await db.refresh(transaction)
             
             return CardanoTransactionResponse(
                 success=True,
@@ -623,11 +611,9 @@ async def transfer_cardano_token(
             )
             
         except Exception as e:
-            db.rollback()
+            await savepoint.rollback()
             return CardanoTransactionResponse(
                 success=False,
                 message=f"Failed to record token transfer: {str(e)}",
                 transaction=None
             )
-        finally:
-            db.close()
@@ -29,6 +29,18 @@ class CardanoWallet:
     created_at: Optional[datetime]
     updated_at: Optional[datetime]
     last_synced_at: Optional[datetime]
+    
+    @strawberry.field
+    async def tokens(self, info) -> List["CardanoToken"]:
+        """Tokens held by this wallet"""
+        tokens = await info.context.loaders.cardano_tokens_by_wallet_id.load(self.id)
+        return [cardano_token_from_model(t) for t in tokens]
+    
+    @strawberry.field
+    async def transactions(self, info) -> List["CardanoTransaction"]:
+        """Transactions recorded for this wallet"""
+        transactions = await info.context.loaders.cardano_transactions_by_wallet_id.load(self.id)
+        return [cardano_transaction_from_model(tx) for tx in transactions]
 
 
 @strawberry.type
@@ -149,3 +161,36 @@ class CardanoTransactionResponse:
     success: bool
     message: str
     transaction: Optional[CardanoTransaction]
+
+
+# Model conversion helpers used by resolvers and relationship fields
+def cardano_token_from_model(token) -> CardanoToken:
+    return CardanoToken(
+        id=token.id,
+        policy_id=token.policy_id,
+        asset_name=token.asset_name,
+        asset_name_readable=token.asset_name_readable,
+        fingerprint=token.fingerprint,
+        owner_wallet_id=token.owner_wallet_id,
+        quantity=token.quantity,
+        metadata=token.token_metadata,
+        minting_tx_hash=token.minting_tx_hash,
+        created_at=token.created_at,
+        updated_at=token.updated_at
+    )
+
+
+def cardano_transaction_from_model(tx) -> CardanoTransaction:
+    return CardanoTransaction(
+        id=tx.id,
+        tx_hash=tx.tx_hash,
+        wallet_id=tx.wallet_id,
+        transaction_type=tx.transaction_type,
+        amount_ada=tx.amount_ada,
+        fee=tx.fee,
+        metadata=tx.tx_metadata,
+        block_height=tx.block_height,
+        block_time=tx.block_time,
+        status=tx.status,
+        created_at=tx.created_at
+    )
@@ -0,0 +1,103 @@
+"""
+Per-request DataLoader registry for GraphQL relationship fields.
+
+Each loader collects the keys requested during one tick of the event loop
+and resolves them with a single `WHERE ... IN (...)` statement, so nested
+queries cost a constant number of SQL round trips instead of one per row.
+"""
+
+import asyncio
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from strawberry.dataloader import DataLoader
+
+from app.models.user import User as UserModel
+from app.models.user_wallet import UserWallet as UserWalletModel, UserSession as UserSessionModel
+from app.models.harvest import Harvest as HarvestModel
+from app.models.loan import Loan as LoanModel
+from app.models.cardano import (
+    CardanoToken as CardanoTokenModel,
+    CardanoTransaction as CardanoTransactionModel,
+)
+
+
+class DataLoaders:
+    """
+    DataLoaders bound to one request's database session.
+
+    `*_by_id` loaders return one row (or None) per key; `*_by_<fk>` loaders
+    return the list of rows pointing at each key.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        # AsyncSession does not allow concurrent statements, and loaders for
+        # different fields can dispatch in the same tick.
+        self._lock = asyncio.Lock()
+
+        self.users_by_id = self._by_id(UserModel.id)
+        self.wallets_by_id = self._by_id(UserWalletModel.id)
+        self.wallets_by_user_id = self._by_foreign_key(
+            UserWalletModel.user_id,
+            order_by=(UserWalletModel.is_primary.desc(), UserWalletModel.created_at)
+        )
+        self.sessions_by_id = self._by_id(UserSessionModel.id)
+        self.active_sessions_by_user_id = self._by_foreign_key(
+            UserSessionModel.user_id,
+            order_by=(UserSessionModel.last_active_at.desc(),),
+            where=lambda: (UserSessionModel.expires_at > datetime.utcnow(),)
+        )
+        self.harvests_by_id = self._by_id(HarvestModel.id)
+        self.harvests_by_farmer_id = self._by_foreign_key(
+            HarvestModel.farmer_id,
+            order_by=(HarvestModel.created_at.desc(),)
+        )
+        self.loans_by_id = self._by_id(LoanModel.id)
+        self.loans_by_borrower_id = self._by_foreign_key(
+            LoanModel.borrower_id,
+            order_by=(LoanModel.created_at.desc(),)
+        )
+        self.cardano_tokens_by_id = self._by_id(CardanoTokenModel.id)
+        self.cardano_tokens_by_wallet_id = self._by_foreign_key(
+            CardanoTokenModel.owner_wallet_id,
+            order_by=(CardanoTokenModel.created_at,)
+        )
+        self.cardano_transactions_by_id = self._by_id(CardanoTransactionModel.id)
+        self.cardano_transactions_by_wallet_id = self._by_foreign_key(
+            CardanoTransactionModel.wallet_id,
+            order_by=(CardanoTransactionModel.created_at.desc(),)
+        )
+
+    async def _fetch(self, statement) -> Sequence[Any]:
+        async with self._lock:
+            return (await self.db.scalars(statement)).all()
+
+    def _by_id(self, column) -> DataLoader:
+        async def load(keys: List[Any]) -> List[Optional[Any]]:
+            rows = await self._fetch(select(column.class_).where(column.in_(keys)))
+            by_key = {str(getattr(row, column.key)): row for row in rows}
+            return [by_key.get(str(key)) for key in keys]
+
+        return DataLoader(load_fn=load, cache_key_fn=str)
+
+    def _by_foreign_key(
+        self,
+        column,
+        order_by: tuple = (),
+        where: Optional[Callable[[], tuple]] = None
+    ) -> DataLoader:
+        async def load(keys: List[Any]) -> List[List[Any]]:
+            statement = select(column.class_).where(column.in_(keys))
+            if where:
+                statement = statement.where(*where())
+            rows = await self._fetch(statement.order_by(*order_by))
+            grouped = defaultdict(list)
+            for row in rows:
+                grouped[str(getattr(row, column.key))].append(row)
+            return [grouped.get(str(key), []) for key in keys]
+
+        return DataLoader(load_fn=load, cache_key_fn=str)
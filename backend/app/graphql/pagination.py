@@ -0,0 +1,115 @@
+"""
+Relay-style cursor pagination for list queries.
+
+Pages are ordered newest first on (created_at, id) and continue from an
+opaque cursor with a row comparison, so every page is a range scan over the
+matching composite index instead of an OFFSET over the whole table.
+"""
+
+import base64
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Generic, List, Optional, Tuple, TypeVar
+
+import strawberry
+from fastapi import HTTPException
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import request_session
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+@strawberry.type
+class PageInfo:
+    has_next_page: bool
+    has_previous_page: bool
+    start_cursor: Optional[str] = None
+    end_cursor: Optional[str] = None
+
+
+@strawberry.type
+class Edge(Generic[T]):
+    cursor: str
+    node: T
+
+
+@strawberry.type
+class Connection(Generic[T]):
+    edges: List[Edge[T]]
+    page_info: PageInfo
+    count_statement: strawberry.Private[Any] = None
+
+    @strawberry.field
+    async def total_count(self) -> int:
+        """Total rows matching the filters (runs a COUNT only when selected)"""
+        return await request_session().scalar(self.count_statement) or 0
+
+
+def encode_cursor(created_at: datetime, row_id: uuid.UUID) -> str:
+    """Encode a (created_at, id) position as an opaque cursor"""
+    raw = f"{created_at.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """Decode a cursor produced by encode_cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        created_at, row_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), uuid.UUID(row_id)
+    except (ValueError, UnicodeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+
+async def paginate(
+    db: AsyncSession,
+    statement,
+    model,
+    convert: Callable[[Any], T],
+    first: int = DEFAULT_PAGE_SIZE,
+    after: Optional[str] = None,
+    columns: Optional[List[Any]] = None
+) -> Connection[T]:
+    """
+    Fetch one page of `statement` (a filtered select of `model`).
+
+    Reads first + 1 rows to learn whether another page exists without a
+    separate query. With `columns` (see projection.selected_columns) only
+    those columns are read and `convert` receives rows instead of models.
+    """
+    first = max(1, min(first, MAX_PAGE_SIZE))
+    count_statement = select(func.count()).select_from(statement.subquery())
+
+    if after:
+        created_at, row_id = decode_cursor(after)
+        statement = statement.where(
+            tuple_(model.created_at, model.id) < tuple_(created_at, row_id)
+        )
+
+    statement = statement.order_by(model.created_at.desc(), model.id.desc()).limit(first + 1)
+    if columns:
+        rows = (await db.execute(statement.with_only_columns(*columns))).all()
+    else:
+        rows = (await db.scalars(statement)).all()
+
+    has_next_page = len(rows) > first
+    edges = [
+        Edge(cursor=encode_cursor(row.created_at, row.id), node=convert(row))
+        for row in rows[:first]
+    ]
+
+    return Connection(
+        edges=edges,
+        page_info=PageInfo(
+            has_next_page=has_next_page,
+            has_previous_page=after is not None,
+            start_cursor=edges[0].cursor if edges else None,
+            end_cursor=edges[-1].cursor if edges else None
+        ),
+        count_statement=count_statement
+    )
@@ -0,0 +1,83 @@
+"""
+Column projection from the GraphQL selection set.
+
+List queries read only the columns the client selected under
+`edges { node { ... } }`, plus the ones cursors and relationship fields
+need, so wide Text/JSON columns (notes, extra_data, repayment_schedule,
+transaction_data) are only fetched when asked for. Nodes are built from
+the returned rows by a compiled row mapper; fields that were not selected
+are left as None and are never serialized.
+"""
+
+import re
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple, Type, TypeVar
+
+from strawberry.types.nodes import FragmentSpread, InlineFragment
+
+from app.graphql.mappers import row_mapper
+from app.graphql.types import User, Harvest, Loan, Transaction
+
+T = TypeVar("T")
+
+NODE_PATH = ("edges", "node")
+# Cursors are built from these
+ALWAYS = ("id", "created_at")
+
+# GraphQL fields that read other columns: aliases and relationship resolvers
+FIELD_COLUMNS: Dict[type, Dict[str, Tuple[str, ...]]] = {
+    User: {
+        "wallet_address": ("hedera_account_id",),
+        "is_email_verified": ("email_verified",),
+        "wallets": ("id",),
+        "harvests": ("id",),
+        "loans": ("id",),
+    },
+    Harvest: {
+        "farmer": ("farmer_id",),
+    },
+    Loan: {
+        "borrower": ("borrower_id",),
+        "lender": ("lender_id",),
+        "collateral_harvest": ("collateral_harvest_id",),
+    },
+    Transaction: {},
+}
+
+_CAMEL_BOUNDARY = re.compile(r"(?<!^)(?=[A-Z])")
+
+
+def _snake_case(name: str) -> str:
+    return _CAMEL_BOUNDARY.sub("_", name).lower()
+
+
+def _selected_names(selections: Iterable[Any], path: Sequence[str]) -> Iterable[str]:
+    """Field names selected under `path`, looking through fragments"""
+    for selection in selections:
+        if isinstance(selection, (FragmentSpread, InlineFragment)):
+            yield from _selected_names(selection.selections, path)
+        elif not path:
+            yield selection.name
+        elif selection.name == path[0]:
+            yield from _selected_names(selection.selections, path[1:])
+
+
+def selected_columns(info, model, node_type: type, path: Sequence[str] = NODE_PATH) -> List[Any]:
+    """`model` columns needed to resolve the selection of `node_type` at `path`"""
+    table_columns = model.__table__.c
+    extra = FIELD_COLUMNS.get(node_type, {})
+    wanted = dict.fromkeys(ALWAYS)
+
+    for field in info.selected_fields:
+        for name in _selected_names(field.selections, path):
+            key = _snake_case(name)
+            for column in extra.get(key, (key,)):
+                if column in table_columns:
+                    wanted[column] = None
+
+    return [getattr(model, column) for column in wanted]
+
+
+def projection(info, model, node_type: Type[T], path: Sequence[str] = NODE_PATH) -> Tuple[List[Any], Callable[[Any], T]]:
+    """Selected columns and the compiled mapper from rows of those columns"""
+    columns = selected_columns(info, model, node_type, path)
+    return columns, row_mapper(node_type, tuple(column.key for column in columns))
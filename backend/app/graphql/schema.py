@@ -1,23 +1,39 @@
 import strawberry
+from strawberry.extensions import SchemaExtension
 from strawberry.fastapi import BaseContext
-from sqlalchemy.orm import Session
+from sqlalchemy import select
 from typing import Optional
 from fastapi import Request
 
 from app.graphql.resolvers import Query, Mutation
 from app.graphql.cardano_resolvers import CardanoQuery, CardanoMutation
+from app.graphql.dataloaders import DataLoaders
 from app.core.auth import verify_token
+from app.core.database import RequestSession, begin_request, current_request
+from app.core.user_cache import user_cache
 from app.models.user import User
 
 
 class Context(BaseContext):
-    def __init__(self, db: Session, current_user: Optional[User] = None):
+    def __init__(self, db: RequestSession, current_user: Optional[User] = None):
         self.db = db
         self.current_user = current_user
+        self.loaders = DataLoaders(db)
 
 
-def get_context(request: Request, db: Session = None):
+class UnitOfWork(SchemaExtension):
+    """Commit the request session once the operation is done (roll back on errors)"""
+
+    async def on_operation(self):
+        yield
+        request = current_request()
+        if request is not None:
+            await request.finish(failed=bool(self.execution_context.errors))
+
+
+async def get_context(request: Request, db: Optional[RequestSession] = None):
     """Extract JWT token from request and get current user"""
+    db = db or begin_request()
     current_user = None
     
     # Try to get token from Authorization header
@@ -27,30 +43,39 @@ def get_context(request: Request, db: Session = None):
         payload = verify_token(token)
         
         if payload:
-            from app.core.database import SessionLocal
-            from app.models.user import User as UserModel
-            temp_db = SessionLocal()
-            try:
-                user_id = payload.get("sub")
-                hedera_account_id = payload.get("hedera_account_id") or payload.get("wallet_address")
-                
-                # Try user_id first (most reliable)
-                if user_id:
-                    current_user = temp_db.query(UserModel).filter(
-                        UserModel.id == user_id
-                    ).first()
-                
-                # Fallback to hedera_account_id if user not found
-                if not current_user and hedera_account_id:
-                    current_user = temp_db.query(UserModel).filter(
-                        UserModel.hedera_account_id == hedera_account_id
-                    ).first()
-            finally:
-                temp_db.close()
+            user_id = payload.get("sub")
+            hedera_account_id = payload.get("hedera_account_id") or payload.get("wallet_address")
+            
+            if user_id:
+                current_user = await user_cache.get(user_id)
+            
+            if not current_user:
+                current_user = await _load_user(db, user_id, hedera_account_id)
+                if current_user and str(current_user.id) == user_id:
+                    await user_cache.set(user_id, current_user)
     
     return Context(db=db, current_user=current_user)
 
 
+async def _load_user(db: RequestSession, user_id: Optional[str], hedera_account_id: Optional[str]):
+    """Look up the token's user on the request session"""
+    from app.models.user import User as UserModel
+    
+    user = None
+    
+    # Try user_id first (most reliable)
+    if user_id:
+        user = await db.scalar(select(UserModel).where(UserModel.id == user_id))
+    
+    # Fallback to hedera_account_id if user not found
+    if not user and hedera_account_id:
+        user = await db.scalar(select(UserModel).where(
+            UserModel.hedera_account_id == hedera_account_id
+        ))
+    
+    return user
+
+
 # Combine existing and Cardano queries
 @strawberry.type
 class CombinedQuery(Query, CardanoQuery):
@@ -68,5 +93,6 @@ class CombinedMutation(Mutation, CardanoMutation):
 # Create the GraphQL schema
 schema = strawberry.Schema(
     query=CombinedQuery,
-    mutation=CombinedMutation
+    mutation=CombinedMutation,
+    extensions=[UnitOfWork]
 )
\ No newline at end of file
@@ -4,6 +4,8 @@
 import uuid
 from enum import Enum
 
+from app.graphql.mappers import model_mapper
+
 
 class UserRole(str, Enum):
     FARMER = "farmer"
@@ -94,6 +96,24 @@ def is_email_verified(self) -> Optional[bool]:
     def full_name_camel_case(self) -> Optional[str]:
         """Alias for full_name as fullName for frontend compatibility"""
         return self.full_name
+    
+    @strawberry.field
+    async def wallets(self, info) -> List["UserWallet"]:
+        """Wallets linked to this user"""
+        wallets = await info.context.loaders.wallets_by_user_id.load(self.id)
+        return [user_wallet_from_model(w) for w in wallets]
+    
+    @strawberry.field
+    async def harvests(self, info) -> List["Harvest"]:
+        """Harvests recorded by this user"""
+        harvests = await info.context.loaders.harvests_by_farmer_id.load(self.id)
+        return [harvest_from_model(h) for h in harvests]
+    
+    @strawberry.field
+    async def loans(self, info) -> List["Loan"]:
+        """Loans borrowed by this user"""
+        loans = await info.context.loaders.loans_by_borrower_id.load(self.id)
+        return [loan_from_model(l) for l in loans]
 
 
 @strawberry.type
@@ -116,6 +136,12 @@ class Harvest:
     notes: Optional[str] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
+    
+    @strawberry.field
+    async def farmer(self, info) -> Optional[User]:
+        """Farmer who recorded this harvest"""
+        farmer = await info.context.loaders.users_by_id.load(self.farmer_id)
+        return user_from_model(farmer) if farmer else None
 
 
 @strawberry.type
@@ -140,6 +166,28 @@ class Loan:
     amount_repaid: float
     outstanding_balance: float
     created_at: datetime
+    
+    @strawberry.field
+    async def borrower(self, info) -> Optional[User]:
+        """User who applied for this loan"""
+        borrower = await info.context.loaders.users_by_id.load(self.borrower_id)
+        return user_from_model(borrower) if borrower else None
+    
+    @strawberry.field
+    async def lender(self, info) -> Optional[User]:
+        """User who funded this loan, if any"""
+        if not self.lender_id:
+            return None
+        lender = await info.context.loaders.users_by_id.load(self.lender_id)
+        return user_from_model(lender) if lender else None
+    
+    @strawberry.field
+    async def collateral_harvest(self, info) -> Optional[Harvest]:
+        """Harvest pledged as collateral, if any"""
+        if not self.collateral_harvest_id:
+            return None
+        harvest = await info.context.loaders.harvests_by_id.load(self.collateral_harvest_id)
+        return harvest_from_model(harvest) if harvest else None
 
 
 @strawberry.type
@@ -367,10 +415,48 @@ class UpdateUserResponse:
     user: Optional[User] = None
 
 
+@strawberry.type
+class HarvestRowError:
+    row: int
+    message: str
+
+
+@strawberry.type
+class BulkHarvestResult:
+    inserted: int
+    failed: int
+    errors: List[HarvestRowError]
+
+
 @strawberry.type
 class RegistrationState:
     wallet_connected: bool
     email_verified: bool
     profile_complete: bool
     registration_complete: bool
-    next_step: Optional[str] = None
\ No newline at end of file
+    next_step: Optional[str] = None
+
+
+# Model conversion helpers used by resolvers and relationship fields
+user_from_model = model_mapper(User)
+harvest_from_model = model_mapper(Harvest)
+loan_from_model = model_mapper(Loan)
+transaction_from_model = model_mapper(Transaction)
+user_wallet_from_model = model_mapper(UserWallet)
+
+
+# current_wallet is a relationship and stays unset rather than lazy-loading
+def user_session_from_model(session) -> UserSession:
+    return UserSession(
+        id=session.id,
+        session_token=session.session_token,
+        device_fingerprint=session.device_fingerprint,
+        ip_address=session.ip_address,
+        user_agent=session.user_agent,
+        screen_resolution=session.screen_resolution,
+        timezone=session.timezone,
+        language=session.language,
+        expires_at=session.expires_at,
+        created_at=session.created_at,
+        last_active_at=session.last_active_at
+    )
@@ -1,19 +1,24 @@
-from fastapi import FastAPI, Depends, Request, Response
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from strawberry.fastapi import GraphQLRouter
 from contextlib import asynccontextmanager
 import logging
 
 from app.core.config import settings
-from app.core.database import engine, Base, get_db
-from app.api.routes import health, auth
+from app.core.database import engine, async_engine, Base, begin_request
+from app.api.routes import health, auth, harvests
 # from app.api.routes import email  # Temporarily disabled
 from app.core.hedera import hedera_client
+from app.core.cardano_client import cardano_client
 from app.core.redis_client import redis_client
+from app.core.signature_verifier import signature_verifier
+from app.core.password_hashing import password_hasher
+from app.services.hcs_outbox import hcs_outbox_worker
+from app.services.session_store import session_store
 from app.graphql.schema import schema, get_context
 
 # Import all models to register them with SQLAlchemy Base
-from app.models import user, user_wallet, harvest, loan, transaction
+from app.models import user, user_wallet, harvest, loan, transaction, hcs_outbox
 
 # Configure logging
 logging.basicConfig(
@@ -33,16 +38,29 @@ async def lifespan(app: FastAPI):
         Base.metadata.create_all(bind=engine)
         print("Database tables created successfully")
         
-        # Initialize Redis client
-        print("Connecting to Redis...")
-        await redis_client.connect()
-        print("Redis connected successfully")
+        # Initialize Redis client (optional when auth state is kept in memory)
+        if settings.REDIS_URL or settings.EPHEMERAL_STORE_BACKEND != "memory":
+            print("Connecting to Redis...")
+            await redis_client.connect()
+            print("Redis connected successfully")
+        else:
+            print("⚠️  REDIS_URL not set - using the in-memory ephemeral store only")
         
         # Initialize Hedera client
         print("Initializing Hedera client...")
         await hedera_client.initialize()
         print("Hedera client initialized successfully")
         
+        # Start draining queued HCS submissions
+        hcs_outbox_worker.start()
+        
+        # Start writing sessions and activity behind to Postgres
+        session_store.start()
+        
+        # Initialize Cardano client
+        print("Initializing Cardano client...")
+        await cardano_client.initialize()
+        
     except Exception as e:
         print(f"Error during startup: {e}")
         raise
@@ -52,8 +70,14 @@ async def lifespan(app: FastAPI):
     # Shutdown
     print("Shutting down HarvestLedger backend...")
     try:
+        await hcs_outbox_worker.stop()
+        await session_store.stop()
         await hedera_client.close()
+        await cardano_client.close()
+        signature_verifier.close()
+        password_hasher.close()
         await redis_client.disconnect()
+        await async_engine.dispose()
     except Exception as e:
         print(f"Error during shutdown: {e}")
 
@@ -77,18 +101,21 @@ async def lifespan(app: FastAPI):
 
 # Create GraphQL router with custom context
 async def get_graphql_context(request: Request, response: Response):
-    db = next(get_db())
+    # One lazily checked-out session per request, committed by the
+    # UnitOfWork extension; releasing it here only matters if the
+    # operation never ran (e.g. an unparseable request body)
+    db = begin_request()
     try:
-        from app.graphql.schema import get_context
-        return get_context(request=request, db=db)
+        yield await get_context(request=request, db=db)
     finally:
-        db.close()
+        await db.finish(failed=True)
 
 graphql_app = GraphQLRouter(schema, context_getter=get_graphql_context)
 
 # Include routes
 app.include_router(health.router, prefix="", tags=["health"])
 app.include_router(auth.router, prefix="/auth", tags=["auth"])
+app.include_router(harvests.router, prefix="/harvests", tags=["harvests"])
 # app.include_router(email.router, prefix="/api/email", tags=["email"])  # Temporarily disabled
 app.include_router(graphql_app, prefix="/graphql")
 
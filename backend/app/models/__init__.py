@@ -1,9 +1,10 @@
 # Database models
 from .user import User, UserRole
-from .user_wallet import UserWallet, UserSession, UserBehaviorPattern, WalletLinkingRequest
+from .user_wallet import UserWallet, UserSession, DeviceFingerprintBand, UserBehaviorPattern, WalletLinkingRequest
 from .harvest import Harvest
 from .loan import Loan
 from .transaction import Transaction
+from .hcs_outbox import HcsOutbox, OutboxStatus
 from .cardano import (
     CardanoWallet,
     CardanoToken,
@@ -14,8 +15,8 @@
 
 __all__ = [
     "User", "UserRole",
-    "UserWallet", "UserSession", "UserBehaviorPattern", "WalletLinkingRequest",
-    "Harvest", "Loan", "Transaction",
+    "UserWallet", "UserSession", "DeviceFingerprintBand", "UserBehaviorPattern", "WalletLinkingRequest",
+    "Harvest", "Loan", "Transaction", "HcsOutbox", "OutboxStatus",
     "CardanoWallet", "CardanoToken", "CardanoTransaction",
     "CardanoTokenTransfer", "CardanoSupplyChainEvent"
 ]
\ No newline at end of file
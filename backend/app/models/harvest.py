@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Float, DateTime, Enum, Text, ForeignKey, JSON
+from sqlalchemy import Column, String, Integer, Float, DateTime, Enum, Text, ForeignKey, JSON, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -66,6 +66,12 @@ class Harvest(Base):
     # Relationships
     farmer = relationship("User", back_populates="harvests")
 
+    # Indexes (keyset pagination on created_at, id)
+    __table_args__ = (
+        Index('idx_harvests_created_id', 'created_at', 'id'),
+        Index('idx_harvests_farmer_created_id', 'farmer_id', 'created_at', 'id'),
+    )
+
     def __repr__(self):
         return f"<Harvest(id={self.id}, crop_type={self.crop_type}, quantity={self.quantity})>"
 
@@ -0,0 +1,43 @@
+from sqlalchemy import Column, String, Integer, DateTime, Text, ForeignKey, JSON, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+import uuid
+import enum
+
+from app.core.database import Base
+
+
+class OutboxStatus(str, enum.Enum):
+    PENDING = "pending"
+    SUBMITTED = "submitted"
+    FAILED = "failed"
+
+
+class HcsOutbox(Base):
+    """HCS events written alongside their harvest and drained by the outbox worker"""
+    __tablename__ = "hcs_outbox"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    harvest_id = Column(UUID(as_uuid=True), ForeignKey("harvests.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    
+    # Event body submitted to the topic
+    payload = Column(JSON, nullable=False)
+    
+    # Delivery state
+    status = Column(String, default=OutboxStatus.PENDING.value, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    last_error = Column(Text, nullable=True)
+    hcs_transaction_id = Column(String, nullable=True)
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    submitted_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Worker polls pending rows oldest first
+    __table_args__ = (
+        Index('idx_hcs_outbox_status_created', 'status', 'created_at'),
+    )
+
+    def __repr__(self):
+        return f"<HcsOutbox(id={self.id}, harvest_id={self.harvest_id}, status={self.status})>"
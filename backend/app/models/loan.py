@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Float, DateTime, Enum, Text, ForeignKey, JSON, Boolean
+from sqlalchemy import Column, String, Integer, Float, DateTime, Enum, Text, ForeignKey, JSON, Boolean, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -65,6 +65,12 @@ class Loan(Base):
     lender = relationship("User", foreign_keys=[lender_id], back_populates="lent_loans")
     collateral_harvest = relationship("Harvest", back_populates="loans")
 
+    # Indexes (keyset pagination on created_at, id)
+    __table_args__ = (
+        Index('idx_loans_created_id', 'created_at', 'id'),
+        Index('idx_loans_borrower_created_id', 'borrower_id', 'created_at', 'id'),
+    )
+
     def __repr__(self):
         return f"<Loan(id={self.id}, amount={self.amount}, status={self.status})>"
 
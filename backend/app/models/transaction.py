@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Float, DateTime, Enum, Text, ForeignKey, JSON
+from sqlalchemy import Column, String, Float, DateTime, Enum, Text, ForeignKey, JSON, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -53,6 +53,12 @@ class Transaction(Base):
     harvest = relationship("Harvest", back_populates="transactions")
     loan = relationship("Loan", back_populates="transactions")
 
+    # Indexes (keyset pagination on created_at, id)
+    __table_args__ = (
+        Index('idx_transactions_created_id', 'created_at', 'id'),
+        Index('idx_transactions_user_created_id', 'user_id', 'created_at', 'id'),
+    )
+
     def __repr__(self):
         return f"<Transaction(id={self.id}, type={self.transaction_type}, status={self.status})>"
 
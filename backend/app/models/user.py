@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, DateTime, Enum, Text
+from sqlalchemy import Column, String, Boolean, DateTime, Enum, Text, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -50,6 +50,11 @@ class User(Base):
     behavior_patterns = relationship("UserBehaviorPattern", back_populates="user", cascade="all, delete-orphan")
     wallet_linking_requests = relationship("WalletLinkingRequest", back_populates="user", cascade="all, delete-orphan")
 
+    # Indexes (keyset pagination on created_at, id)
+    __table_args__ = (
+        Index('idx_users_created_id', 'created_at', 'id'),
+    )
+
     def __repr__(self):
         return f"<User(id={self.id}, email={self.email}, role={self.role})>"
 
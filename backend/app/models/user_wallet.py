@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Text, DECIMAL
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Text, DECIMAL, SmallInteger, BigInteger, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID, JSONB, INET
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -27,6 +27,10 @@ class UserWallet(Base):
     user = relationship("User", back_populates="wallets")
     sessions = relationship("UserSession", back_populates="current_wallet")
 
+    __table_args__ = (
+        UniqueConstraint('wallet_address', 'wallet_type'),
+    )
+
     def __repr__(self):
         return f"<UserWallet(id={self.id}, address={self.wallet_address}, type={self.wallet_type})>"
 
@@ -40,6 +44,7 @@ class UserSession(Base):
     session_token = Column(String(255), unique=True, nullable=False)
     current_wallet_id = Column(UUID(as_uuid=True), ForeignKey("user_wallets.id", ondelete="SET NULL"), nullable=True)
     device_fingerprint = Column(Text, nullable=True)
+    device_features = Column(JSONB, nullable=True)  # per-component feature hashes (fuzzy matching)
     ip_address = Column(INET, nullable=True)
     user_agent = Column(Text, nullable=True)
     browser_signature = Column(Text, nullable=True)
@@ -58,6 +63,25 @@ def __repr__(self):
         return f"<UserSession(id={self.id}, user_id={self.user_id}, expires_at={self.expires_at})>"
 
 
+class DeviceFingerprintBand(Base):
+    """MinHash LSH band buckets of a session's device features"""
+    __tablename__ = "device_fingerprint_bands"
+
+    session_id = Column(UUID(as_uuid=True), ForeignKey("user_sessions.id", ondelete="CASCADE"), primary_key=True)
+    band = Column(SmallInteger, primary_key=True)
+    bucket = Column(BigInteger, nullable=False)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+    # Candidate lookup is an index probe per band
+    __table_args__ = (
+        Index('idx_device_fingerprint_bands_bucket', 'band', 'bucket'),
+    )
+
+    def __repr__(self):
+        return f"<DeviceFingerprintBand(session_id={self.session_id}, band={self.band}, bucket={self.bucket})>"
+
+
 class UserBehaviorPattern(Base):
     """Model for storing user behavior patterns for identification"""
     __tablename__ = "user_behavior_patterns"
@@ -73,6 +97,11 @@ class UserBehaviorPattern(Base):
     # Relationships
     user = relationship("User", back_populates="behavior_patterns")
 
+    # One row per user and pattern type (upserted incrementally)
+    __table_args__ = (
+        Index('idx_user_behavior_user_type', 'user_id', 'pattern_type', unique=True),
+    )
+
     def __repr__(self):
         return f"<UserBehaviorPattern(id={self.id}, type={self.pattern_type}, confidence={self.confidence_score})>"
 
@@ -0,0 +1,129 @@
+"""
+Per-user session activity patterns.
+
+Each user has one `user_behavior_patterns` row of type "session_activity":
+a 24-bin UTC hour-of-day histogram of session starts and streaming
+(Welford) session duration statistics. The session store folds each
+closed session into it incrementally, so nothing is recomputed from raw
+sessions.
+
+Identification scores every candidate user at once: the histograms form
+an (n, 24) matrix that is compared with a smoothed profile of the current
+hour by a single cosine-similarity product, weighted by how many sessions
+back each pattern.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.models.user_wallet import UserBehaviorPattern
+
+PATTERN_TYPE = "session_activity"
+HOURS = 24
+# Sessions needed before a pattern is fully trusted
+CONFIDENT_SESSION_COUNT = 20
+# Spread (in hours) of the current-hour query profile
+HOUR_SPREAD = 1.5
+
+_HOUR_INDEX = np.arange(HOURS)
+
+
+def empty_pattern() -> Dict[str, Any]:
+    return {"hours": [0] * HOURS, "duration_count": 0, "duration_mean": 0.0, "duration_m2": 0.0}
+
+
+def merge_session(pattern: Dict[str, Any], started_at: datetime, duration_seconds: float) -> Dict[str, Any]:
+    """Fold one closed session into a pattern (returns a new dict)"""
+    hours = list(pattern["hours"])
+    hours[started_at.hour] += 1
+
+    count = pattern["duration_count"] + 1
+    delta = duration_seconds - pattern["duration_mean"]
+    mean = pattern["duration_mean"] + delta / count
+    m2 = pattern["duration_m2"] + delta * (duration_seconds - mean)
+    return {"hours": hours, "duration_count": count, "duration_mean": mean, "duration_m2": m2}
+
+
+def confidence(pattern: Dict[str, Any]) -> float:
+    return min(1.0, pattern["duration_count"] / CONFIDENT_SESSION_COUNT)
+
+
+def hour_profile(hour: int) -> np.ndarray:
+    """Circular Gaussian around `hour`, so 23:00 and 00:00 count as close"""
+    distance = np.minimum(np.abs(_HOUR_INDEX - hour), HOURS - np.abs(_HOUR_INDEX - hour))
+    return np.exp(-0.5 * (distance / HOUR_SPREAD) ** 2)
+
+
+def cosine_rows(matrix: np.ndarray, vector: np.ndarray) -> np.ndarray:
+    """Cosine similarity of each row of `matrix` with `vector` (0 for empty rows)"""
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(vector)
+    return np.divide(matrix @ vector, norms, out=np.zeros(len(matrix)), where=norms > 0)
+
+
+def score_candidates(patterns: List[Dict[str, Any]], hour: int) -> np.ndarray:
+    """Score each candidate's pattern against activity at `hour`"""
+    if not patterns:
+        return np.zeros(0)
+    histograms = np.array([p["hours"] for p in patterns], dtype=float)
+    weights = np.array([confidence(p) for p in patterns])
+    return cosine_rows(histograms, hour_profile(hour)) * weights
+
+
+def similarity(pattern1: Dict[str, Any], pattern2: Dict[str, Any]) -> float:
+    """Pairwise similarity: hour-histogram cosine and mean-duration closeness"""
+    hour_similarity = float(cosine_rows(
+        np.array([pattern1["hours"]], dtype=float), np.array(pattern2["hours"], dtype=float)
+    )[0])
+    # Normalize to 0-1 scale (a 1 hour difference in mean duration scores 0)
+    duration_diff = abs(pattern1["duration_mean"] - pattern2["duration_mean"])
+    duration_similarity = max(0.0, 1 - duration_diff / 3600)
+    return duration_similarity * 0.6 + hour_similarity * 0.4
+
+
+async def record_sessions(db, sessions: Iterable[Tuple[Any, datetime, float]]) -> int:
+    """
+    Fold closed sessions (user_id, started_at, duration_seconds) into their
+    users' patterns with one locked read and one multi-row upsert
+    """
+    by_user: Dict[Any, List[Tuple[datetime, float]]] = {}
+    for user_id, started_at, duration in sessions:
+        by_user.setdefault(user_id, []).append((started_at, duration))
+    if not by_user:
+        return 0
+
+    existing = (await db.execute(
+        select(UserBehaviorPattern.user_id, UserBehaviorPattern.pattern_data)
+        .where(
+            UserBehaviorPattern.user_id.in_(list(by_user)),
+            UserBehaviorPattern.pattern_type == PATTERN_TYPE
+        )
+        .with_for_update()
+    )).all()
+    patterns = {user_id: data for user_id, data in existing}
+
+    rows = []
+    for user_id, closed in by_user.items():
+        pattern = patterns.get(user_id) or empty_pattern()
+        for started_at, duration in closed:
+            pattern = merge_session(pattern, started_at, duration)
+        rows.append({
+            "user_id": user_id,
+            "pattern_type": PATTERN_TYPE,
+            "pattern_data": pattern,
+            "confidence_score": round(confidence(pattern), 2),
+        })
+
+    statement = pg_insert(UserBehaviorPattern)
+    await db.execute(statement.on_conflict_do_update(
+        index_elements=["user_id", "pattern_type"],
+        set_={
+            "pattern_data": statement.excluded.pattern_data,
+            "confidence_score": statement.excluded.confidence_score,
+            "updated_at": func.now(),
+        }
+    ), rows)
+    return len(rows)
@@ -0,0 +1,145 @@
+"""
+MinHash LSH index for fuzzy device fingerprint matching.
+
+A device is described by a set of feature hashes (user agent tokens with
+versions cut to the major number, screen resolution, timezone, language
+and its primary subtag, IPv4 /24 and /16 or IPv6 /48 and /32 prefixes).
+Its MinHash signature of NUM_PERMUTATIONS values is split into BANDS bands
+of ROWS values; each band is hashed to a bucket stored in
+`device_fingerprint_bands`. Two devices with Jaccard similarity s share at
+least one bucket with probability 1 - (1 - s^ROWS)^BANDS (about 0.98 at
+s = 0.8 and 0.06 at s = 0.3), so finding candidates is BANDS index probes.
+Candidates are then confirmed with the exact Jaccard similarity of their
+stored features.
+"""
+
+import hashlib
+import ipaddress
+import random
+import re
+import struct
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select, tuple_
+
+from app.models.user_wallet import UserSession, DeviceFingerprintBand
+
+NUM_PERMUTATIONS = 32
+BANDS = 8
+ROWS = NUM_PERMUTATIONS // BANDS
+MAX_CANDIDATES = 50
+
+_PRIME = (1 << 61) - 1
+# Fixed seed: every process must derive the same permutations
+_rng = random.Random(0x48415256)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERMUTATIONS)]
+
+_UA_TOKEN_SEPARATORS = re.compile(r"[\s;(),]+")
+_MINOR_VERSION = re.compile(r"(\d+)(?:[._]\d+)+")
+
+
+def _hash63(text: str) -> int:
+    # 63 bits so values round-trip through JSONB and BIGINT unchanged
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "big") >> 1
+
+
+def _ip_prefixes(ip: str) -> List[str]:
+    try:
+        address = ipaddress.ip_address(ip)
+    except ValueError:
+        return []
+    prefixes = (24, 16) if address.version == 4 else (48, 32)
+    return [f"ip:{ipaddress.ip_network(f'{ip}/{p}', strict=False)}" for p in prefixes]
+
+
+def extract_features(device_info: Dict[str, Any]) -> List[int]:
+    """Sorted feature hashes for a device_info dict (empty if nothing usable)"""
+    features = set()
+
+    user_agent = device_info.get("user_agent") or ""
+    for token in _UA_TOKEN_SEPARATORS.split(user_agent):
+        if token:
+            features.add("ua:" + _MINOR_VERSION.sub(r"\1", token))
+
+    if device_info.get("screen_resolution"):
+        features.add(f"res:{device_info['screen_resolution']}")
+    if device_info.get("timezone"):
+        features.add(f"tz:{device_info['timezone']}")
+    language = (device_info.get("language") or "").lower()
+    if language:
+        features.add(f"lang:{language}")
+        features.add(f"lang:{language.split('-')[0]}")
+    if device_info.get("ip_address"):
+        features.update(_ip_prefixes(device_info["ip_address"]))
+
+    return sorted(_hash63(feature) for feature in features)
+
+
+def jaccard(features1: Iterable[int], features2: Iterable[int]) -> float:
+    a, b = set(features1), set(features2)
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def minhash(features: List[int]) -> List[int]:
+    return [min((a * f + b) % _PRIME for f in features) for a, b in _PERMUTATIONS]
+
+
+def band_buckets(features: List[int]) -> List[Tuple[int, int]]:
+    """(band, bucket) pairs; bucket is a signed 64-bit hash of the band's rows"""
+    if not features:
+        return []
+    signature = minhash(features)
+    buckets = []
+    for band in range(BANDS):
+        rows = struct.pack(f">{ROWS}Q", *signature[band * ROWS:(band + 1) * ROWS])
+        digest = hashlib.blake2b(rows, digest_size=8, person=b"lsh-band").digest()
+        buckets.append((band, int.from_bytes(digest, "big", signed=True)))
+    return buckets
+
+
+def band_rows(session: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """device_fingerprint_bands rows for a UserSession column dict"""
+    return [
+        {
+            "session_id": session["id"],
+            "band": band,
+            "bucket": bucket,
+            "user_id": session["user_id"],
+            "expires_at": session["expires_at"],
+        }
+        for band, bucket in band_buckets(session.get("device_features") or [])
+    ]
+
+
+async def find_similar_user(db, features: List[int], min_similarity: float) -> Optional[Any]:
+    """User id of the most similar live session at or above min_similarity"""
+    buckets = band_buckets(features)
+    if not buckets:
+        return None
+
+    candidates = (
+        select(DeviceFingerprintBand.session_id)
+        .where(
+            tuple_(DeviceFingerprintBand.band, DeviceFingerprintBand.bucket).in_(buckets),
+            DeviceFingerprintBand.expires_at > datetime.utcnow()
+        )
+        .distinct()
+        .limit(MAX_CANDIDATES)
+    )
+    sessions = (await db.execute(
+        select(UserSession.user_id, UserSession.device_features, UserSession.last_active_at)
+        .where(UserSession.id.in_(candidates))
+    )).all()
+
+    best = None
+    for user_id, session_features, last_active_at in sessions:
+        similarity = jaccard(features, session_features or [])
+        if similarity < min_similarity:
+            continue
+        key = (similarity, last_active_at.timestamp() if last_active_at else 0.0)
+        if best is None or key > best[0]:
+            best = (key, user_id)
+    return best[1] if best else None
@@ -0,0 +1,308 @@
+"""
+Bulk harvest import.
+
+Rows are validated one at a time as they arrive and inserted in chunks with
+a single multi-row INSERT per table, so a season log of 100k records costs
+a few hundred round-trips instead of three commits per record. Each
+harvest gets an `hcs_outbox` row in the same chunk transaction; anchoring
+to HCS happens asynchronously through the outbox worker.
+
+With a standalone session every chunk is committed on its own. Inside a
+GraphQL request's shared session each chunk is a savepoint instead, so a
+rejected chunk is undone without touching the request's other work, and
+the request's unit of work commits everything at the end.
+
+Invalid rows are reported individually and never abort the import. A
+chunk the database rejects is retried one row per savepoint, so only the
+offending rows are reported.
+"""
+
+import csv
+import json
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import RequestSession
+from app.models.harvest import Harvest as HarvestModel, CropType
+from app.models.hcs_outbox import HcsOutbox
+from app.services.hcs_outbox import hcs_outbox_worker
+
+# Per-row errors returned to the caller; the failed count keeps going
+MAX_REPORTED_ERRORS = 1000
+
+TRUE_VALUES = {"true", "1", "yes", "y"}
+FALSE_VALUES = {"false", "0", "no", "n", ""}
+
+
+@dataclass
+class RowError:
+    row: int
+    message: str
+
+
+@dataclass
+class ImportResult:
+    inserted: int = 0
+    failed: int = 0
+    errors: List[RowError] = field(default_factory=list)
+
+    def add_error(self, row: int, message: str) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(RowError(row=row, message=message))
+
+
+def _optional_str(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _optional_float(data: Dict[str, Any], name: str) -> Optional[float]:
+    value = data.get(name)
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be a number")
+
+
+def _optional_datetime(data: Dict[str, Any], name: str) -> Optional[datetime]:
+    value = data.get(name)
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        raise ValueError(f"{name} must be an ISO 8601 date")
+
+
+def _bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    text = str(value or "").strip().lower()
+    if text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES:
+        return False
+    raise ValueError("organic_certified must be true or false")
+
+
+def parse_harvest_row(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate one import row and return Harvest column values; raises ValueError"""
+    for name, value in data.items():
+        # Postgres text columns cannot store NUL
+        if isinstance(value, str) and "\x00" in value:
+            raise ValueError(f"{name} must not contain NUL characters")
+
+    crop_type = _optional_str(data.get("crop_type"))
+    if not crop_type:
+        raise ValueError("crop_type is required")
+    try:
+        crop_type = CropType(crop_type.lower())
+    except ValueError:
+        raise ValueError(f"Unknown crop_type '{crop_type}'")
+
+    quantity = _optional_float(data, "quantity")
+    if quantity is None or quantity <= 0:
+        raise ValueError("quantity must be a positive number")
+
+    farm_location = _optional_str(data.get("farm_location"))
+    if not farm_location:
+        raise ValueError("farm_location is required")
+
+    moisture_content = _optional_float(data, "moisture_content")
+    if moisture_content is not None and not 0 <= moisture_content <= 100:
+        raise ValueError("moisture_content must be between 0 and 100")
+
+    return {
+        "crop_type": crop_type,
+        "variety": _optional_str(data.get("variety")),
+        "quantity": quantity,
+        "unit": _optional_str(data.get("unit")) or "tons",
+        "farm_location": farm_location,
+        "planting_date": _optional_datetime(data, "planting_date"),
+        "harvest_date": _optional_datetime(data, "harvest_date"),
+        "quality_grade": _optional_str(data.get("quality_grade")),
+        "moisture_content": moisture_content,
+        "organic_certified": _bool(data.get("organic_certified")),
+        "notes": _optional_str(data.get("notes")),
+    }
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a byte stream into decoded lines without buffering the whole body"""
+    pending = b""
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8-sig").rstrip("\r")
+    if pending:
+        yield pending.decode("utf-8-sig").rstrip("\r")
+
+
+async def iter_csv_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple]:
+    """Yield (row_number, dict) from a CSV stream with a header line"""
+    header: Optional[List[str]] = None
+    record = ""
+    row_number = 0
+    async for line in iter_lines(chunks):
+        record = f"{record}\n{line}" if record else line
+        # An odd quote count means a quoted field continues on the next line
+        if record.count('"') % 2:
+            continue
+        text, record = record, ""
+        if not text.strip():
+            continue
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip().lower() for name in values]
+            continue
+        row_number += 1
+        if len(values) != len(header):
+            yield row_number, ValueError(f"Expected {len(header)} columns, got {len(values)}")
+            continue
+        yield row_number, dict(zip(header, values))
+    if record:
+        yield row_number + 1, ValueError("Unterminated quoted field")
+
+
+async def iter_ndjson_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple]:
+    """Yield (row_number, dict) from a newline-delimited JSON stream"""
+    row_number = 0
+    async for line in iter_lines(chunks):
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield row_number, ValueError(f"Invalid JSON: {e.msg}")
+            continue
+        if not isinstance(data, dict):
+            yield row_number, ValueError("Each line must be a JSON object")
+            continue
+        yield row_number, data
+
+
+class HarvestImporter:
+    """Validates rows and inserts them in chunks for one farmer"""
+
+    def __init__(self, db: AsyncSession, farmer_id, chunk_size: int = 1000):
+        self.db = db
+        self.farmer_id = farmer_id
+        self.chunk_size = chunk_size
+        # The request's unit of work commits; chunks only need savepoints
+        self.shared_session = isinstance(db, RequestSession)
+        self.result = ImportResult()
+        self._rows: List[int] = []
+        self._harvests: List[Dict[str, Any]] = []
+
+    async def add(self, row_number: int, data: Any) -> None:
+        """Validate one row (or a parse error) and buffer it for insertion"""
+        if isinstance(data, Exception):
+            self.result.add_error(row_number, str(data))
+            return
+        try:
+            values = parse_harvest_row(data)
+        except ValueError as e:
+            self.result.add_error(row_number, str(e))
+            return
+
+        values["id"] = uuid.uuid4()
+        values["farmer_id"] = self.farmer_id
+        self._rows.append(row_number)
+        self._harvests.append(values)
+        if len(self._harvests) >= self.chunk_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Insert buffered harvests and their outbox rows in one transaction (or savepoint)"""
+        if not self._harvests:
+            return
+        rows, harvests = self._rows, self._harvests
+        self._rows, self._harvests = [], []
+
+        timestamp = datetime.utcnow().isoformat()
+        outbox = [
+            {
+                "id": uuid.uuid4(),
+                "harvest_id": harvest["id"],
+                "user_id": self.farmer_id,
+                "payload": {
+                    "type": "harvest_record",
+                    "harvest_id": str(harvest["id"]),
+                    "farmer_id": str(self.farmer_id),
+                    "crop_type": harvest["crop_type"].value,
+                    "quantity": harvest["quantity"],
+                    "farm_location": harvest["farm_location"],
+                    "timestamp": timestamp,
+                },
+            }
+            for harvest in harvests
+        ]
+
+        try:
+            if self.shared_session:
+                async with self.db.begin_nested():
+                    await self._insert(harvests, outbox)
+            else:
+                await self._insert(harvests, outbox)
+                await self.db.commit()
+            inserted = len(harvests)
+        except Exception as e:
+            if not self.shared_session:
+                await self.db.rollback()
+            print(f"❌ Harvest import chunk failed, retrying row by row: {e}")
+            inserted = await self._insert_each(rows, harvests, outbox)
+
+        self.result.inserted += inserted
+        if not inserted:
+            return
+        if self.shared_session:
+            self.db.after_commit(hcs_outbox_worker.notify)
+        else:
+            hcs_outbox_worker.notify()
+
+    async def _insert(self, harvests: List[Dict[str, Any]], outbox: List[Dict[str, Any]]) -> None:
+        await self.db.execute(insert(HarvestModel), harvests)
+        await self.db.execute(insert(HcsOutbox), outbox)
+
+    async def _insert_each(self, rows: List[int], harvests: List[Dict[str, Any]], outbox: List[Dict[str, Any]]) -> int:
+        """Insert a rejected chunk one savepoint per row, reporting the rows that fail"""
+        inserted = []
+        for row_number, harvest, message in zip(rows, harvests, outbox):
+            try:
+                async with self.db.begin_nested():
+                    await self._insert([harvest], [message])
+            except Exception as e:
+                print(f"❌ Harvest import row {row_number} rejected: {e}")
+                self.result.add_error(row_number, "Database rejected this row")
+                continue
+            inserted.append(row_number)
+        if not self.shared_session:
+            try:
+                await self.db.commit()
+            except Exception as e:
+                await self.db.rollback()
+                print(f"❌ Harvest import chunk failed: {e}")
+                for row_number in inserted:
+                    self.result.add_error(row_number, "Database rejected the chunk containing this row")
+                return 0
+        return len(inserted)
+
+    async def import_rows(self, rows: AsyncIterator[tuple]) -> ImportResult:
+        async for row_number, data in rows:
+            await self.add(row_number, data)
+        await self.flush()
+        return self.result
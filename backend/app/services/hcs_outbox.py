@@ -0,0 +1,205 @@
+"""
+HCS outbox worker.
+
+record_harvest writes each harvest together with an `hcs_outbox` row and
+returns immediately. This worker drains pending rows to the HCS topic,
+packing as many harvest events into one topic message as the size limit
+allows, then backfills `Harvest.hcs_transaction_id` and the matching
+`Transaction` rows in the same database transaction.
+
+Rows are claimed with FOR UPDATE SKIP LOCKED, so several workers can drain
+the outbox concurrently. Delivery is at-least-once: if the commit fails
+after a successful submission the events are resubmitted.
+"""
+
+import asyncio
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.hedera import hedera_client
+from app.models.harvest import Harvest as HarvestModel
+from app.models.hcs_outbox import HcsOutbox, OutboxStatus
+from app.models.transaction import Transaction as TransactionModel, TransactionType
+
+BATCH_MESSAGE_TYPE = "harvest_record_batch"
+
+
+def _encoded_size(message: Any) -> int:
+    return len(json.dumps(message).encode("utf-8"))
+
+
+def pack_events(events: List[Dict[str, Any]], max_bytes: int) -> List[List[int]]:
+    """
+    Group event indexes into topic messages that fit within `max_bytes`.
+
+    Events keep their order. An event too large to share a message is sent
+    on its own and left to the SDK's message chunking.
+    """
+    envelope_size = _encoded_size({"type": BATCH_MESSAGE_TYPE, "events": []})
+    groups: List[List[int]] = []
+    current: List[int] = []
+    current_size = envelope_size
+
+    for index, event in enumerate(events):
+        size = _encoded_size(event)
+        # Each additional event costs its body plus a ", " separator
+        added = size if not current else size + 2
+        if current and current_size + added > max_bytes:
+            groups.append(current)
+            current, current_size = [], envelope_size
+            added = size
+        current.append(index)
+        current_size += added
+
+    if current:
+        groups.append(current)
+    return groups
+
+
+def build_message(events: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Single events keep their original shape; several share a batch envelope"""
+    if len(events) == 1:
+        return events[0]
+    return {"type": BATCH_MESSAGE_TYPE, "events": events}
+
+
+class HcsOutboxWorker:
+    """Background task draining the HCS outbox"""
+
+    def __init__(
+        self,
+        batch_size: int = 200,
+        poll_interval: float = 1.0,
+        max_attempts: int = 5,
+        max_message_bytes: int = 1024
+    ):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.max_message_bytes = max_message_bytes
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def start(self) -> None:
+        """Start draining; pending rows stay queued while Hedera is unconfigured"""
+        if not hedera_client.is_configured:
+            print("⚠️  HCS outbox worker not started: Hedera credentials not configured")
+            return
+        if self._task:
+            return
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        print("✅ HCS outbox worker started")
+
+    async def stop(self) -> None:
+        if not self._task:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def notify(self) -> None:
+        """Wake the worker after new rows are committed"""
+        if self._wakeup:
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                submitted = await self.drain_once()
+            except Exception as e:
+                print(f"❌ HCS outbox drain failed: {e}")
+                submitted = 0
+
+            # Keep draining while a full batch went through
+            if submitted >= self.batch_size:
+                continue
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def drain_once(self) -> int:
+        """Submit one batch of pending rows; returns the number submitted"""
+        db = AsyncSessionLocal()
+        try:
+            rows = (await db.scalars(
+                select(HcsOutbox)
+                .where(HcsOutbox.status == OutboxStatus.PENDING.value)
+                .order_by(HcsOutbox.created_at)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )).all()
+            if not rows:
+                return 0
+
+            groups = pack_events([row.payload for row in rows], self.max_message_bytes)
+            print(f"📦 Submitting {len(rows)} outbox events in {len(groups)} HCS messages")
+
+            tx_ids = await asyncio.gather(*[
+                hedera_client.submit_message(build_message([rows[i].payload for i in group]))
+                for group in groups
+            ])
+
+            harvests = {
+                harvest.id: harvest
+                for harvest in (await db.scalars(
+                    select(HarvestModel).where(HarvestModel.id.in_([row.harvest_id for row in rows]))
+                )).all()
+            }
+
+            now = datetime.now(timezone.utc)
+            submitted = 0
+            for group, tx_id in zip(groups, tx_ids):
+                for i in group:
+                    row = rows[i]
+                    if not tx_id:
+                        row.attempts += 1
+                        row.last_error = "HCS submission failed"
+                        if row.attempts >= self.max_attempts:
+                            row.status = OutboxStatus.FAILED.value
+                        continue
+
+                    row.status = OutboxStatus.SUBMITTED.value
+                    row.hcs_transaction_id = tx_id
+                    row.submitted_at = now
+                    submitted += 1
+
+                    harvest = harvests.get(row.harvest_id)
+                    if harvest is None:
+                        continue
+                    harvest.hcs_transaction_id = tx_id
+                    db.add(TransactionModel(
+                        user_id=row.user_id,
+                        transaction_type=TransactionType.HARVEST_RECORD,
+                        description=f"Recorded harvest of {harvest.quantity} {harvest.unit} {harvest.crop_type}",
+                        hedera_transaction_id=tx_id,
+                        topic_id=hedera_client.topic_id,
+                        harvest_id=harvest.id,
+                        status="confirmed",
+                        confirmed_at=now
+                    ))
+
+            await db.commit()
+            return submitted
+        finally:
+            await db.close()
+
+
+# Global outbox worker instance
+hcs_outbox_worker = HcsOutboxWorker(
+    batch_size=settings.HCS_OUTBOX_BATCH_SIZE,
+    poll_interval=settings.HCS_OUTBOX_POLL_INTERVAL_SECONDS,
+    max_attempts=settings.HCS_OUTBOX_MAX_ATTEMPTS,
+    max_message_bytes=settings.HCS_MAX_MESSAGE_BYTES
+)
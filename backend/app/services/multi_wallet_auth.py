@@ -1,15 +1,21 @@
-import secrets
+import asyncio
 import hashlib
 import json
 from datetime import datetime, timedelta
 from typing import Optional, Dict, List, Tuple
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+import uuid
+from sqlalchemy import and_, or_, select, update, exists, func, literal, true, union_all, column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
-from app.models.user import User
+from app.models.user import User, UserRole
 from app.models.user_wallet import UserWallet, UserSession, UserBehaviorPattern, WalletLinkingRequest
 from app.core.wallet_auth import WalletAuthenticator
 from app.core.auth import create_access_token
+from app.core.user_cache import user_cache
+from app.services.session_store import session_store
+from app.services import device_index, behavior_patterns
+from app.core.config import settings
 
 
 class DeviceFingerprinter:
@@ -37,14 +43,20 @@ def generate_fingerprint(
         return hashlib.sha256(fingerprint_string.encode()).hexdigest()
     
     @staticmethod
-    def calculate_similarity(fingerprint1: str, fingerprint2: str) -> float:
-        """Calculate similarity between two fingerprints (simplified)"""
-        if fingerprint1 == fingerprint2:
-            return 1.0
-        
-        # In a real implementation, you'd compare individual components
-        # For now, we'll use a simple approach
-        return 0.0
+    def extract_features(device_info: Dict) -> List[int]:
+        """Per-component feature hashes used for fuzzy matching"""
+        return device_index.extract_features(device_info)
+    
+    @staticmethod
+    def calculate_similarity(fingerprint1, fingerprint2) -> float:
+        """
+        Similarity between two devices
+        SHA-256 fingerprints match exactly (1.0 or 0.0); feature hash
+        lists are compared by Jaccard similarity.
+        """
+        if isinstance(fingerprint1, str) or isinstance(fingerprint2, str):
+            return 1.0 if fingerprint1 == fingerprint2 else 0.0
+        return device_index.jaccard(fingerprint1, fingerprint2)
 
 
 class BehaviorAnalyzer:
@@ -52,58 +64,26 @@ class BehaviorAnalyzer:
     
     @staticmethod
     def analyze_session_patterns(user_sessions: List[UserSession]) -> Dict:
-        """Analyze user session patterns"""
-        if not user_sessions:
-            return {}
-        
-        # Calculate average session duration
-        durations = []
-        active_hours = []
-        
+        """Build a session activity pattern from raw sessions (stored patterns are updated incrementally)"""
+        pattern = behavior_patterns.empty_pattern()
         for session in user_sessions:
             if session.last_active_at and session.created_at:
                 duration = (session.last_active_at - session.created_at).total_seconds()
-                durations.append(duration)
-                active_hours.append(session.created_at.hour)
-        
-        return {
-            'avg_session_duration': sum(durations) / len(durations) if durations else 0,
-            'common_active_hours': list(set(active_hours)),
-            'session_count': len(user_sessions)
-        }
+                pattern = behavior_patterns.merge_session(pattern, session.created_at, duration)
+        return pattern
     
     @staticmethod
     def calculate_pattern_similarity(pattern1: Dict, pattern2: Dict) -> float:
         """Calculate similarity between behavior patterns"""
         if not pattern1 or not pattern2:
             return 0.0
-        
-        # Simple similarity calculation based on session duration
-        duration_diff = abs(
-            pattern1.get('avg_session_duration', 0) - 
-            pattern2.get('avg_session_duration', 0)
-        )
-        
-        # Normalize to 0-1 scale (assuming max difference of 1 hour = 3600 seconds)
-        duration_similarity = max(0, 1 - (duration_diff / 3600))
-        
-        # Check for common active hours
-        hours1 = set(pattern1.get('common_active_hours', []))
-        hours2 = set(pattern2.get('common_active_hours', []))
-        
-        if hours1 and hours2:
-            hour_similarity = len(hours1.intersection(hours2)) / len(hours1.union(hours2))
-        else:
-            hour_similarity = 0.0
-        
-        # Weighted average
-        return (duration_similarity * 0.6) + (hour_similarity * 0.4)
+        return behavior_patterns.similarity(pattern1, pattern2)
 
 
 class MultiWalletAuthService:
     """Service for managing multi-wallet authentication and user identification"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
         self.fingerprinter = DeviceFingerprinter()
         self.behavior_analyzer = BehaviorAnalyzer()
@@ -130,22 +110,14 @@ async def authenticate_or_identify_user(
         if not is_valid:
             return None, False, None
         
-        # Check if this wallet is already linked to a user
-        existing_wallet = self.db.query(UserWallet).filter(
-            UserWallet.wallet_address == wallet_address
-        ).first()
+        # Returning wallet (or legacy user): resolved and touched in one statement
+        user, _, wallet_id = await self.resolve_wallet_user(
+            hedera_account_id, wallet_address, wallet_type, public_key, create_user=False
+        )
         
-        if existing_wallet:
-            # Update last used timestamp
-            existing_wallet.last_used_at = datetime.utcnow()
-            self.db.commit()
-            
-            # Create session
-            session_token = await self._create_user_session(
-                existing_wallet.user, existing_wallet, device_info
-            )
-            
-            return existing_wallet.user, False, session_token
+        if user:
+            session_token = await self._create_user_session(user, wallet_id, device_info)
+            return user, False, session_token
         
         # Wallet not found - try to identify user by fingerprinting and behavior
         potential_user = await self._identify_user_by_patterns(
@@ -165,46 +137,163 @@ async def authenticate_or_identify_user(
             )
             
             self.db.add(new_wallet)
-            self.db.commit()
+            await self.db.flush()
             
             # Create session
             session_token = await self._create_user_session(
-                potential_user, new_wallet, device_info
+                potential_user, new_wallet.id, device_info
             )
             
             return potential_user, False, session_token
         
-        # No existing user found - create new user
-        new_user = User(
-            hedera_account_id=hedera_account_id,
-            wallet_type=wallet_type,
-            is_active=True,
-            is_verified=False
+        # No existing user found - create the user and primary wallet
+        new_user, is_new_user, wallet_id = await self.resolve_wallet_user(
+            hedera_account_id, wallet_address, wallet_type, public_key
         )
+        if not new_user:
+            return None, False, None
         
-        self.db.add(new_user)
-        self.db.flush()  # Get the user ID
+        # Create session
+        session_token = await self._create_user_session(new_user, wallet_id, device_info)
         
-        # Create primary wallet
-        primary_wallet = UserWallet(
-            user_id=new_user.id,
-            wallet_address=wallet_address,
-            wallet_type=wallet_type,
-            public_key=public_key,
-            is_primary=True,
-            first_used_at=datetime.utcnow(),
-            last_used_at=datetime.utcnow()
+        return new_user, is_new_user, session_token
+    
+    def _resolve_wallet_user_statement(
+        self,
+        hedera_account_id: str,
+        wallet_address: str,
+        wallet_type: str,
+        public_key: Optional[str],
+        create_user: bool
+    ):
+        """
+        Build the single-statement CTE behind resolve_wallet_user:
+        
+        found_wallet  wallet by (wallet_address, wallet_type)
+        touched       UPDATE its last_used_at
+        new_user      INSERT user unless the wallet exists, ON CONFLICT (hedera_account_id) DO NOTHING
+        resolved      wallet owner, new user or existing user with this hedera_account_id
+        new_wallet    INSERT primary wallet for the resolved user unless the wallet exists
+        
+        Rows written by a CTE are invisible to the rest of the statement, so
+        a new user is returned from new_user's RETURNING and an existing one
+        from the users table.
+        """
+        users = User.__table__
+        wallets = UserWallet.__table__
+        
+        found_wallet = (
+            select(wallets.c.id, wallets.c.user_id)
+            .where(wallets.c.wallet_address == wallet_address, wallets.c.wallet_type == wallet_type)
+            .cte("found_wallet")
+        )
+        no_wallet = ~exists(select(found_wallet.c.id))
+        
+        touched = (
+            update(wallets)
+            .where(wallets.c.id.in_(select(found_wallet.c.id)))
+            .values(last_used_at=func.now())
+            .returning(wallets.c.id, wallets.c.user_id)
+            .cte("touched")
         )
         
-        self.db.add(primary_wallet)
-        self.db.commit()
+        new_user = (
+            pg_insert(users)
+            .from_select(
+                ["id", "hedera_account_id", "wallet_type", "role", "is_active",
+                 "is_verified", "email_verified", "registration_complete"],
+                select(
+                    literal(uuid.uuid4(), users.c.id.type),
+                    literal(hedera_account_id, users.c.hedera_account_id.type),
+                    literal(wallet_type, users.c.wallet_type.type),
+                    literal(UserRole.FARMER, users.c.role.type),
+                    true(), literal(False), literal(False), literal(False)
+                ).where(no_wallet, literal(create_user))
+            )
+            .on_conflict_do_nothing(index_elements=[users.c.hedera_account_id])
+            .returning(*users.c)
+            .cte("new_user")
+        )
         
-        # Create session
-        session_token = await self._create_user_session(
-            new_user, primary_wallet, device_info
+        resolved = select(func.coalesce(
+            select(found_wallet.c.user_id).scalar_subquery(),
+            select(new_user.c.id).scalar_subquery(),
+            select(users.c.id).where(users.c.hedera_account_id == hedera_account_id).scalar_subquery()
+        ).label("user_id")).cte("resolved")
+        
+        new_wallet = (
+            pg_insert(wallets)
+            .from_select(
+                ["id", "user_id", "wallet_address", "wallet_type", "public_key",
+                 "is_primary", "first_used_at", "last_used_at"],
+                select(
+                    literal(uuid.uuid4(), wallets.c.id.type),
+                    resolved.c.user_id,
+                    literal(wallet_address, wallets.c.wallet_address.type),
+                    literal(wallet_type, wallets.c.wallet_type.type),
+                    literal(public_key, wallets.c.public_key.type),
+                    true(), func.now(), func.now()
+                ).where(no_wallet, resolved.c.user_id.isnot(None))
+            )
+            .on_conflict_do_update(
+                index_elements=[wallets.c.wallet_address, wallets.c.wallet_type],
+                set_={"last_used_at": func.now()}
+            )
+            .returning(wallets.c.id, wallets.c.user_id)
+            .cte("new_wallet")
         )
         
-        return new_user, True, session_token
+        wallet = union_all(
+            select(touched.c.id, touched.c.user_id),
+            select(new_wallet.c.id, new_wallet.c.user_id)
+        ).subquery("wallet")
+        
+        created = select(
+            *[new_user.c[c.name] for c in users.c],
+            literal(True).label("is_new_user"),
+            new_wallet.c.id.label("resolved_wallet_id")
+        ).join_from(new_user, new_wallet, new_wallet.c.user_id == new_user.c.id)
+        
+        existing = select(
+            *users.c,
+            literal(False).label("is_new_user"),
+            wallet.c.id.label("resolved_wallet_id")
+        ).join_from(users, wallet, wallet.c.user_id == users.c.id).where(~exists(select(new_user.c.id)))
+        
+        return union_all(created, existing)
+    
+    async def resolve_wallet_user(
+        self,
+        hedera_account_id: str,
+        wallet_address: str,
+        wallet_type: str,
+        public_key: Optional[str] = None,
+        create_user: bool = True
+    ) -> Tuple[Optional[User], bool, Optional[uuid.UUID]]:
+        """
+        Resolve (or create) the user and wallet for a login in one statement
+        
+        Touches last_used_at of a known wallet; with create_user, creates the
+        user and its primary wallet. Returns (user, is_new_user, wallet_id).
+        """
+        # A concurrent first login can commit the user after this statement's
+        # snapshot; the second attempt (a new READ COMMITTED snapshot in the
+        # same transaction) sees it. Committing is left to the caller.
+        for _ in range(2):
+            statement = self._resolve_wallet_user_statement(
+                hedera_account_id, wallet_address, wallet_type, public_key, create_user
+            )
+            row = (await self.db.execute(
+                select(User, column("is_new_user"), column("resolved_wallet_id")).from_statement(statement)
+            )).first()
+            
+            if row:
+                user, is_new_user, wallet_id = row
+                return user, is_new_user, wallet_id
+            if not create_user:
+                break
+        
+        return None, False, None
     
     async def _identify_user_by_patterns(
         self,
@@ -226,15 +315,25 @@ async def _identify_user_by_patterns(
         )
         
         # Find users with similar device fingerprints
-        similar_sessions = self.db.query(UserSession).filter(
+        similar_sessions = (await self.db.scalars(select(UserSession).where(
             UserSession.device_fingerprint == device_fingerprint,
             UserSession.expires_at > datetime.utcnow()
-        ).all()
+        ))).all()
         
         if similar_sessions:
             # Return the user from the most recent similar session
             latest_session = max(similar_sessions, key=lambda s: s.last_active_at)
-            return latest_session.user
+            return await self.db.get(User, latest_session.user_id)
+        
+        # No exact match: look up near-identical devices in the LSH index
+        if settings.DEVICE_FUZZY_MATCH:
+            user_id = await device_index.find_similar_user(
+                self.db,
+                self.fingerprinter.extract_features(device_info),
+                settings.DEVICE_MATCH_MIN_SIMILARITY
+            )
+            if user_id:
+                return await self.db.get(User, user_id)
         
         # If no exact fingerprint match, try behavior pattern matching
         return await self._identify_by_behavior_patterns(device_info)
@@ -243,26 +342,41 @@ async def _identify_by_behavior_patterns(
         self,
         device_info: Dict
     ) -> Optional[User]:
-        """Identify user by behavior patterns (simplified implementation)"""
-        
-        # This is a simplified implementation
-        # In production, you'd analyze more sophisticated patterns
+        """Identify user by behavior patterns of users seen with the same timezone and language"""
         
-        # For now, we'll just check for users with similar timezone and language
         timezone = device_info.get('timezone', '')
         language = device_info.get('language', '')
         
         if not timezone or not language:
             return None
         
-        # Find recent sessions with similar characteristics
-        recent_sessions = self.db.query(UserSession).filter(
-            and_(
-                UserSession.timezone == timezone,
-                UserSession.language == language,
-                UserSession.created_at > datetime.utcnow() - timedelta(days=30)
+        recent = and_(
+            UserSession.timezone == timezone,
+            UserSession.language == language,
+            UserSession.created_at > datetime.utcnow() - timedelta(days=30)
+        )
+        candidate_ids = select(UserSession.user_id).where(recent).distinct().limit(
+            settings.BEHAVIOR_MAX_CANDIDATES
+        )
+        patterns = (await self.db.execute(
+            select(UserBehaviorPattern.user_id, UserBehaviorPattern.pattern_data).where(
+                UserBehaviorPattern.user_id.in_(candidate_ids),
+                UserBehaviorPattern.pattern_type == behavior_patterns.PATTERN_TYPE
             )
-        ).limit(10).all()
+        )).all()
+        
+        if patterns:
+            # Score every candidate against the current hour in one batch
+            scores = behavior_patterns.score_candidates(
+                [pattern for _, pattern in patterns], datetime.utcnow().hour
+            )
+            best = int(scores.argmax())
+            if scores[best] >= settings.BEHAVIOR_MATCH_MIN_SCORE:
+                return await self.db.get(User, patterns[best][0])
+            return None
+        
+        # No aggregated patterns yet: fall back to the most active recent user
+        recent_sessions = (await self.db.scalars(select(UserSession).where(recent).limit(10))).all()
         
         if recent_sessions:
             # Return the most active user (most sessions)
@@ -272,19 +386,17 @@ async def _identify_by_behavior_patterns(
                 user_session_counts[user_id] = user_session_counts.get(user_id, 0) + 1
             
             most_active_user_id = max(user_session_counts, key=user_session_counts.get)
-            return self.db.query(User).filter(User.id == most_active_user_id).first()
+            return await self.db.get(User, most_active_user_id)
         
         return None
     
     async def _create_user_session(
         self,
         user: User,
-        wallet: UserWallet,
+        wallet_id: Optional[uuid.UUID],
         device_info: Optional[Dict]
     ) -> str:
-        """Create a new user session"""
-        
-        session_token = secrets.token_urlsafe(32)
+        """Create a new user session (written to Postgres by the session flusher)"""
         
         device_fingerprint = None
         if device_info:
@@ -296,25 +408,18 @@ async def _create_user_session(
                 device_info.get('ip_address', '')
             )
         
-        session = UserSession(
+        return await session_store.create(self.db, dict(
             user_id=user.id,
-            session_token=session_token,
-            current_wallet_id=wallet.id,
+            current_wallet_id=wallet_id,
             device_fingerprint=device_fingerprint,
+            device_features=self.fingerprinter.extract_features(device_info) if device_info else None,
             ip_address=device_info.get('ip_address') if device_info else None,
             user_agent=device_info.get('user_agent') if device_info else None,
             browser_signature=device_info.get('browser_signature') if device_info else None,
             screen_resolution=device_info.get('screen_resolution') if device_info else None,
             timezone=device_info.get('timezone') if device_info else None,
             language=device_info.get('language') if device_info else None,
-            expires_at=datetime.utcnow() + timedelta(days=7),  # 7 day sessions
-            last_active_at=datetime.utcnow()
-        )
-        
-        self.db.add(session)
-        self.db.commit()
-        
-        return session_token
+        ))
     
     async def link_wallet_to_user(
         self,
@@ -328,31 +433,35 @@ async def link_wallet_to_user(
     ) -> bool:
         """Link a new wallet to an existing user with dual signature verification"""
         
-        user = self.db.query(User).filter(User.id == user_id).first()
+        user = await self.db.scalar(select(User).where(User.id == user_id))
         if not user:
             return False
         
-        primary_wallet = user.primary_wallet
+        primary_wallet = await self.db.scalar(select(UserWallet).where(
+            UserWallet.user_id == user.id,
+            UserWallet.is_primary == True
+        ))
         if not primary_wallet:
             return False
         
-        # Verify both signatures
-        new_wallet_valid, _ = await WalletAuthenticator.authenticate_wallet(
-            new_wallet_address, new_wallet_signature, message, new_wallet_type, public_key
-        )
-        
-        primary_wallet_valid, _ = await WalletAuthenticator.authenticate_wallet(
-            primary_wallet.wallet_address, primary_wallet_signature, message, 
-            primary_wallet.wallet_type, primary_wallet.public_key
+        # Verify both signatures in parallel
+        (new_wallet_valid, _), (primary_wallet_valid, _) = await asyncio.gather(
+            WalletAuthenticator.authenticate_wallet(
+                new_wallet_address, new_wallet_signature, message, new_wallet_type, public_key
+            ),
+            WalletAuthenticator.authenticate_wallet(
+                primary_wallet.wallet_address, primary_wallet_signature, message,
+                primary_wallet.wallet_type, primary_wallet.public_key
+            )
         )
         
         if not (new_wallet_valid and primary_wallet_valid):
             return False
         
         # Check if wallet is already linked to another user
-        existing_wallet = self.db.query(UserWallet).filter(
+        existing_wallet = await self.db.scalar(select(UserWallet).where(
             UserWallet.wallet_address == new_wallet_address
-        ).first()
+        ))
         
         if existing_wallet:
             return False
@@ -369,47 +478,46 @@ async def link_wallet_to_user(
         )
         
         self.db.add(new_wallet)
-        self.db.commit()
+        await self.db.flush()
         
         return True
     
-    def get_user_by_session_token(self, session_token: str) -> Optional[User]:
-        """Get user by session token"""
-        session = self.db.query(UserSession).filter(
-            and_(
-                UserSession.session_token == session_token,
-                UserSession.expires_at > datetime.utcnow()
-            )
-        ).first()
-        
-        if session:
-            # Update last active time
-            session.last_active_at = datetime.utcnow()
-            self.db.commit()
-            return session.user
+    async def get_user_by_session_token(self, session_token: str) -> Optional[User]:
+        """Get user by session token (last active time is written behind)"""
+        user_id = await session_store.lookup(self.db, session_token)
+        if not user_id:
+            return None
         
-        return None
+        user = await user_cache.get(str(user_id))
+        if user is None:
+            user = await self.db.get(User, user_id)
+            if user:
+                await user_cache.set(str(user_id), user)
+        return user
     
-    def get_user_wallets(self, user_id: str) -> List[UserWallet]:
+    async def get_user_wallets(self, user_id: str) -> List[UserWallet]:
         """Get all wallets for a user"""
-        return self.db.query(UserWallet).filter(
+        return (await self.db.scalars(select(UserWallet).where(
             UserWallet.user_id == user_id
-        ).order_by(UserWallet.is_primary.desc(), UserWallet.created_at).all()
+        ).order_by(UserWallet.is_primary.desc(), UserWallet.created_at))).all()
     
-    def set_primary_wallet(self, user_id: str, wallet_id: str) -> bool:
+    async def set_primary_wallet(self, user_id: str, wallet_id: str) -> bool:
         """Set a wallet as the primary wallet for a user"""
-        # First, unset all primary flags for this user
-        self.db.query(UserWallet).filter(
-            UserWallet.user_id == user_id
-        ).update({'is_primary': False})
-        
         # Set the specified wallet as primary
-        result = self.db.query(UserWallet).filter(
+        result = await self.db.execute(update(UserWallet).where(
             and_(
                 UserWallet.user_id == user_id,
                 UserWallet.id == wallet_id
             )
-        ).update({'is_primary': True})
+        ).values(is_primary=True))
+        if result.rowcount == 0:
+            return False
         
-        self.db.commit()
-        return result > 0
\ No newline at end of file
+        # Then unset the user's other primary flags
+        await self.db.execute(update(UserWallet).where(
+            and_(
+                UserWallet.user_id == user_id,
+                UserWallet.id != wallet_id
+            )
+        ).values(is_primary=False))
+        return True
\ No newline at end of file
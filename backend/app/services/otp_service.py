@@ -8,7 +8,7 @@
 from sqlalchemy.orm import Session
 import logging
 
-from app.core.redis_client import redis_client
+from app.core.ephemeral_store import ephemeral_store
 from app.core.email import email_service
 from app.core.config import settings
 
@@ -76,75 +76,91 @@ async def send_otp_email(email: str, otp: str) -> bool:
         )
     
     @staticmethod
-    async def store_otp(email: str, otp: str, purpose: str = "verification") -> bool:
+    async def store_otp(
+        email: str,
+        otp: str,
+        purpose: str = "verification",
+        pending_user_id: Optional[str] = None
+    ) -> bool:
         """
-        Store OTP in Redis with expiration
+        Store OTP in the ephemeral store with expiration
         Key format: otp:{purpose}:{email}
+        
+        The OTP, its attempt counter and (when linking an email to an
+        existing user) the pending email are written in one atomic call.
         """
         key = f"otp:{purpose}:{email}"
+        attempts_key = f"otp_attempts:{purpose}:{email}"
         expiry_seconds = OTPService.OTP_EXPIRY_MINUTES * 60
         
-        # Store OTP with expiry
-        if redis_client.redis:
-            await redis_client.redis.setex(
-                key,
-                expiry_seconds,
-                otp
-            )
-            
-            # Store attempt counter
-            attempts_key = f"otp_attempts:{purpose}:{email}"
-            await redis_client.redis.setex(
-                attempts_key,
-                expiry_seconds,
-                "0"
-            )
+        if ephemeral_store.available:
+            items = {key: otp, attempts_key: "0"}
+            if pending_user_id:
+                items[f"pending_email:{pending_user_id}"] = email
+            await ephemeral_store.set_many(items, expiry_seconds)
         
         return True
     
     @staticmethod
     async def verify_otp(email: str, otp: str, purpose: str = "verification") -> tuple[bool, str]:
         """
-        Verify OTP for email
+        Verify OTP for email in one atomic store call
         Returns: (is_valid, error_message)
         """
         key = f"otp:{purpose}:{email}"
         attempts_key = f"otp_attempts:{purpose}:{email}"
         
-        if not redis_client.redis:
+        if not ephemeral_store.available:
             return False, "Service unavailable"
         
-        # Check if OTP exists
-        stored_otp = await redis_client.redis.get(key)
+        status, attempts = await ephemeral_store.verify_otp(
+            key, attempts_key, otp, OTPService.MAX_ATTEMPTS
+        )
         
-        if not stored_otp:
+        if status == 0:
             return False, "OTP expired or not found. Please request a new code."
-        
-        # Check attempt limit
-        attempts = await redis_client.redis.get(attempts_key)
-        attempt_count = int(attempts if attempts else 0)
-        
-        if attempt_count >= OTPService.MAX_ATTEMPTS:
-            # Delete OTP to prevent further attempts
-            await redis_client.redis.delete(key)
-            await redis_client.redis.delete(attempts_key)
+        if status == -1:
             return False, "Maximum verification attempts exceeded. Please request a new code."
-        
-        # Verify OTP
-        if stored_otp != otp:
-            # Increment attempt counter
-            await redis_client.redis.incr(attempts_key)
-            remaining = OTPService.MAX_ATTEMPTS - (attempt_count + 1)
+        if status == -2:
+            remaining = OTPService.MAX_ATTEMPTS - int(attempts)
             return False, f"Invalid OTP. {remaining} attempts remaining."
         
-        # OTP is valid - delete it (one-time use)
-        await redis_client.redis.delete(key)
-        await redis_client.redis.delete(attempts_key)
-        
         return True, "OTP verified successfully"
     
     @staticmethod
-    async def generate_and_send_otp(email: str, purpose: str = "verification") -> tuple[bool, Optional[str]]:
+    async def store_verified_email(email: str, expiry_seconds: int = 1800) -> Optional[str]:
+        """
+        Remember an email verified before any wallet was connected
+        Returns the verification token, or None if the store is unavailable
+        """
+        if not ephemeral_store.available:
+            return None
+        
+        verification_token = secrets.token_urlsafe(32)
+        await ephemeral_store.set_many({
+            f"verified_email:{verification_token}": email,
+            # Also store email -> token mapping for quick lookup
+            f"email_verification_token:{email}": verification_token,
+        }, expiry_seconds)
+        return verification_token
+    
+    @staticmethod
+    async def consume_verified_email(email: str) -> bool:
+        """Check for and clean up a pre-verified email in one store call"""
+        if not ephemeral_store.available:
+            return False
+        
+        verified_email = await ephemeral_store.consume_linked(
+            f"email_verification_token:{email}", "verified_email:"
+        )
+        return verified_email is not None
+    
+    @staticmethod
+    async def generate_and_send_otp(
+        email: str,
+        purpose: str = "verification",
+        pending_user_id: Optional[str] = None
+    ) -> tuple[bool, Optional[str]]:
         """
         Generate OTP and send it via email
         Returns: (success, error_message)
@@ -157,8 +173,8 @@ async def generate_and_send_otp(email: str, purpose: str = "verification") -> tu
             logger.info(f"OTP generated: {otp[:2]}**** (for {email})")
             
             # Store OTP
-            await OTPService.store_otp(email, otp, purpose)
-            logger.info(f"OTP stored in Redis for {email}")
+            await OTPService.store_otp(email, otp, purpose, pending_user_id)
+            logger.info(f"OTP stored for {email}")
             
             # Send email
             logger.info(f"Sending OTP email to {email} via SMTP...")
@@ -182,7 +198,7 @@ async def generate_and_send_otp(email: str, purpose: str = "verification") -> tu
             logger.error(f"Error generating/sending OTP for {email}: {str(e)}", exc_info=True)
             # In development, still allow OTP to be used even if email fails
             if settings.HEDERA_NETWORK == "testnet" or settings.CARDANO_NETWORK == "preprod":
-                logger.warning("⚠️  Email service error in development mode - OTP still stored in Redis")
+                logger.warning("⚠️  Email service error in development mode - OTP still stored")
                 return True, None
             return False, f"Error generating OTP: {str(e)}"
     
@@ -192,7 +208,6 @@ async def revoke_otp(email: str, purpose: str = "verification") -> None:
         key = f"otp:{purpose}:{email}"
         attempts_key = f"otp_attempts:{purpose}:{email}"
         
-        if redis_client.redis:
-            await redis_client.redis.delete(key)
-            await redis_client.redis.delete(attempts_key)
+        if ephemeral_store.available:
+            await ephemeral_store.delete(key, attempts_key)
 
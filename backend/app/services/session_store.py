@@ -0,0 +1,372 @@
+"""
+Wallet login sessions with write-behind to Postgres.
+
+Sessions are created and validated against the ephemeral store (Redis, or
+the in-process backend on a single node), so neither path waits on
+Postgres. New sessions and `last_active_at` bumps are buffered in process
+and written to `user_sessions` by a background flusher every
+SESSION_FLUSH_INTERVAL_SECONDS: one multi-row INSERT (plus the sessions'
+device_fingerprint_bands rows) and one bulk UPDATE per flush, with
+repeated touches of a session coalesced to the latest.
+
+`user_sessions` therefore lags by up to one flush interval. Lookups that
+miss the store (sessions created before a deploy, or evicted) fall back
+to the table and repopulate the store. Buffered writes are flushed on
+shutdown; a crash loses at most one interval of activity timestamps and
+sessions that were not yet flushed stay valid until they expire from the
+store.
+
+A batch that hits bad data (a unique or foreign-key violation, or a touch
+for a session that no longer exists) is retried one session per savepoint
+and the offending rows are dropped, so one bad row cannot wedge the
+buffer. Batches that fail for any other reason are requeued, at most
+SESSION_FLUSH_MAX_ATTEMPTS times per session.
+
+A session counts as closed once it has been idle for
+SESSION_IDLE_CLOSE_SECONDS; the flusher then folds its start hour and
+duration into the user's behavior pattern in the same transaction. Open
+sessions are tracked per process, from creation or first lookup, so with
+several workers the same session can go idle on each of them; a
+`session_closed:{id}` claim (SET NX) in the ephemeral store lets only the
+first worker fold it.
+"""
+
+import asyncio
+import json
+import secrets
+import uuid
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, RequestSession
+from app.core.ephemeral_store import ephemeral_store
+from app.models.user_wallet import UserSession, DeviceFingerprintBand
+from app.services import behavior_patterns
+from app.services.device_index import band_rows
+
+SESSION_LIFETIME = timedelta(days=7)
+
+# Errors caused by the rows themselves; retrying the same batch cannot help
+BAD_ROW_ERRORS = (IntegrityError, StaleDataError)
+
+
+def _session_key(token: str) -> str:
+    return f"session:{token}"
+
+
+def _wallet_key(wallet_id) -> str:
+    return f"session_wallet:{wallet_id}"
+
+
+def _closed_key(session_id) -> str:
+    return f"session_closed:{session_id}"
+
+
+class SessionStore:
+    """Hot-path session storage plus the write-behind buffer"""
+
+    def __init__(
+        self,
+        flush_interval: float = 5.0,
+        idle_close_seconds: float = 1800,
+        max_attempts: int = 12,
+        session_factory: Callable = AsyncSessionLocal
+    ):
+        self.flush_interval = flush_interval
+        self.idle_close = timedelta(seconds=idle_close_seconds)
+        self.max_attempts = max_attempts
+        self.session_factory = session_factory
+        self._pending_inserts: Dict[uuid.UUID, Dict[str, Any]] = {}
+        self._pending_touches: Dict[uuid.UUID, datetime] = {}
+        # session id -> [user id, created at, last active at]
+        self._open: Dict[uuid.UUID, List[Any]] = {}
+        # session id -> consecutive failed flushes
+        self._attempts: Dict[uuid.UUID, int] = {}
+        # Closed sessions this process claimed but has not written yet
+        self._claimed: Set[uuid.UUID] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending_inserts) + len(self._pending_touches)
+
+    async def _cache(self, token: str, session_id, user_id, wallet_id, created_at: datetime, expires_at: datetime) -> None:
+        ttl = int((expires_at - datetime.utcnow()).total_seconds())
+        if ttl <= 0:
+            return
+        items = {
+            _session_key(token): json.dumps({
+                "id": str(session_id),
+                "user_id": str(user_id),
+                "created_at": created_at.isoformat(),
+                "expires_at": expires_at.isoformat(),
+            })
+        }
+        if wallet_id:
+            items[_wallet_key(wallet_id)] = token
+        await ephemeral_store.set_many(items, ttl)
+
+    async def create(self, db, values: Dict[str, Any]) -> str:
+        """
+        Create a session from UserSession column values; returns its token
+
+        Falls back to a synchronous INSERT when the store is unavailable;
+        it is flushed, and committed with the rest of the caller's work.
+        On a request session the token is only cached and buffered once
+        the request commits, so it never outlives (or is flushed ahead of)
+        an uncommitted user or wallet.
+        """
+        now = datetime.utcnow()
+        token = secrets.token_urlsafe(32)
+        row = {
+            **values,
+            "id": uuid.uuid4(),
+            "session_token": token,
+            "expires_at": now + SESSION_LIFETIME,
+            "created_at": now,
+            "last_active_at": now,
+        }
+
+        if not ephemeral_store.available:
+            db.add(UserSession(**row))
+            db.add_all([DeviceFingerprintBand(**band) for band in band_rows(row)])
+            await db.flush()
+            return token
+
+        if isinstance(db, RequestSession):
+            db.after_commit(partial(self._remember, token, row))
+        else:
+            await self._remember(token, row)
+        return token
+
+    async def _remember(self, token: str, row: Dict[str, Any]) -> None:
+        await self._cache(
+            token, row["id"], row["user_id"], row.get("current_wallet_id"), row["created_at"], row["expires_at"]
+        )
+        self._pending_inserts[row["id"]] = row
+        self._open[row["id"]] = [row["user_id"], row["created_at"], row["last_active_at"]]
+
+    async def lookup(self, db, token: str) -> Optional[uuid.UUID]:
+        """Validate a session token and record activity; returns the user id"""
+        now = datetime.utcnow()
+        raw = await ephemeral_store.get(_session_key(token)) if ephemeral_store.available else None
+
+        if raw:
+            data = json.loads(raw)
+            if datetime.fromisoformat(data["expires_at"]) <= now:
+                return None
+            session_id, user_id = uuid.UUID(data["id"]), uuid.UUID(data["user_id"])
+            created_at = datetime.fromisoformat(data["created_at"]) if "created_at" in data else now
+        else:
+            session = await db.scalar(select(UserSession).where(
+                UserSession.session_token == token,
+                UserSession.expires_at > now
+            ))
+            if not session:
+                return None
+            session_id, user_id = session.id, session.user_id
+            created_at = session.created_at.replace(tzinfo=None) if session.created_at else now
+            if ephemeral_store.available:
+                expires_at = session.expires_at.replace(tzinfo=None)
+                await self._cache(token, session_id, user_id, session.current_wallet_id, created_at, expires_at)
+
+        self.touch(session_id, now)
+        if session_id in self._open:
+            self._open[session_id][2] = now
+        else:
+            self._open[session_id] = [user_id, created_at, now]
+        return user_id
+
+    def touch(self, session_id: uuid.UUID, at: datetime) -> None:
+        """Buffer a last_active_at bump (folded into the insert if not yet flushed)"""
+        if session_id in self._pending_inserts:
+            self._pending_inserts[session_id]["last_active_at"] = at
+        else:
+            self._pending_touches[session_id] = at
+
+    async def latest_token_for_wallet(self, db, wallet_id) -> Optional[str]:
+        """Most recent live session token for a wallet, including unflushed ones"""
+        if ephemeral_store.available:
+            token = await ephemeral_store.get(_wallet_key(wallet_id))
+            if token:
+                return token
+        session = await db.scalar(select(UserSession).where(
+            UserSession.current_wallet_id == wallet_id,
+            UserSession.expires_at > datetime.utcnow()
+        ).order_by(UserSession.created_at.desc()).limit(1))
+        return session.session_token if session else None
+
+    def _take_closed(self, now: datetime) -> Dict[uuid.UUID, List[Any]]:
+        closed = {
+            session_id: entry for session_id, entry in self._open.items()
+            if now - entry[2] >= self.idle_close
+        }
+        for session_id in closed:
+            del self._open[session_id]
+        return closed
+
+    async def flush(self, now: Optional[datetime] = None) -> int:
+        """Write buffered sessions and activity to Postgres; returns rows written"""
+        inserts, self._pending_inserts = self._pending_inserts, {}
+        touches, self._pending_touches = self._pending_touches, {}
+        closed = await self._claim_closed(self._take_closed(now or datetime.utcnow()))
+        if not inserts and not touches and not closed:
+            return 0
+
+        db = self.session_factory()
+        try:
+            try:
+                await self._write(db, inserts, touches, closed)
+                await db.commit()
+                written = len(inserts) + len(touches)
+            except BAD_ROW_ERRORS:
+                await db.rollback()
+                written = await self._write_each(db, inserts, touches, closed)
+        except BaseException as e:
+            # Cancellation included: the batch was swapped out of the buffers,
+            # so it must go back before anything else is awaited
+            self._requeue(inserts, touches, closed, failed=isinstance(e, Exception))
+            await db.rollback()
+            raise
+        finally:
+            await db.close()
+
+        for session_id in (*inserts, *touches, *closed):
+            self._attempts.pop(session_id, None)
+        self._claimed.difference_update(closed)
+        return written
+
+    async def _claim_closed(self, closed: Dict[uuid.UUID, List[Any]]) -> Dict[uuid.UUID, List[Any]]:
+        """Keep the closed sessions no other worker has folded already"""
+        if not closed or not ephemeral_store.available:
+            return closed
+        claimed = {}
+        for session_id, entry in closed.items():
+            if session_id not in self._claimed:
+                try:
+                    won = await ephemeral_store.claim(
+                        _closed_key(session_id), int(SESSION_LIFETIME.total_seconds())
+                    )
+                except Exception as e:
+                    print(f"❌ Could not claim closed session {session_id}: {e}")
+                    # Still open here; try again on the next flush
+                    self._open.setdefault(session_id, entry)
+                    continue
+                if not won:
+                    continue
+                self._claimed.add(session_id)
+            claimed[session_id] = entry
+        return claimed
+
+    async def _write(self, db, inserts, touches, closed) -> None:
+        if inserts:
+            await db.execute(
+                pg_insert(UserSession).on_conflict_do_nothing(index_elements=["id"]),
+                list(inserts.values())
+            )
+            bands = [band for row in inserts.values() for band in band_rows(row)]
+            if bands:
+                await db.execute(pg_insert(DeviceFingerprintBand).on_conflict_do_nothing(), bands)
+        if touches:
+            await db.execute(update(UserSession), [
+                {"id": session_id, "last_active_at": at} for session_id, at in touches.items()
+            ])
+        if closed:
+            await behavior_patterns.record_sessions(db, [
+                (user_id, created_at, (last_active_at - created_at).total_seconds())
+                for user_id, created_at, last_active_at in closed.values()
+            ])
+
+    async def _write_each(self, db, inserts, touches, closed) -> int:
+        """Retry a batch that hit bad data one savepoint at a time, dropping the rows that fail"""
+        by_user: Dict[Any, Dict[uuid.UUID, List[Any]]] = {}
+        for session_id, entry in closed.items():
+            by_user.setdefault(entry[0], {})[session_id] = entry
+
+        parts = [("session", session_id, ({session_id: row}, {}, {})) for session_id, row in inserts.items()]
+        parts += [("activity for session", session_id, ({}, {session_id: at}, {})) for session_id, at in touches.items()]
+        parts += [("closed sessions of user", user_id, ({}, {}, entries)) for user_id, entries in by_user.items()]
+
+        written = 0
+        for kind, key, part in parts:
+            try:
+                async with db.begin_nested():
+                    await self._write(db, *part)
+            except BAD_ROW_ERRORS as e:
+                print(f"⚠️  Dropping {kind} {key} from the session write-behind: {e}")
+                continue
+            written += len(part[0]) + len(part[1])
+        await db.commit()
+        return written
+
+    def _requeue(self, inserts, touches, closed, failed: bool = True) -> None:
+        """Put an unwritten batch back, dropping sessions that have used up their attempts"""
+        dropped = 0
+        for session_id in ({*inserts, *touches, *closed} if failed else ()):
+            attempts = self._attempts.get(session_id, 0) + 1
+            if attempts < self.max_attempts:
+                self._attempts[session_id] = attempts
+                continue
+            self._attempts.pop(session_id, None)
+            self._claimed.discard(session_id)
+            inserts.pop(session_id, None)
+            touches.pop(session_id, None)
+            closed.pop(session_id, None)
+            dropped += 1
+        if dropped:
+            print(f"❌ Dropped {dropped} sessions from the write-behind after {self.max_attempts} failed flushes")
+
+        # Anything buffered meanwhile is newer and wins
+        for session_id, row in inserts.items():
+            self._pending_inserts.setdefault(session_id, row)
+        for session_id, at in touches.items():
+            self._pending_touches.setdefault(session_id, at)
+        for session_id, entry in closed.items():
+            self._open.setdefault(session_id, entry)
+
+    def start(self) -> None:
+        if self._task:
+            return
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._run())
+        print("✅ Session write-behind flusher started")
+
+    async def stop(self) -> None:
+        """Stop the flusher and write whatever is still buffered"""
+        if self._task:
+            # Let a flush in progress finish rather than cancelling it mid-write
+            self._stopping.set()
+            await self._task
+            self._task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            print(f"❌ Final session flush failed: {e}")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self.flush_interval)
+                return
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"❌ Session flush failed: {e}")
+
+
+# Global session store instance
+session_store = SessionStore(
+    flush_interval=settings.SESSION_FLUSH_INTERVAL_SECONDS,
+    idle_close_seconds=settings.SESSION_IDLE_CLOSE_SECONDS,
+    max_attempts=settings.SESSION_FLUSH_MAX_ATTEMPTS
+)
@@ -0,0 +1,4 @@
+-- Migration: One behavior pattern row per user and type
+-- Closed sessions are folded into the row with INSERT ... ON CONFLICT
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_user_behavior_user_type ON user_behavior_patterns(user_id, pattern_type);
@@ -0,0 +1,17 @@
+-- Migration: Add MinHash LSH index for fuzzy device fingerprint matching
+-- Sessions keep their per-component feature hashes; each session gets one
+-- row per LSH band so similar devices are found by index probes instead of
+-- scanning user_sessions. Existing sessions only support exact matching.
+
+ALTER TABLE user_sessions ADD COLUMN IF NOT EXISTS device_features JSONB;
+
+CREATE TABLE IF NOT EXISTS device_fingerprint_bands (
+    session_id UUID NOT NULL REFERENCES user_sessions(id) ON DELETE CASCADE,
+    band SMALLINT NOT NULL,
+    bucket BIGINT NOT NULL,
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    PRIMARY KEY (session_id, band)
+);
+
+CREATE INDEX IF NOT EXISTS idx_device_fingerprint_bands_bucket ON device_fingerprint_bands(band, bucket);
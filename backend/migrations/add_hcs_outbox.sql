@@ -0,0 +1,18 @@
+-- Migration: Add HCS outbox for asynchronous harvest submission
+-- record_harvest writes the harvest and its outbox row in one transaction;
+-- the outbox worker drains pending rows to HCS in packed batches
+
+CREATE TABLE IF NOT EXISTS hcs_outbox (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    harvest_id UUID NOT NULL REFERENCES harvests(id) ON DELETE CASCADE,
+    user_id UUID NOT NULL REFERENCES users(id),
+    payload JSON NOT NULL,
+    status VARCHAR NOT NULL DEFAULT 'pending', -- 'pending', 'submitted', 'failed'
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    hcs_transaction_id VARCHAR,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    submitted_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE INDEX IF NOT EXISTS idx_hcs_outbox_status_created ON hcs_outbox(status, created_at);
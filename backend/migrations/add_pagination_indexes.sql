@@ -0,0 +1,14 @@
+-- Migration: Add composite indexes for cursor-based pagination
+-- Connection queries order by (created_at DESC, id DESC) and seek past the
+-- cursor with a row comparison, so each page is an index range scan
+
+CREATE INDEX IF NOT EXISTS idx_users_created_id ON users(created_at, id);
+
+CREATE INDEX IF NOT EXISTS idx_harvests_created_id ON harvests(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_harvests_farmer_created_id ON harvests(farmer_id, created_at, id);
+
+CREATE INDEX IF NOT EXISTS idx_loans_created_id ON loans(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_loans_borrower_created_id ON loans(borrower_id, created_at, id);
+
+CREATE INDEX IF NOT EXISTS idx_transactions_created_id ON transactions(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_transactions_user_created_id ON transactions(user_id, created_at, id);
@@ -0,0 +1,31 @@
+"""
+Shared pytest fixtures.
+"""
+
+import sys
+import os
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tests.stub_servers import StubServer, StubStats, create_blockfrost_app, create_mirror_node_app
+
+
+@pytest.fixture(scope="session")
+def blockfrost_stub():
+    """Local Blockfrost stub server; yields (base_url, stats)"""
+    stats = StubStats()
+    server = StubServer(create_blockfrost_app(stats)).start()
+    yield server.url, stats
+    server.stop()
+
+
+@pytest.fixture(scope="session")
+def mirror_node_stub():
+    """Local Hedera mirror node stub server; yields (base_url, stats)"""
+    stats = StubStats()
+    server = StubServer(create_mirror_node_app(stats)).start()
+    yield server.url, stats
+    server.stop()
@@ -0,0 +1,181 @@
+"""
+Local stub HTTP servers for external chain APIs.
+
+Each stub is a small FastAPI app served by uvicorn on a background thread,
+with a configurable artificial latency so tests can measure how many
+requests a client really keeps in flight.
+"""
+
+import asyncio
+import socket
+import threading
+import time
+from datetime import datetime
+
+import uvicorn
+from fastapi import FastAPI, HTTPException
+
+
+class StubServer:
+    """Run an ASGI app on 127.0.0.1 on a free port in a daemon thread"""
+
+    def __init__(self, app: FastAPI):
+        self.app = app
+        self.port = self._free_port()
+        self.server = uvicorn.Server(uvicorn.Config(
+            app,
+            host="127.0.0.1",
+            port=self.port,
+            log_level="warning",
+            lifespan="off"
+        ))
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    @staticmethod
+    def _free_port() -> int:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.bind(("127.0.0.1", 0))
+            return sock.getsockname()[1]
+
+    def start(self) -> "StubServer":
+        self.thread.start()
+        deadline = time.monotonic() + 10
+        while not self.server.started:
+            if time.monotonic() > deadline:
+                raise RuntimeError("Stub server did not start")
+            time.sleep(0.01)
+        return self
+
+    def stop(self) -> None:
+        self.server.should_exit = True
+        self.thread.join(timeout=5)
+
+
+class StubStats:
+    """Request counters shared between a stub app and the test using it"""
+
+    def __init__(self):
+        self.latency = 0.0
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.fail_next = 0
+
+    def reset(self, latency: float = 0.0, fail_next: int = 0) -> None:
+        self.latency = latency
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.fail_next = fail_next
+
+    async def hit(self) -> None:
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+        if self.fail_next > 0:
+            self.fail_next -= 1
+            raise HTTPException(status_code=503, detail="Stub failure")
+
+
+def create_blockfrost_app(stats: StubStats) -> FastAPI:
+    """Minimal subset of the Blockfrost REST API"""
+    app = FastAPI()
+
+    @app.get("/addresses/{address}")
+    async def address(address: str):
+        await stats.hit()
+        return {
+            "address": address,
+            "amount": [
+                {"unit": "lovelace", "quantity": "10000000"},
+                {"unit": "abc123746f6b656e", "quantity": "5"},
+            ],
+            "stake_address": "stake_test1stub",
+            "type": "shelley",
+        }
+
+    @app.get("/addresses/{address}/utxos")
+    async def address_utxos(address: str):
+        await stats.hit()
+        return [{"tx_hash": "stub_tx", "output_index": 0, "amount": [{"unit": "lovelace", "quantity": "10000000"}]}]
+
+    @app.get("/addresses/{address}/transactions")
+    async def address_transactions(address: str, count: int = 100, page: int = 1):
+        await stats.hit()
+        return [{"tx_hash": f"stub_tx_{i}", "tx_index": i, "block_height": 100 + i} for i in range(min(count, 3))]
+
+    @app.get("/assets/{asset}")
+    async def asset(asset: str):
+        await stats.hit()
+        return {
+            "asset": asset,
+            "fingerprint": "asset1stub",
+            "quantity": "1000",
+            "initial_mint_tx_hash": "stub_mint_tx",
+            "onchain_metadata": {"name": "Stub Token"},
+        }
+
+    @app.get("/txs/{tx_hash}")
+    async def transaction(tx_hash: str):
+        await stats.hit()
+        if tx_hash == "missing":
+            raise HTTPException(status_code=404, detail="Not Found")
+        return {
+            "hash": tx_hash,
+            "block_height": 1000,
+            "block_time": int(datetime(2024, 1, 1).timestamp()),
+            "fees": "170000",
+        }
+
+    @app.get("/txs/{tx_hash}/metadata")
+    async def transaction_metadata(tx_hash: str):
+        await stats.hit()
+        return [{"label": "721", "json_metadata": {"event_type": "harvest"}}]
+
+    return app
+
+
+def create_mirror_node_app(stats: StubStats) -> FastAPI:
+    """Minimal subset of the Hedera mirror node REST API"""
+    app = FastAPI()
+
+    @app.get("/topics/{topic_id}/messages")
+    async def topic_messages(topic_id: str, limit: int = 10):
+        await stats.hit()
+        return {
+            "messages": [
+                {
+                    "consensus_timestamp": f"1700000000.{i:09d}",
+                    "message": "eyJ0eXBlIjoiaGFydmVzdCJ9",
+                    "payer_account_id": "0.0.1001",
+                    "sequence_number": i + 1,
+                    "topic_id": topic_id,
+                }
+                for i in range(limit)
+            ],
+            "links": {"next": None},
+        }
+
+    @app.get("/tokens/{token_id}")
+    async def token_info(token_id: str):
+        await stats.hit()
+        if token_id == "0.0.404":
+            raise HTTPException(status_code=404, detail="Not Found")
+        return {
+            "token_id": token_id,
+            "name": "Stub Harvest",
+            "symbol": "STB",
+            "total_supply": "1000000",
+            "treasury_account_id": "0.0.1001",
+        }
+
+    return app
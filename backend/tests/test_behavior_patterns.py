@@ -0,0 +1,69 @@
+"""
+Tests for incremental behavior patterns and batched candidate scoring.
+"""
+
+import sys
+import os
+import statistics
+from datetime import datetime
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services import behavior_patterns
+
+
+def build(sessions):
+    pattern = behavior_patterns.empty_pattern()
+    for hour, duration in sessions:
+        pattern = behavior_patterns.merge_session(pattern, datetime(2024, 1, 1, hour), duration)
+    return pattern
+
+
+class TestBehaviorPatterns:
+    """Streaming aggregation and vectorized scoring"""
+
+    def test_merge_matches_batch_statistics(self):
+        durations = [120.0, 900.0, 300.0, 1800.0, 60.0]
+        pattern = build([(9, d) for d in durations])
+
+        assert pattern["hours"][9] == 5
+        assert pattern["duration_count"] == 5
+        assert abs(pattern["duration_mean"] - statistics.mean(durations)) < 1e-9
+        variance = pattern["duration_m2"] / (pattern["duration_count"] - 1)
+        assert abs(variance - statistics.variance(durations)) < 1e-6
+
+    def test_hour_profile_wraps_midnight(self):
+        profile = behavior_patterns.hour_profile(0)
+
+        assert profile[0] == 1.0
+        assert profile[23] == profile[1]
+        assert profile[12] < 1e-6
+
+    def test_score_candidates_prefers_matching_hours_and_history(self):
+        morning = build([(9, 600)] * 20)
+        evening = build([(21, 600)] * 20)
+        sparse_morning = build([(9, 600)] * 2)
+
+        scores = behavior_patterns.score_candidates([morning, evening, sparse_morning], hour=9)
+
+        assert isinstance(scores, np.ndarray)
+        assert int(scores.argmax()) == 0
+        assert scores[1] < 0.01
+        assert scores[2] < scores[0]
+        assert behavior_patterns.score_candidates([], hour=9).size == 0
+
+    def test_empty_pattern_scores_zero(self):
+        scores = behavior_patterns.score_candidates([behavior_patterns.empty_pattern()], hour=3)
+
+        assert scores.tolist() == [0.0]
+
+    def test_pairwise_similarity(self):
+        a = build([(9, 600)] * 5)
+        b = build([(9, 600)] * 3 + [(10, 600)])
+        c = build([(22, 7200)] * 5)
+
+        assert behavior_patterns.similarity(a, a) == 1.0
+        assert behavior_patterns.similarity(a, b) > behavior_patterns.similarity(a, c)
@@ -0,0 +1,96 @@
+"""
+Tests for the tiered read-through cache.
+"""
+
+import asyncio
+import sys
+import os
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.cache import TieredCache, NO_CACHE
+
+
+class CountingLoader:
+    def __init__(self, value, delay=0.0):
+        self.value = value
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.value
+
+
+class TestTieredCache:
+    """In-process behaviour of TieredCache (Redis not connected)"""
+
+    async def test_concurrent_lookups_are_coalesced(self):
+        cache = TieredCache("test-coalesce")
+        loader = CountingLoader({"hash": "abc"}, delay=0.05)
+
+        results = await asyncio.gather(*[
+            cache.get_or_load("tx:abc", loader, ttl=None) for _ in range(50)
+        ])
+
+        assert loader.calls == 1
+        assert all(result == {"hash": "abc"} for result in results)
+        assert cache.stats.misses == 1
+        assert cache.stats.coalesced == 49
+
+    async def test_hits_and_misses_are_counted(self):
+        cache = TieredCache("test-stats")
+        loader = CountingLoader({"symbol": "HLT"})
+
+        await cache.get_or_load("token", loader, ttl=30)
+        await cache.get_or_load("token", loader, ttl=30)
+
+        assert loader.calls == 1
+        assert cache.stats.misses == 1
+        assert cache.stats.local_hits == 1
+        assert cache.stats.hit_ratio == 0.5
+
+    async def test_expired_entries_are_reloaded(self):
+        cache = TieredCache("test-expiry")
+        loader = CountingLoader({"total_supply": "100"})
+
+        await cache.get_or_load("token", loader, ttl=0.01)
+        await asyncio.sleep(0.02)
+        await cache.get_or_load("token", loader, ttl=0.01)
+
+        assert loader.calls == 2
+
+    async def test_ttl_policy_and_none_results(self):
+        cache = TieredCache("test-policy")
+        pending = CountingLoader({"block_height": None})
+        missing = CountingLoader(None)
+
+        def ttl(tx):
+            return None if tx["block_height"] is not None else NO_CACHE
+
+        for _ in range(2):
+            await cache.get_or_load("pending", pending, ttl=ttl)
+            assert await cache.get_or_load("missing", missing, ttl=None) is None
+
+        assert pending.calls == 2
+        assert missing.calls == 2
+
+    async def test_loader_errors_reach_every_waiter(self):
+        cache = TieredCache("test-errors")
+
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream down")
+
+        results = await asyncio.gather(
+            *[cache.get_or_load("key", failing, ttl=30) for _ in range(5)],
+            return_exceptions=True
+        )
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert cache.stats.upstream_errors == 1
+        assert "key" not in cache._inflight
@@ -0,0 +1,98 @@
+"""
+Tests for the pooled async Blockfrost backend of CardanoClient.
+
+Runs against the local Blockfrost stub server from conftest.py.
+"""
+
+import asyncio
+import time
+import sys
+import os
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.cardano_client import CardanoClient
+
+
+@pytest.fixture
+async def client(blockfrost_stub):
+    url, stats = blockfrost_stub
+    stats.reset()
+    cardano = CardanoClient()
+    cardano.http = CardanoClient._create_http_client(url, "stub_project")
+    yield cardano, stats
+    await cardano.close()
+
+
+class TestCardanoClient:
+    """Async HTTP backend behaviour"""
+
+    async def test_address_info_parses_balance(self, client):
+        cardano, stats = client
+
+        info = await cardano.get_address_info("addr_test1stub")
+
+        assert info["ada_balance"] == "10000000"
+        assert info["assets"] == [{"unit": "abc123746f6b656e", "quantity": "5"}]
+        assert info["stake_address"] == "stake_test1stub"
+        assert stats.requests == 2
+
+    async def test_transaction_paired_calls_run_concurrently(self, client):
+        cardano, stats = client
+        stats.reset(latency=0.2)
+
+        started = time.perf_counter()
+        tx = await cardano.get_transaction("abc")
+        elapsed = time.perf_counter() - started
+
+        assert tx["fees"] == "170000"
+        assert tx["metadata"][0]["label"] == "721"
+        assert stats.max_in_flight == 2
+        assert elapsed < 0.35
+
+    async def test_missing_transaction_returns_none(self, client):
+        cardano, _ = client
+
+        assert await cardano.get_transaction("missing") is None
+
+    async def test_concurrent_lookups_share_the_pool(self, client):
+        """50 concurrent address lookups overlap instead of queueing"""
+        cardano, stats = client
+        stats.reset(latency=0.1)
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*[
+            cardano.get_address_info(f"addr_test1stub{i}") for i in range(50)
+        ])
+        elapsed = time.perf_counter() - started
+
+        assert all(results)
+        assert stats.requests == 100
+        assert stats.max_in_flight > 10
+        # Serial execution would take 100 * 0.1s
+        assert elapsed < 3.0
+
+
+class TestCardanoClientInitialize:
+    """Base URL of the pooled client built by initialize()"""
+
+    @pytest.mark.parametrize("network", ["preprod", "mainnet"])
+    async def test_requests_target_versioned_api(self, monkeypatch, network):
+        from app.core import cardano_client as cardano_module
+        monkeypatch.setattr(cardano_module.settings, "BLOCKFROST_PROJECT_ID", "preprodTestProject")
+        cardano = CardanoClient()
+        cardano.network = network
+
+        await cardano.initialize()
+        try:
+            assert cardano.http is not None
+            request = cardano.http.build_request("GET", "/assets/abc123")
+            assert request.url.path == "/api/v0/assets/abc123"
+            assert request.headers["project_id"] == "preprodTestProject"
+            if cardano_module.BLOCKFROST_AVAILABLE:
+                assert request.url.host == f"cardano-{network}.blockfrost.io"
+        finally:
+            await cardano.close()
@@ -0,0 +1,98 @@
+"""
+Tests for the per-request GraphQL DataLoader registry.
+
+Verifies that concurrent loads are batched into a single statement and that
+results are mapped back to their keys.
+"""
+
+import asyncio
+import uuid
+import sys
+import os
+from types import SimpleNamespace
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.graphql.dataloaders import DataLoaders
+
+
+class FakeScalarResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+
+class FakeSession:
+    """Records executed statements and returns a fixed set of rows"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+        self.active = 0
+
+    async def scalars(self, statement):
+        self.active += 1
+        assert self.active == 1, "statements must not overlap on one session"
+        self.statements.append(statement)
+        await asyncio.sleep(0)
+        self.active -= 1
+        return FakeScalarResult(self.rows)
+
+
+class TestDataLoaders:
+    """Batching behaviour of DataLoaders"""
+
+    async def test_by_id_batches_concurrent_loads(self):
+        users = [SimpleNamespace(id=uuid.uuid4()) for _ in range(3)]
+        db = FakeSession(users)
+        loaders = DataLoaders(db)
+
+        missing = uuid.uuid4()
+        results = await asyncio.gather(
+            loaders.users_by_id.load(users[0].id),
+            loaders.users_by_id.load(str(users[1].id)),
+            loaders.users_by_id.load(users[2].id),
+            loaders.users_by_id.load(missing),
+        )
+
+        assert len(db.statements) == 1
+        assert results[:3] == users
+        assert results[3] is None
+
+    async def test_by_foreign_key_groups_rows(self):
+        owner_a, owner_b = uuid.uuid4(), uuid.uuid4()
+        wallets = [
+            SimpleNamespace(id=uuid.uuid4(), user_id=owner_a),
+            SimpleNamespace(id=uuid.uuid4(), user_id=owner_b),
+            SimpleNamespace(id=uuid.uuid4(), user_id=owner_a),
+        ]
+        db = FakeSession(wallets)
+        loaders = DataLoaders(db)
+
+        a, b, empty = await asyncio.gather(
+            loaders.wallets_by_user_id.load(owner_a),
+            loaders.wallets_by_user_id.load(owner_b),
+            loaders.wallets_by_user_id.load(uuid.uuid4()),
+        )
+
+        assert len(db.statements) == 1
+        assert a == [wallets[0], wallets[2]]
+        assert b == [wallets[1]]
+        assert empty == []
+
+    async def test_loaders_do_not_overlap_on_session(self):
+        db = FakeSession([])
+        loaders = DataLoaders(db)
+
+        await asyncio.gather(
+            loaders.users_by_id.load(uuid.uuid4()),
+            loaders.harvests_by_farmer_id.load(uuid.uuid4()),
+            loaders.loans_by_borrower_id.load(uuid.uuid4()),
+        )
+
+        assert len(db.statements) == 3
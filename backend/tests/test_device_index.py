@@ -0,0 +1,106 @@
+"""
+Tests for MinHash LSH device fingerprint matching.
+"""
+
+import sys
+import os
+import uuid
+from datetime import datetime
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services import device_index
+from app.services.multi_wallet_auth import DeviceFingerprinter
+
+CHROME = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.6099.109 Safari/537.36"
+CHROME_PATCHED = CHROME.replace("120.0.6099.109", "120.0.6099.130")
+FIREFOX_MAC = "Mozilla/5.0 (Macintosh; Intel Mac OS X 14.1; rv:121.0) Gecko/20100101 Firefox/121.0"
+
+DEVICE = {
+    "user_agent": CHROME,
+    "screen_resolution": "1920x1080",
+    "timezone": "Africa/Nairobi",
+    "language": "en-US",
+    "ip_address": "41.90.12.7",
+}
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+class FakeSession:
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return FakeResult(self.rows)
+
+
+class TestDeviceIndex:
+    """Feature extraction, LSH banding and candidate selection"""
+
+    def test_patch_update_and_new_ip_in_subnet_keep_features(self):
+        updated = {**DEVICE, "user_agent": CHROME_PATCHED, "ip_address": "41.90.12.200"}
+
+        assert device_index.extract_features(updated) == device_index.extract_features(DEVICE)
+
+    def test_similar_devices_share_buckets(self):
+        other_network = {**DEVICE, "ip_address": "102.0.5.9"}
+        other_device = {**DEVICE, "user_agent": FIREFOX_MAC, "screen_resolution": "2560x1600", "language": "fr-FR"}
+
+        base = set(device_index.band_buckets(device_index.extract_features(DEVICE)))
+        near = set(device_index.band_buckets(device_index.extract_features(other_network)))
+        far = set(device_index.band_buckets(device_index.extract_features(other_device)))
+
+        assert len(base) == device_index.BANDS
+        assert base & near
+        assert not base & far
+
+    def test_exact_similarity_is_unchanged(self):
+        fingerprint = DeviceFingerprinter.generate_fingerprint(CHROME, "1920x1080", "UTC", "en", "1.2.3.4")
+
+        assert DeviceFingerprinter.calculate_similarity(fingerprint, fingerprint) == 1.0
+        assert DeviceFingerprinter.calculate_similarity(fingerprint, "other") == 0.0
+
+    def test_feature_similarity(self):
+        features = DeviceFingerprinter.extract_features(DEVICE)
+        moved = DeviceFingerprinter.extract_features({**DEVICE, "ip_address": "102.0.5.9"})
+
+        assert DeviceFingerprinter.calculate_similarity(features, features) == 1.0
+        assert 0.7 < DeviceFingerprinter.calculate_similarity(features, moved) < 1.0
+
+    def test_band_rows(self):
+        session = {
+            "id": uuid.uuid4(), "user_id": uuid.uuid4(), "expires_at": datetime.utcnow(),
+            "device_features": device_index.extract_features(DEVICE),
+        }
+
+        rows = device_index.band_rows(session)
+
+        assert [row["band"] for row in rows] == list(range(device_index.BANDS))
+        assert device_index.band_rows({**session, "device_features": None}) == []
+
+    async def test_find_similar_user_picks_best_candidate(self):
+        features = device_index.extract_features(DEVICE)
+        close = device_index.extract_features({**DEVICE, "ip_address": "102.0.5.9"})
+        far = device_index.extract_features({**DEVICE, "user_agent": FIREFOX_MAC})
+        best_user, close_user, far_user = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+        db = FakeSession([
+            (far_user, far, datetime(2024, 1, 3)),
+            (close_user, close, datetime(2024, 1, 2)),
+            (best_user, features, datetime(2024, 1, 1)),
+        ])
+
+        assert await device_index.find_similar_user(db, features, 0.8) == best_user
+        assert await device_index.find_similar_user(db, far, 0.99) == far_user
+        assert await device_index.find_similar_user(FakeSession([(far_user, far, None)]), features, 0.8) is None
+        assert await device_index.find_similar_user(db, [], 0.8) is None
+        assert "device_fingerprint_bands" in str(db.statements[0])
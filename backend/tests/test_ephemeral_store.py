@@ -0,0 +1,127 @@
+"""
+Tests for the ephemeral auth-state store (memory and Redis backends).
+"""
+
+import sys
+import os
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import fakeredis
+
+from app.core import ephemeral_store as store_module
+from app.core.ephemeral_store import MemoryEphemeralStore, RedisEphemeralStore, ephemeral_store
+from app.core.redis_client import redis_client
+from app.core.wallet_auth import WalletAuthenticator
+from app.services.otp_service import OTPService
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(params=["memory", "redis"])
+async def store(request):
+    previous = ephemeral_store.backend, redis_client.redis, redis_client.scripts
+    connection = None
+    if request.param == "memory":
+        ephemeral_store.use(MemoryEphemeralStore())
+    else:
+        connection = fakeredis.FakeAsyncRedis(decode_responses=True)
+        redis_client.attach(connection)
+        ephemeral_store.use(RedisEphemeralStore())
+    yield ephemeral_store
+    if connection is not None:
+        await connection.aclose()
+    ephemeral_store.backend, redis_client.redis, redis_client.scripts = previous
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(store_module.time, "monotonic", clock)
+    return clock
+
+
+class TestEphemeralStore:
+    """Same contract on both backends"""
+
+    async def test_nonce_round_trip(self, store):
+        await WalletAuthenticator.store_nonce("abc", "0.0.1")
+
+        assert await WalletAuthenticator.verify_nonce("abc", "0.0.1") is True
+        assert await WalletAuthenticator.verify_nonce("abc", "0.0.1") is False
+
+    async def test_otp_flow(self, store):
+        await OTPService.store_otp("a@example.com", "123456", pending_user_id="u1")
+
+        assert (await OTPService.verify_otp("a@example.com", "000000"))[1].startswith("Invalid OTP. 4")
+        assert (await OTPService.verify_otp("a@example.com", "123456"))[0] is True
+        assert (await OTPService.verify_otp("a@example.com", "123456"))[0] is False
+        assert await store.get("pending_email:u1") == "a@example.com"
+
+    async def test_otp_lockout(self, store):
+        await OTPService.store_otp("a@example.com", "123456")
+        for _ in range(OTPService.MAX_ATTEMPTS):
+            await OTPService.verify_otp("a@example.com", "000000")
+
+        is_valid, message = await OTPService.verify_otp("a@example.com", "123456")
+
+        assert not is_valid
+        assert "Maximum verification attempts" in message
+
+    async def test_verified_email(self, store):
+        assert await OTPService.store_verified_email("a@example.com")
+
+        assert await OTPService.consume_verified_email("a@example.com") is True
+        assert await OTPService.consume_verified_email("a@example.com") is False
+
+
+    async def test_claim_is_exclusive(self, store):
+        assert await store.claim("session_closed:1", 60) is True
+        assert await store.claim("session_closed:1", 60) is False
+        assert await store.claim("session_closed:2", 60) is True
+
+
+class TestMemoryExpiry:
+    """Timer-wheel expiry of the in-process backend"""
+
+    async def test_keys_expire(self, clock):
+        store = MemoryEphemeralStore()
+        await store.set("short", "1", 5)
+        await store.set_many({"long": "2", "other": "3"}, 60)
+
+        clock.now += 5
+        assert await store.get("short") is None
+        assert await store.get("long") == "2"
+
+        clock.now += 60
+        assert await store.getdel("long") is None
+
+    async def test_sweep_drops_expired_keys_on_write(self, clock):
+        store = MemoryEphemeralStore()
+        for i in range(100):
+            await store.set(f"nonce:{i}", "x", 300)
+
+        clock.now += 302
+        await store.set("fresh", "x", 300)
+
+        assert len(store) == 1
+
+    async def test_overwrite_extends_expiry(self, clock):
+        store = MemoryEphemeralStore()
+        await store.set("key", "old", 5)
+        clock.now += 4
+        await store.set("key", "new", 60)
+
+        clock.now += 10
+        await store.set("other", "x", 60)
+
+        assert await store.get("key") == "new"
@@ -0,0 +1,66 @@
+"""
+Tests for the libsecp256k1 EVM address recovery fast path.
+"""
+
+import sys
+import os
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from eth_account import Account
+from eth_account.messages import encode_defunct
+
+from app.core import evm_signatures
+from app.core.wallet_auth import WalletAuthenticator
+
+pytestmark = pytest.mark.skipif(
+    not evm_signatures.FAST_ECRECOVER_AVAILABLE, reason="coincurve/pycryptodome not installed"
+)
+
+
+def sign(message, account=None):
+    account = account or Account.create()
+    signed = Account.sign_message(encode_defunct(text=message), account.key)
+    return account.address, bytes(signed.signature)
+
+
+class TestEvmSignatures:
+    """Fast path agrees with eth_account"""
+
+    def test_matches_eth_account(self):
+        for i in range(10):
+            message = f"Sign in\nNonce: {i:032x}\nÜnïcode ✓"
+            address, signature = sign(message)
+
+            recovered = evm_signatures.recover_address(
+                evm_signatures.personal_message_hash(message), signature
+            )
+
+            assert recovered == address.lower()
+            assert recovered == Account.recover_message(encode_defunct(text=message), signature=signature).lower()
+
+    def test_duplicate_submissions_hit_cache(self):
+        address, signature = sign("retry me")
+        message_hash = evm_signatures.personal_message_hash("retry me")
+        evm_signatures.recover_address.cache_clear()
+
+        evm_signatures.recover_address(message_hash, signature)
+        evm_signatures.recover_address(message_hash, signature)
+
+        assert evm_signatures.recover_address.cache_info().hits == 1
+
+    def test_rejects_bad_recovery_id(self):
+        _, signature = sign("bad v")
+
+        with pytest.raises(ValueError):
+            evm_signatures.recover_address(b"\x00" * 32, signature[:64] + bytes([5]))
+
+    def test_verify_evm_signature(self):
+        address, signature = sign("login")
+
+        assert WalletAuthenticator.verify_evm_signature("login", "0x" + signature.hex(), address)
+        assert not WalletAuthenticator.verify_evm_signature("other", signature.hex(), address)
+        assert not WalletAuthenticator.verify_evm_signature("login", "not-hex", address)
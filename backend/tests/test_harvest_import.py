@@ -0,0 +1,165 @@
+"""
+Tests for streaming harvest import parsing and chunked insertion.
+"""
+
+import sys
+import os
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.database import RequestSession
+from app.services import harvest_import
+from app.services.harvest_import import (
+    HarvestImporter, parse_harvest_row, iter_csv_rows, iter_ndjson_rows
+)
+
+
+async def stream(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+async def collect(rows):
+    return [row async for row in rows]
+
+
+class RecordingSession:
+    """Stands in for AsyncSession; records multi-row inserts"""
+
+    def __init__(self):
+        self.inserts = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.savepoints = []
+
+    async def execute(self, statement, rows):
+        if any(row.get("farm_location") == "Rejected" for row in rows):
+            raise RuntimeError("check constraint violated")
+        self.inserts.append((statement.table.name, len(rows)))
+
+    def begin_nested(self):
+        savepoint = Savepoint()
+        self.savepoints.append(savepoint)
+        return savepoint
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+    async def close(self):
+        pass
+
+
+class Savepoint:
+    rolled_back = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, *exc):
+        self.rolled_back = exc_type is not None
+        return False
+
+
+class TestHarvestImport:
+    """Row validation, stream parsing and chunking"""
+
+    def test_parse_valid_row(self):
+        values = parse_harvest_row({
+            "crop_type": "Corn",
+            "quantity": "12.5",
+            "farm_location": "Nakuru",
+            "harvest_date": "2024-06-01T00:00:00Z",
+            "organic_certified": "yes",
+        })
+
+        assert values["crop_type"].value == "corn"
+        assert values["quantity"] == 12.5
+        assert values["unit"] == "tons"
+        assert values["organic_certified"] is True
+        assert values["harvest_date"].year == 2024
+
+    @pytest.mark.parametrize("row, message", [
+        ({"crop_type": "kale", "quantity": "1", "farm_location": "x"}, "Unknown crop_type"),
+        ({"crop_type": "corn", "quantity": "-1", "farm_location": "x"}, "quantity"),
+        ({"crop_type": "corn", "quantity": "1"}, "farm_location"),
+        ({"crop_type": "corn", "quantity": "1", "farm_location": "x", "harvest_date": "June"}, "harvest_date"),
+        ({"crop_type": "corn", "quantity": "1", "farm_location": "x", "notes": "dry\x00"}, "notes must not contain NUL"),
+    ])
+    def test_parse_rejects_invalid_rows(self, row, message):
+        with pytest.raises(ValueError, match=message):
+            parse_harvest_row(row)
+
+    async def test_csv_rows_split_across_chunks(self):
+        rows = await collect(iter_csv_rows(stream(
+            b"crop_type,quantity,farm_location,notes\r\ncorn,1,Na",
+            b'kuru,"multi\nline"\nwheat,2\n',
+            b"rice,3,Eldoret,",
+        )))
+
+        assert rows[0] == (1, {"crop_type": "corn", "quantity": "1", "farm_location": "Nakuru", "notes": "multi\nline"})
+        assert rows[1][0] == 2 and isinstance(rows[1][1], ValueError)
+        assert rows[2] == (3, {"crop_type": "rice", "quantity": "3", "farm_location": "Eldoret", "notes": ""})
+
+    async def test_ndjson_rows(self):
+        rows = await collect(iter_ndjson_rows(stream(
+            b'{"crop_type": "corn"}\n\nnot json\n[1]\n'
+        )))
+
+        assert rows[0] == (1, {"crop_type": "corn"})
+        assert isinstance(rows[1][1], ValueError)
+        assert isinstance(rows[2][1], ValueError)
+
+    async def test_invalid_rows_do_not_abort_import(self):
+        db = RecordingSession()
+        importer = HarvestImporter(db, "00000000-0000-0000-0000-000000000001", chunk_size=2)
+        lines = ["crop_type,quantity,farm_location"] + [
+            "corn,1,Nakuru" if i % 3 else "corn,zero,Nakuru" for i in range(9)
+        ]
+
+        result = await importer.import_rows(iter_csv_rows(stream("\n".join(lines).encode())))
+
+        assert result.inserted == 6
+        assert [error.row for error in result.errors] == [1, 4, 7]
+        assert db.commits == 3
+        assert db.inserts[:2] == [("harvests", 2), ("hcs_outbox", 2)]
+
+    async def test_request_session_chunks_use_savepoints(self, monkeypatch):
+        notified = []
+        monkeypatch.setattr(harvest_import.hcs_outbox_worker, "notify", lambda: notified.append(True))
+        db = RecordingSession()
+        request = RequestSession(lambda: db)
+        importer = HarvestImporter(request, "00000000-0000-0000-0000-000000000001", chunk_size=2)
+        lines = ["crop_type,quantity,farm_location"] + ["corn,1,Nakuru"] * 6
+        lines[3] = "corn,1,Rejected"
+
+        result = await importer.import_rows(iter_csv_rows(stream("\n".join(lines).encode())))
+
+        assert result.inserted == 5
+        assert [error.row for error in result.errors] == [3]
+        # Chunk 2 fails, then its rows are retried one savepoint each
+        assert [savepoint.rolled_back for savepoint in db.savepoints] == [False, True, True, False, False]
+        assert db.commits == 0 and db.rollbacks == 0
+        assert notified == []
+
+        await request.finish()
+        assert db.commits == 1
+        assert len(notified) == 3
+
+    async def test_rejected_row_does_not_fail_its_chunk(self):
+        db = RecordingSession()
+        importer = HarvestImporter(db, "00000000-0000-0000-0000-000000000001", chunk_size=1000)
+        lines = ["crop_type,quantity,farm_location"] + ["corn,1,Nakuru"] * 5
+        lines[2] = "corn,1,Rejected"
+
+        result = await importer.import_rows(iter_csv_rows(stream("\n".join(lines).encode())))
+
+        assert result.inserted == 4
+        assert [(error.row, error.message) for error in result.errors] == [(2, "Database rejected this row")]
+        assert db.rollbacks == 1
+        assert db.commits == 1
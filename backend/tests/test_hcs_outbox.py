@@ -0,0 +1,50 @@
+"""
+Tests for packing outbox events into HCS topic messages.
+"""
+
+import json
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.hcs_outbox import pack_events, build_message, BATCH_MESSAGE_TYPE
+
+
+def make_event(i, padding=0):
+    return {
+        "type": "harvest_record",
+        "harvest_id": f"00000000-0000-0000-0000-{i:012d}",
+        "crop_type": "corn",
+        "quantity": 12.5,
+        "notes": "x" * padding,
+    }
+
+
+class TestPackEvents:
+    """Size-bounded batching of harvest events"""
+
+    def test_packed_messages_fit_size_limit(self):
+        events = [make_event(i) for i in range(50)]
+
+        groups = pack_events(events, max_bytes=1024)
+
+        assert 1 < len(groups) < 50
+        assert [i for group in groups for i in group] == list(range(50))
+        for group in groups:
+            message = build_message([events[i] for i in group])
+            assert len(json.dumps(message).encode("utf-8")) <= 1024
+
+    def test_oversized_event_is_sent_alone(self):
+        events = [make_event(0), make_event(1, padding=2000), make_event(2)]
+
+        groups = pack_events(events, max_bytes=1024)
+
+        assert groups == [[0], [1], [2]]
+
+    def test_single_event_keeps_original_shape(self):
+        event = make_event(0)
+
+        assert build_message([event]) == event
+        assert build_message([event, event])["type"] == BATCH_MESSAGE_TYPE
@@ -0,0 +1,77 @@
+"""
+Tests for native Hedera key parsing and signature verification.
+"""
+
+import sys
+import os
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+from cryptography.hazmat.primitives.asymmetric.utils import Prehashed, decode_dss_signature
+from eth_utils import keccak
+
+from app.core.hedera_keys import (
+    ED25519_DER_PREFIX, ECDSA_DER_PREFIX, parse_public_key, verify_signature
+)
+
+MESSAGE = b"localhost:3000 wants you to sign in with your Hedera account"
+
+
+def ed25519_pair():
+    key = ed25519.Ed25519PrivateKey.generate()
+    raw = key.public_key().public_bytes(serialization.Encoding.Raw, serialization.PublicFormat.Raw)
+    return key.sign(MESSAGE), raw
+
+
+def ecdsa_pair():
+    key = ec.generate_private_key(ec.SECP256K1())
+    der = key.sign(keccak(MESSAGE), ec.ECDSA(Prehashed(hashes.SHA256())))
+    r, s = decode_dss_signature(der)
+    raw_signature = r.to_bytes(32, "big") + s.to_bytes(32, "big")
+    compressed = key.public_key().public_bytes(
+        serialization.Encoding.X962, serialization.PublicFormat.CompressedPoint
+    )
+    return raw_signature, compressed
+
+
+class TestHederaKeys:
+    """ED25519 and ECDSA(secp256k1) verification without the SDK"""
+
+    @pytest.mark.parametrize("encode", [
+        lambda raw: raw.hex(),
+        lambda raw: (ED25519_DER_PREFIX + raw).hex(),
+    ])
+    def test_ed25519(self, encode):
+        signature, raw = ed25519_pair()
+
+        assert verify_signature(encode(raw), MESSAGE, signature)
+        assert not verify_signature(encode(raw), b"tampered", signature)
+
+    @pytest.mark.parametrize("encode", [
+        lambda raw: raw.hex(),
+        lambda raw: "0x" + raw.hex(),
+        lambda raw: (ECDSA_DER_PREFIX + raw).hex(),
+    ])
+    def test_ecdsa_secp256k1(self, encode):
+        signature, compressed = ecdsa_pair()
+
+        assert verify_signature(encode(compressed), MESSAGE, signature)
+        assert not verify_signature(encode(compressed), b"tampered", signature)
+
+    def test_parsed_keys_are_cached(self):
+        _, raw = ed25519_pair()
+        parse_public_key.cache_clear()
+
+        parse_public_key(raw.hex())
+        parse_public_key(raw.hex())
+
+        assert parse_public_key.cache_info().hits == 1
+
+    def test_rejects_unknown_encoding(self):
+        with pytest.raises(ValueError):
+            parse_public_key("abcd")
@@ -0,0 +1,92 @@
+"""
+Tests for the generated row and model mappers.
+"""
+
+import sys
+import os
+import uuid
+from datetime import datetime, timezone
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.graphql.mappers import model_mapper, plain_fields, row_mapper
+from app.graphql.types import Harvest, Loan, User, user_from_model
+from app.models.harvest import Harvest as HarvestModel
+from app.models.user import User as UserModel, UserRole
+
+
+def make_user() -> UserModel:
+    return UserModel(
+        id=uuid.uuid4(),
+        email="farmer@example.com",
+        full_name="Amina Njeri",
+        role=UserRole.FARMER,
+        hedera_account_id="0.0.4242",
+        wallet_type="HASHPACK",
+        phone=None,
+        address="Nakuru",
+        farm_name="Green Acres",
+        company_name=None,
+        is_active=True,
+        is_verified=False,
+        email_verified=True,
+        registration_complete=True,
+        created_at=datetime(2024, 5, 1, tzinfo=timezone.utc),
+        updated_at=None,
+    )
+
+
+class TestModelMapper:
+    def test_copies_every_constructor_field(self):
+        user = make_user()
+
+        node = user_from_model(user)
+
+        assert isinstance(node, User)
+        for field in plain_fields(User):
+            assert getattr(node, field) == getattr(user, field)
+
+    def test_resolver_fields_are_not_constructor_arguments(self):
+        assert "wallet_address" not in plain_fields(User)
+        assert "farmer" not in plain_fields(Harvest)
+        assert "borrower" not in plain_fields(Loan)
+
+    def test_is_cached(self):
+        assert model_mapper(User) is model_mapper(User)
+        assert user_from_model is model_mapper(User)
+
+
+class TestRowMapper:
+    def test_reads_by_position(self):
+        harvest_id = uuid.uuid4()
+        created_at = datetime(2024, 6, 1, tzinfo=timezone.utc)
+
+        node = row_mapper(Harvest, ("created_at", "id", "quantity"))((created_at, harvest_id, 12.5))
+
+        assert node.id == harvest_id
+        assert node.created_at == created_at
+        assert node.quantity == 12.5
+        assert node.notes is None
+        assert node.crop_type is None
+
+    def test_ignores_columns_that_are_not_fields(self):
+        node = row_mapper(Harvest, ("id", "extra_data"))((1, {"wide": "blob"}))
+
+        assert node.id == 1
+        assert not hasattr(node, "extra_data")
+
+    def test_matches_model_mapper_for_full_rows(self):
+        harvest = HarvestModel(
+            id=uuid.uuid4(), farmer_id=uuid.uuid4(), crop_type="corn", quantity=3.0,
+            unit="tons", farm_location="Eldoret", organic_certified=False, status="harvested",
+            created_at=datetime(2024, 6, 1, tzinfo=timezone.utc)
+        )
+        keys = tuple(plain_fields(Harvest))
+        row = tuple(getattr(harvest, key) for key in keys)
+
+        assert row_mapper(Harvest, keys)(row) == model_mapper(Harvest)(harvest)
+
+    def test_is_cached_per_shape(self):
+        assert row_mapper(Harvest, ("id", "created_at")) is row_mapper(Harvest, ("id", "created_at"))
+        assert row_mapper(Harvest, ("id", "created_at")) is not row_mapper(Harvest, ("created_at", "id"))
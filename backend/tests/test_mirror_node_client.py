@@ -0,0 +1,67 @@
+"""
+Tests for the pooled Hedera mirror node client.
+
+Runs against the local mirror node stub server from conftest.py.
+"""
+
+import asyncio
+import sys
+import os
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.config import settings
+
+from app.core.hedera import HederaClient
+
+
+@pytest.fixture
+async def hedera(mirror_node_stub):
+    url, stats = mirror_node_stub
+    stats.reset()
+    client = HederaClient()
+    client.mirror = HederaClient._create_mirror_client(url)
+    yield client, stats
+    await client.close()
+
+
+class TestMirrorNodeClient:
+    """Pooled mirror node queries"""
+
+    async def test_topic_messages(self, hedera):
+        client, stats = hedera
+
+        data = await client.get_topic_messages("0.0.5005", limit=3)
+
+        assert len(data["messages"]) == 3
+        assert stats.requests == 1
+
+    async def test_retries_server_errors(self, hedera):
+        client, stats = hedera
+        stats.reset(fail_next=2)
+
+        data = await client.get_token_info("0.0.7007")
+
+        assert data["symbol"] == "STB"
+        assert stats.requests == 3
+
+    async def test_client_errors_are_not_retried(self, hedera):
+        client, stats = hedera
+
+        assert await client.get_token_info("0.0.404") is None
+        assert stats.requests == 1
+
+    async def test_concurrent_queries_reuse_pool(self, hedera):
+        client, stats = hedera
+        stats.reset(latency=0.05)
+
+        results = await asyncio.gather(*[
+            client.get_token_info(f"0.0.{i}") for i in range(100)
+        ])
+
+        assert all(results)
+        assert stats.max_in_flight > 1
+        assert stats.max_in_flight <= settings.MIRROR_NODE_MAX_CONNECTIONS
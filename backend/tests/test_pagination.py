@@ -0,0 +1,96 @@
+"""
+Tests for Relay-style cursor pagination helpers.
+"""
+
+import uuid
+import sys
+import os
+from datetime import datetime, timezone, timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.graphql.pagination import encode_cursor, decode_cursor, paginate
+from app.models.harvest import Harvest as HarvestModel
+
+
+class FakeScalarResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+
+class FakeSession:
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+
+    async def scalars(self, statement):
+        self.statements.append(statement)
+        limit = statement._limit_clause.value
+        return FakeScalarResult(self.rows[:limit])
+
+
+def make_rows(count):
+    now = datetime.now(timezone.utc)
+    return [
+        SimpleNamespace(id=uuid.uuid4(), created_at=now - timedelta(minutes=i))
+        for i in range(count)
+    ]
+
+
+class TestCursorEncoding:
+    """Cursor round-tripping"""
+
+    def test_round_trip(self):
+        created_at = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+        row_id = uuid.uuid4()
+
+        assert decode_cursor(encode_cursor(created_at, row_id)) == (created_at, row_id)
+
+    def test_invalid_cursor_rejected(self):
+        with pytest.raises(HTTPException):
+            decode_cursor("not-a-cursor")
+
+
+class TestPaginate:
+    """Page assembly"""
+
+    async def test_first_page_reports_next_page(self):
+        rows = make_rows(5)
+        db = FakeSession(rows)
+
+        page = await paginate(db, select(HarvestModel), HarvestModel, lambda r: r, first=3)
+
+        assert [edge.node for edge in page.edges] == rows[:3]
+        assert page.page_info.has_next_page is True
+        assert page.page_info.has_previous_page is False
+        assert page.page_info.end_cursor == encode_cursor(rows[2].created_at, rows[2].id)
+
+    async def test_last_page_and_keyset_filter(self):
+        rows = make_rows(2)
+        db = FakeSession(rows)
+        after = encode_cursor(rows[0].created_at, uuid.uuid4())
+
+        page = await paginate(db, select(HarvestModel), HarvestModel, lambda r: r, first=3, after=after)
+
+        assert page.page_info.has_next_page is False
+        assert page.page_info.has_previous_page is True
+        sql = str(db.statements[0].compile(dialect=postgresql.dialect()))
+        assert "(harvests.created_at, harvests.id) <" in sql
+        assert "ORDER BY harvests.created_at DESC, harvests.id DESC" in sql
+
+    async def test_page_size_is_capped(self):
+        db = FakeSession(make_rows(3))
+
+        await paginate(db, select(HarvestModel), HarvestModel, lambda r: r, first=10_000)
+
+        assert db.statements[0]._limit_clause.value == 101
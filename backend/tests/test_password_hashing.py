@@ -0,0 +1,135 @@
+"""
+Tests for the bounded bcrypt executor.
+"""
+
+import asyncio
+import sys
+import os
+import time
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from starlette.responses import Response
+
+from app.core import password_hashing
+from app.core.database import begin_request
+from app.core.password_hashing import PasswordHasher, PasswordHashingBusy
+from app.graphql.schema import schema
+from app.models.user import User
+
+
+def slow_hash(password):
+    time.sleep(0.1)
+    return f"hashed:{password}"
+
+
+def slow_verify(password, hashed):
+    time.sleep(0.1)
+    return hashed == f"hashed:{password}"
+
+
+@pytest.fixture
+def hasher():
+    hasher = PasswordHasher(max_workers=2, max_queue=2, hash_func=slow_hash, verify_func=slow_verify)
+    yield hasher
+    hasher.close()
+
+
+class TestPasswordHasher:
+    """Offloading, admission control and latency stats"""
+
+    async def test_hash_and_verify(self, hasher):
+        hashed = await hasher.hash("secret")
+
+        assert await hasher.verify("secret", hashed) is True
+        assert await hasher.verify("wrong", hashed) is False
+        assert hasher.stats()["completed"] == 3
+
+    async def test_event_loop_stays_responsive(self, hasher):
+        task = asyncio.create_task(hasher.hash("secret"))
+        await asyncio.sleep(0.01)
+
+        # Run inline, the hash would have finished before the loop got back here
+        assert not task.done()
+        await task
+
+    async def test_rejects_when_saturated(self, hasher):
+        results = await asyncio.gather(
+            *[hasher.hash(str(i)) for i in range(6)], return_exceptions=True
+        )
+
+        rejected = [r for r in results if isinstance(r, PasswordHashingBusy)]
+        assert len(rejected) == 2
+        assert rejected[0].status_code == 429
+        assert hasher.stats()["rejected"] == 2
+        assert hasher.stats()["in_flight"] == 0
+
+    async def test_latency_includes_queue_wait(self, hasher):
+        await asyncio.gather(*[hasher.hash(str(i)) for i in range(4)])
+
+        latency = hasher.stats()["latency_ms"]
+        assert latency["p50"] >= 100
+        assert latency["p99"] >= 190
+
+
+class FakeSession:
+    def __init__(self, user):
+        self.user = user
+
+    async def scalar(self, statement):
+        return self.user
+
+    async def rollback(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+class FakeContext:
+    def __init__(self):
+        self.response = Response()
+
+
+async def busy(*args):
+    raise PasswordHashingBusy()
+
+
+class TestBusyGraphQLMutations:
+    async def _execute(self, query, user, monkeypatch):
+        monkeypatch.setattr(password_hashing.password_hasher, "hash", busy)
+        monkeypatch.setattr(password_hashing.password_hasher, "verify", busy)
+        begin_request(lambda: FakeSession(user))
+        context = FakeContext()
+
+        result = await schema.execute(query, context_value=context)
+
+        assert len(result.errors) == 1
+        return result.errors[0], context.response
+
+    async def test_login_is_rate_limited(self, monkeypatch):
+        user = User(email="farmer@example.com", hashed_password="hashed:secret")
+        error, response = await self._execute(
+            'mutation { login(loginInput: {email: "farmer@example.com", password: "secret"}) { success } }',
+            user, monkeypatch
+        )
+
+        assert error.extensions["code"] == "RATE_LIMITED"
+        assert error.extensions["status"] == 429
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "1"
+
+    async def test_register_is_rate_limited(self, monkeypatch):
+        error, response = await self._execute(
+            """mutation {
+                register(userInput: {email: "new@example.com", password: "secret",
+                                     fullName: "New Farmer", role: FARMER}) { success }
+            }""",
+            None, monkeypatch
+        )
+
+        assert error.extensions["code"] == "RATE_LIMITED"
+        assert response.status_code == 429
@@ -0,0 +1,140 @@
+"""
+Tests for column projection from the GraphQL selection set.
+"""
+
+import sys
+import os
+import uuid
+from datetime import datetime, timezone
+
+import strawberry
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.graphql.pagination import Connection, PageInfo, paginate
+from app.graphql.mappers import row_mapper
+from app.graphql.projection import selected_columns
+from app.graphql.types import Harvest, User
+from app.models.harvest import Harvest as HarvestModel
+from app.models.user import User as UserModel
+
+captured = {}
+
+
+@strawberry.type
+class SampleQuery:
+    @strawberry.field
+    def harvests(self, info) -> Connection[Harvest]:
+        captured["harvests"] = selected_columns(info, HarvestModel, Harvest)
+        return Connection(edges=[], page_info=PageInfo(has_next_page=False, has_previous_page=False))
+
+    @strawberry.field
+    def users(self, info) -> Connection[User]:
+        captured["users"] = selected_columns(info, UserModel, User)
+        return Connection(edges=[], page_info=PageInfo(has_next_page=False, has_previous_page=False))
+
+
+sample_schema = strawberry.Schema(query=SampleQuery)
+
+
+def column_names(columns):
+    return [column.key for column in columns]
+
+
+class FakeRow(tuple):
+    """Tuple with attribute access, like a Core Row"""
+
+    def __new__(cls, **values):
+        row = super().__new__(cls, values.values())
+        row.__dict__.update(values)
+        return row
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+class FakeSession:
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return FakeResult(self.rows)
+
+
+class TestSelectedColumns:
+    def test_only_selected_columns_plus_cursor_columns(self):
+        result = sample_schema.execute_sync("{ harvests { edges { node { status quantity } } } }")
+
+        assert result.errors is None
+        assert column_names(captured["harvests"]) == ["id", "created_at", "status", "quantity"]
+
+    def test_page_info_only_reads_cursor_columns(self):
+        sample_schema.execute_sync("{ harvests { pageInfo { hasNextPage endCursor } } }")
+
+        assert column_names(captured["harvests"]) == ["id", "created_at"]
+
+    def test_fragments_and_camel_case(self):
+        sample_schema.execute_sync("""
+            query {
+                harvests {
+                    edges {
+                        node {
+                            ...HarvestFields
+                            ... on Harvest { farmLocation }
+                        }
+                    }
+                }
+            }
+            fragment HarvestFields on Harvest { cropType moistureContent }
+        """)
+
+        assert set(column_names(captured["harvests"])) == {
+            "id", "created_at", "crop_type", "moisture_content", "farm_location"
+        }
+
+    def test_relationship_and_alias_fields(self):
+        sample_schema.execute_sync("{ harvests { edges { node { farmer { id } } } } }")
+        assert "farmer_id" in column_names(captured["harvests"])
+
+        sample_schema.execute_sync("{ users { edges { node { walletAddress isEmailVerified fullName } } } }")
+        assert set(column_names(captured["users"])) == {
+            "id", "created_at", "hedera_account_id", "email_verified", "full_name"
+        }
+
+
+class TestProjectedPagination:
+    async def test_reads_only_projected_columns(self):
+        created_at = datetime.now(timezone.utc)
+        row = FakeRow(id=uuid.uuid4(), created_at=created_at, status="planted")
+        db = FakeSession([row])
+        columns = [HarvestModel.id, HarvestModel.created_at, HarvestModel.status]
+
+        convert = row_mapper(Harvest, ("id", "created_at", "status"))
+
+        page = await paginate(db, select(HarvestModel), HarvestModel, convert, columns=columns)
+
+        sql = str(db.statements[0].compile(dialect=postgresql.dialect()))
+        assert "harvests.status" in sql
+        assert "notes" not in sql
+        assert "extra_data" not in sql
+        node = page.edges[0].node
+        assert isinstance(node, Harvest)
+        assert node.status == "planted"
+        assert node.notes is None
+
+    def test_row_mapped_user_keeps_resolver_fields_working(self):
+        convert = row_mapper(User, ("id", "hedera_account_id"))
+        user = convert(FakeRow(id=uuid.uuid4(), hedera_account_id="0.0.42"))
+
+        assert user.wallet_address() == "0.0.42"
+        assert user.email is None
@@ -0,0 +1,76 @@
+"""
+Tests for the single-round-trip Redis nonce and OTP flows.
+"""
+
+import sys
+import os
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import fakeredis
+
+from app.core.redis_client import redis_client
+from app.services.otp_service import OTPService
+
+
+@pytest.fixture
+async def redis():
+    previous = redis_client.redis, redis_client.scripts
+    connection = fakeredis.FakeAsyncRedis(decode_responses=True)
+    redis_client.attach(connection)
+    await redis_client.preload_scripts()
+    yield connection
+    await connection.aclose()
+    redis_client.redis, redis_client.scripts = previous
+
+
+class TestRedisScripts:
+    """Atomic nonce consumption and OTP verification"""
+
+    async def test_nonce_is_single_use(self, redis):
+        await redis_client.set_nonce("abc", "0xaddress")
+
+        assert await redis_client.get_nonce("abc") == "0xaddress"
+        assert await redis_client.get_nonce("abc") is None
+
+    async def test_otp_valid(self, redis):
+        await OTPService.store_otp("a@example.com", "123456")
+
+        assert await OTPService.verify_otp("a@example.com", "123456") == (True, "OTP verified successfully")
+        # Consumed together with its attempt counter
+        assert await redis.exists("otp:verification:a@example.com", "otp_attempts:verification:a@example.com") == 0
+
+    async def test_otp_mismatch_then_lockout(self, redis):
+        await OTPService.store_otp("a@example.com", "123456")
+
+        for remaining in range(OTPService.MAX_ATTEMPTS - 1, -1, -1):
+            is_valid, message = await OTPService.verify_otp("a@example.com", "000000")
+            assert not is_valid
+            assert f"{remaining} attempts remaining" in message
+
+        is_valid, message = await OTPService.verify_otp("a@example.com", "123456")
+        assert not is_valid
+        assert "Maximum verification attempts" in message
+        assert not await redis.exists("otp:verification:a@example.com")
+
+    async def test_otp_missing(self, redis):
+        is_valid, message = await OTPService.verify_otp("nobody@example.com", "123456")
+
+        assert not is_valid
+        assert "expired or not found" in message
+
+    async def test_pending_email_stored_with_otp(self, redis):
+        await OTPService.store_otp("a@example.com", "123456", pending_user_id="user-1")
+
+        assert await redis.get("pending_email:user-1") == "a@example.com"
+
+    async def test_consume_verified_email(self, redis):
+        token = await OTPService.store_verified_email("a@example.com")
+
+        assert token
+        assert await OTPService.consume_verified_email("a@example.com") is True
+        assert await OTPService.consume_verified_email("a@example.com") is False
+        assert not await redis.exists(f"verified_email:{token}")
@@ -0,0 +1,211 @@
+"""
+Tests for rotating refresh tokens and family revocation.
+"""
+
+import sys
+import os
+import uuid
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core import ephemeral_store as store_module
+from app.core import refresh_tokens as refresh_module
+from app.core.database import begin_request
+from app.core.ephemeral_store import MemoryEphemeralStore, ephemeral_store
+from app.core.refresh_tokens import RefreshTokens
+from app.core.user_cache import user_cache
+from app.graphql.schema import schema
+from app.models.user import User
+
+CLAIMS = {"sub": "6f1c2f9e-0000-4000-8000-000000000001", "hedera_account_id": "0.0.1234"}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def store():
+    previous = ephemeral_store.backend
+    ephemeral_store.use(MemoryEphemeralStore())
+    yield ephemeral_store
+    ephemeral_store.use(previous)
+
+
+@pytest.fixture
+def tokens(store):
+    return RefreshTokens(ttl_seconds=3600)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(store_module.time, "monotonic", clock)
+    monkeypatch.setattr(refresh_module.time, "time", clock)
+    return clock
+
+
+class FakeRequestSession:
+    def __init__(self):
+        self.callbacks = []
+
+    def after_commit(self, callback):
+        self.callbacks.append(callback)
+
+
+class TestRefreshTokens:
+    async def test_rotate_returns_claims_and_successor(self, tokens):
+        token = await tokens.issue(CLAIMS)
+
+        successor, claims = await tokens.rotate(token)
+
+        assert claims == CLAIMS
+        assert successor != token
+        assert successor.split(".")[0] == token.split(".")[0]
+
+    async def test_successor_can_be_rotated(self, tokens):
+        token = await tokens.issue(CLAIMS)
+        successor, _ = await tokens.rotate(token)
+
+        rotated = await tokens.rotate(successor)
+
+        assert rotated is not None
+        assert rotated[1] == CLAIMS
+
+    async def test_reuse_revokes_family(self, tokens):
+        token = await tokens.issue(CLAIMS)
+        successor, _ = await tokens.rotate(token)
+
+        assert await tokens.rotate(token) is None
+        # The legitimate holder's successor is revoked too
+        assert await tokens.rotate(successor) is None
+
+    async def test_reuse_leaves_other_families_alone(self, tokens):
+        token = await tokens.issue(CLAIMS)
+        other = await tokens.issue(CLAIMS)
+        await tokens.rotate(token)
+
+        assert await tokens.rotate(token) is None
+        assert await tokens.rotate(other) is not None
+
+    async def test_rejects_malformed_and_unknown_tokens(self, tokens):
+        assert await tokens.rotate("") is None
+        assert await tokens.rotate("no-separator") is None
+        assert await tokens.rotate("family.secret") is None
+
+    async def test_rejects_token_with_forged_family(self, tokens):
+        token = await tokens.issue(CLAIMS)
+        other = await tokens.issue(CLAIMS)
+        forged = other.split(".")[0] + "." + token.split(".")[1]
+
+        assert await tokens.rotate(forged) is None
+
+    async def test_tokens_expire(self, tokens, clock):
+        token = await tokens.issue(CLAIMS)
+
+        clock.now += 3601
+
+        assert await tokens.rotate(token) is None
+
+    async def test_rotation_keeps_family_expiry(self, tokens, clock):
+        token = await tokens.issue(CLAIMS)
+        clock.now += 3000
+        successor, _ = await tokens.rotate(token)
+
+        clock.now += 700
+
+        assert await tokens.rotate(successor) is None
+
+    async def test_after_commit_token_is_stored_on_commit(self, tokens):
+        db = FakeRequestSession()
+        token = tokens.issue_after_commit(db, CLAIMS)
+
+        assert await tokens.rotate(token) is None
+        await db.callbacks[0]()
+        assert (await tokens.rotate(token))[1] == CLAIMS
+
+    async def test_after_commit_token_is_never_stored_on_rollback(self, tokens):
+        db = FakeRequestSession()
+        token = tokens.issue_after_commit(db, CLAIMS)
+        other = tokens.issue_after_commit(db, CLAIMS)
+
+        assert token is not None
+        assert token.split(".")[0] != other.split(".")[0]
+        assert await tokens.rotate(token) is None
+
+    async def test_explicit_family_revocation(self, tokens):
+        token = await tokens.issue(CLAIMS)
+
+        await tokens.revoke_family(token.split(".")[0])
+
+        assert await tokens.rotate(token) is None
+
+    async def test_issue_without_store(self, tokens, store):
+        store.use(type("Down", (), {"available": False})())
+
+        assert await tokens.issue(CLAIMS) is None
+
+
+class FakeSession:
+    def __init__(self, user):
+        self.user = user
+
+    async def scalar(self, statement):
+        return self.user
+
+    async def commit(self):
+        pass
+
+    async def rollback(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+class TestRefreshAccessTokenMutation:
+    QUERY = 'mutation($token: String!) { refreshAccessToken(refreshToken: $token) { success refreshToken } }'
+
+    async def _refresh(self, token, user):
+        begin_request(lambda: FakeSession(user))
+        result = await schema.execute(self.QUERY, variable_values={"token": token})
+        assert result.errors is None
+        return result.data["refreshAccessToken"]
+
+    @pytest.fixture(autouse=True)
+    def global_tokens(self, store):
+        user_cache.clear()
+        yield refresh_module.refresh_tokens
+        user_cache.clear()
+
+    async def test_active_user_gets_new_tokens(self, global_tokens):
+        user = User(id=uuid.uuid4(), hedera_account_id="0.0.1234", is_active=True)
+        token = await global_tokens.issue({"sub": str(user.id)})
+
+        data = await self._refresh(token, user)
+
+        assert data["success"]
+        assert data["refreshToken"] not in (None, token)
+
+    async def test_inactive_user_is_rejected_and_family_revoked(self, global_tokens):
+        user = User(id=uuid.uuid4(), hedera_account_id="0.0.1234", is_active=False)
+        token = await global_tokens.issue({"sub": str(user.id)})
+
+        data = await self._refresh(token, user)
+
+        assert not data["success"]
+        assert await ephemeral_store.get(f"refresh_family:{token.split('.')[0]}") is None
+
+    async def test_missing_user_is_rejected(self, global_tokens):
+        token = await global_tokens.issue({"sub": str(uuid.uuid4())})
+
+        data = await self._refresh(token, None)
+
+        assert not data["success"]
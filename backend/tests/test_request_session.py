@@ -0,0 +1,194 @@
+"""
+Tests for the request-scoped unit-of-work session.
+"""
+
+import sys
+import os
+import asyncio
+
+import pytest
+import strawberry
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core import database
+from app.core.database import RequestSession, begin_request, request_session
+from app.graphql.schema import UnitOfWork
+
+
+class FakeSession:
+    """Records calls and detects overlapping statements"""
+
+    def __init__(self):
+        self.calls = []
+        self.running = 0
+        self.overlapped = False
+
+    async def execute(self, statement):
+        self.running += 1
+        self.overlapped = self.overlapped or self.running > 1
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        self.calls.append(("execute", statement))
+        return statement
+
+    def add(self, instance):
+        self.calls.append(("add", instance))
+
+    async def commit(self):
+        self.calls.append(("commit",))
+
+    async def rollback(self):
+        self.calls.append(("rollback",))
+
+    async def close(self):
+        self.calls.append(("close",))
+
+
+class Factory:
+    def __init__(self):
+        self.sessions = []
+
+    def __call__(self):
+        session = FakeSession()
+        self.sessions.append(session)
+        return session
+
+
+@pytest.fixture
+def factory():
+    return Factory()
+
+
+class TestRequestSession:
+    async def test_session_is_created_on_first_use(self, factory):
+        request = RequestSession(factory)
+        assert not request.checked_out
+
+        await request.finish()
+
+        assert factory.sessions == []
+
+    async def test_commits_once_and_closes(self, factory):
+        request = RequestSession(factory)
+        request.add("row")
+        await request.execute("SELECT 1")
+
+        await request.finish()
+
+        assert len(factory.sessions) == 1
+        assert [call[0] for call in factory.sessions[0].calls] == ["add", "execute", "commit", "close"]
+        assert not request.checked_out
+
+    async def test_rolls_back_on_failure(self, factory):
+        request = RequestSession(factory)
+        await request.execute("SELECT 1")
+
+        await request.finish(failed=True)
+
+        assert [call[0] for call in factory.sessions[0].calls] == ["execute", "rollback", "close"]
+
+    async def test_after_commit_callbacks(self, factory):
+        request = RequestSession(factory)
+        ran = []
+
+        async def invalidate():
+            ran.append("async")
+
+        request.after_commit(lambda: ran.append("sync"))
+        request.after_commit(invalidate)
+        assert ran == []
+
+        await request.finish()
+
+        assert ran == ["sync", "async"]
+
+    async def test_after_commit_skipped_on_rollback(self, factory):
+        request = RequestSession(factory)
+        ran = []
+        request.after_commit(lambda: ran.append("notify"))
+
+        await request.finish(failed=True)
+
+        assert ran == []
+
+    async def test_concurrent_statements_are_serialized(self, factory):
+        request = RequestSession(factory)
+
+        await asyncio.gather(*(request.execute(f"SELECT {i}") for i in range(5)))
+
+        assert len(factory.sessions) == 1
+        assert not factory.sessions[0].overlapped
+        assert len(factory.sessions[0].calls) == 5
+
+    async def test_finish_is_idempotent(self, factory):
+        request = RequestSession(factory)
+        await request.execute("SELECT 1")
+
+        await request.finish()
+        await request.finish(failed=True)
+
+        assert [call[0] for call in factory.sessions[0].calls] == ["execute", "commit", "close"]
+
+
+class TestRequestScope:
+    async def test_request_session_requires_a_request(self):
+        database._request_session.set(None)
+
+        with pytest.raises(RuntimeError):
+            request_session()
+
+    async def test_shared_by_child_tasks(self, factory):
+        request = begin_request(factory)
+
+        async def resolver():
+            return request_session()
+
+        seen = await asyncio.gather(resolver(), resolver(), resolver())
+
+        assert all(item is request for item in seen)
+
+
+@strawberry.type
+class SampleQuery:
+    @strawberry.field
+    async def first(self) -> int:
+        await request_session().execute("SELECT 1")
+        return 1
+
+    @strawberry.field
+    async def second(self) -> int:
+        await request_session().execute("SELECT 2")
+        return 2
+
+    @strawberry.field
+    async def broken(self) -> int:
+        await request_session().execute("SELECT 3")
+        raise ValueError("boom")
+
+
+sample_schema = strawberry.Schema(query=SampleQuery, extensions=[UnitOfWork])
+
+
+class TestUnitOfWorkExtension:
+    async def test_fields_share_one_session_and_commit_once(self, factory):
+        begin_request(factory)
+
+        result = await sample_schema.execute("{ first second }")
+
+        assert result.errors is None
+        assert len(factory.sessions) == 1
+        kinds = [call[0] for call in factory.sessions[0].calls]
+        assert kinds == ["execute", "execute", "commit", "close"]
+        assert not factory.sessions[0].overlapped
+
+    async def test_errors_roll_back(self, factory):
+        begin_request(factory)
+
+        result = await sample_schema.execute("{ first broken }")
+
+        assert result.errors
+        kinds = [call[0] for call in factory.sessions[0].calls]
+        assert kinds[-2:] == ["rollback", "close"]
+        assert "commit" not in kinds
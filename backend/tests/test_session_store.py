@@ -0,0 +1,302 @@
+"""
+Tests for the write-behind wallet session store.
+"""
+
+import asyncio
+import sys
+import os
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.database import RequestSession
+from app.core.ephemeral_store import MemoryEphemeralStore, ephemeral_store
+from app.services.session_store import SessionStore
+
+
+class RecordingSession:
+    """Stands in for AsyncSession; records statements and can fail commits"""
+
+    def __init__(self, session=None, fail=False, poisoned=()):
+        self.session = session
+        self.fail = fail
+        self.poisoned = set(poisoned)
+        self.executed = []
+        self.queries = 0
+        self.savepoints = 0
+
+    async def scalar(self, statement):
+        self.queries += 1
+        return self.session
+
+    async def execute(self, statement, rows=None):
+        if rows is None:
+            # Locked read of existing behavior patterns
+            self.queries += 1
+            return SimpleNamespace(all=lambda: [])
+        if any(row.get("id") in self.poisoned for row in rows):
+            raise IntegrityError(str(statement), rows, Exception("duplicate key value"))
+        self.executed.append((statement.table.name, type(statement).__name__, rows))
+
+    def begin_nested(self):
+        self.savepoints += 1
+        return Savepoint()
+
+    async def commit(self):
+        if self.fail:
+            raise RuntimeError("database down")
+
+    async def rollback(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+class SlowSession(RecordingSession):
+    """Holds every write for `delay` seconds"""
+
+    def __init__(self, delay):
+        super().__init__()
+        self.delay = delay
+        self.writing = asyncio.Event()
+
+    async def execute(self, statement, rows=None):
+        self.writing.set()
+        await asyncio.sleep(self.delay)
+        return await super().execute(statement, rows)
+
+
+class Savepoint:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+@pytest.fixture
+def memory_store():
+    previous = ephemeral_store.backend
+    ephemeral_store.use(MemoryEphemeralStore())
+    yield
+    ephemeral_store.use(previous)
+
+
+def make_store(db, idle_close_seconds=1800, max_attempts=12):
+    return SessionStore(
+        flush_interval=60, idle_close_seconds=idle_close_seconds,
+        max_attempts=max_attempts, session_factory=lambda: db
+    )
+
+
+class TestSessionStore:
+    """Hot path without Postgres, batched write-behind"""
+
+    async def test_create_and_lookup_skip_postgres(self, memory_store):
+        db = RecordingSession()
+        store = make_store(db)
+        user_id, wallet_id = uuid.uuid4(), uuid.uuid4()
+
+        token = await store.create(db, {"user_id": user_id, "current_wallet_id": wallet_id})
+
+        assert await store.lookup(db, token) == user_id
+        assert await store.lookup(db, token) == user_id
+        assert await store.latest_token_for_wallet(db, wallet_id) == token
+        assert db.queries == 0 and db.executed == []
+
+    async def test_flush_batches_inserts_and_coalesces_touches(self, memory_store):
+        db = RecordingSession()
+        store = make_store(db)
+        tokens = [await store.create(db, {"user_id": uuid.uuid4()}) for _ in range(3)]
+
+        assert await store.flush() == 3
+        for _ in range(5):
+            for token in tokens:
+                await store.lookup(db, token)
+
+        assert await store.flush() == 3
+        assert [(table, kind, len(rows)) for table, kind, rows in db.executed] == [
+            ("user_sessions", "Insert", 3),
+            ("user_sessions", "Update", 3),
+        ]
+        assert await store.flush() == 0
+
+    async def test_touch_before_flush_updates_pending_insert(self, memory_store):
+        db = RecordingSession()
+        store = make_store(db)
+        token = await store.create(db, {"user_id": uuid.uuid4()})
+
+        await store.lookup(db, token)
+        await store.flush()
+
+        assert len(db.executed) == 1
+        assert db.executed[0][1] == "Insert"
+
+    async def test_failed_flush_requeues(self, memory_store):
+        db = RecordingSession(fail=True)
+        store = make_store(db)
+        await store.create(db, {"user_id": uuid.uuid4()})
+
+        with pytest.raises(RuntimeError):
+            await store.flush()
+
+        assert store.pending == 1
+
+    async def test_failed_flushes_give_up_after_max_attempts(self, memory_store):
+        db = RecordingSession(fail=True)
+        store = make_store(db, max_attempts=3)
+        await store.create(db, {"user_id": uuid.uuid4()})
+
+        for _ in range(3):
+            with pytest.raises(RuntimeError):
+                await store.flush()
+
+        assert store.pending == 0
+        assert store._attempts == {}
+
+    async def test_poisoned_row_is_dropped_and_rest_written(self, memory_store):
+        db = RecordingSession()
+        store = make_store(db)
+        for _ in range(3):
+            await store.create(db, {"user_id": uuid.uuid4()})
+        poisoned = next(iter(store._pending_inserts))
+        db.poisoned.add(poisoned)
+
+        assert await store.flush() == 2
+
+        written = [rows[0]["id"] for table, kind, rows in db.executed if table == "user_sessions"]
+        assert len(written) == 2 and poisoned not in written
+        assert db.savepoints == 3
+        assert store.pending == 0
+
+        # Later flushes are not held back by the dropped row
+        token = await store.create(db, {"user_id": uuid.uuid4()})
+        await store.lookup(db, token)
+        assert await store.flush() == 1
+
+    async def test_request_session_create_waits_for_commit(self, memory_store):
+        db = RecordingSession()
+        store = make_store(db)
+        request = RequestSession(lambda: db)
+        wallet_id = uuid.uuid4()
+
+        token = await store.create(request, {"user_id": uuid.uuid4(), "current_wallet_id": wallet_id})
+        assert store.pending == 0
+
+        await request.finish()
+
+        assert store.pending == 1
+        assert await store.latest_token_for_wallet(db, wallet_id) == token
+
+    async def test_rolled_back_request_leaves_no_session(self, memory_store):
+        db = RecordingSession()
+        store = make_store(db)
+        request = RequestSession(lambda: db)
+        wallet_id = uuid.uuid4()
+
+        token = await store.create(request, {"user_id": uuid.uuid4(), "current_wallet_id": wallet_id})
+        await request.finish(failed=True)
+
+        assert store.pending == 0
+        assert store._open == {}
+        assert await ephemeral_store.get(f"session:{token}") is None
+        assert await ephemeral_store.get(f"session_wallet:{wallet_id}") is None
+        assert await store.flush() == 0
+
+    async def test_cancelled_flush_requeues_batch(self, memory_store):
+        db = SlowSession(delay=10)
+        store = make_store(db)
+        await store.create(db, {"user_id": uuid.uuid4()})
+
+        task = asyncio.create_task(store.flush())
+        await db.writing.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert store.pending == 1
+        assert store._attempts == {}
+        db.delay = 0
+        assert await store.flush() == 1
+
+    async def test_stop_lets_running_flush_finish(self, memory_store):
+        db = SlowSession(delay=0.05)
+        store = SessionStore(flush_interval=0.01, session_factory=lambda: db)
+        await store.create(db, {"user_id": uuid.uuid4()})
+        db.writing.clear()
+        store.start()
+
+        await db.writing.wait()
+        await store.stop()
+
+        assert store.pending == 0
+        assert [kind for _, kind, _ in db.executed] == ["Insert"]
+
+    async def test_lookup_miss_falls_back_to_table(self, memory_store):
+        session = SimpleNamespace(
+            id=uuid.uuid4(), user_id=uuid.uuid4(), current_wallet_id=None,
+            created_at=datetime.utcnow(), expires_at=datetime.utcnow() + timedelta(days=1)
+        )
+        db = RecordingSession(session=session)
+        store = make_store(db)
+
+        assert await store.lookup(db, "old-token") == session.user_id
+        assert await store.lookup(db, "old-token") == session.user_id
+        assert db.queries == 1
+        assert store.pending == 1
+
+    async def test_idle_sessions_fold_into_behavior_patterns(self, memory_store):
+        db = RecordingSession()
+        store = make_store(db, idle_close_seconds=60)
+        user_id = uuid.uuid4()
+        tokens = [await store.create(db, {"user_id": user_id}) for _ in range(2)]
+        await store.lookup(db, tokens[0])
+
+        await store.flush()
+        assert db.executed[-1][0] == "user_sessions"
+
+        await store.flush(now=datetime.utcnow() + timedelta(seconds=120))
+        table, kind, rows = db.executed[-1]
+        assert (table, kind) == ("user_behavior_patterns", "Insert")
+        assert rows[0]["pattern_data"]["duration_count"] == 2
+        assert await store.flush(now=datetime.utcnow() + timedelta(seconds=240)) == 0
+
+    async def test_session_seen_by_two_workers_is_folded_once(self, memory_store):
+        db_a, db_b = RecordingSession(), RecordingSession()
+        worker_a, worker_b = make_store(db_a, idle_close_seconds=60), make_store(db_b, idle_close_seconds=60)
+        token = await worker_a.create(db_a, {"user_id": uuid.uuid4()})
+        await worker_b.lookup(db_b, token)
+        later = datetime.utcnow() + timedelta(seconds=120)
+
+        await worker_a.flush(now=later)
+        await worker_b.flush(now=later)
+
+        folds = [
+            rows for db in (db_a, db_b)
+            for table, _, rows in db.executed if table == "user_behavior_patterns"
+        ]
+        assert len(folds) == 1
+        assert folds[0][0]["pattern_data"]["duration_count"] == 1
+
+    async def test_claimed_close_is_retried_after_failed_flush(self, memory_store):
+        db = RecordingSession(fail=True)
+        store = make_store(db, idle_close_seconds=60)
+        await store.create(db, {"user_id": uuid.uuid4()})
+        later = datetime.utcnow() + timedelta(seconds=120)
+
+        with pytest.raises(RuntimeError):
+            await store.flush(now=later)
+        db.fail = False
+        db.executed.clear()
+        await store.flush(now=later)
+
+        assert [table for table, _, _ in db.executed] == ["user_sessions", "user_behavior_patterns"]
+        assert store._claimed == set()
+
@@ -0,0 +1,69 @@
+"""
+Tests for process-pool wallet signature verification.
+"""
+
+import sys
+import os
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import cbor2
+from eth_account import Account
+from eth_account.messages import encode_defunct
+from nacl.signing import SigningKey
+
+from app.core.signature_verifier import SignatureRequest, SignatureVerifier, signature_kind
+
+
+def evm_request(message, valid=True):
+    account = Account.create()
+    signed = Account.sign_message(encode_defunct(text=message), account.key)
+    address = account.address if valid else Account.create().address
+    return SignatureRequest("evm", message, signed.signature.hex(), address)
+
+
+def cardano_request(message, valid=True):
+    key = SigningKey.generate()
+    signature = key.sign(message.encode("utf-8") if valid else b"other").signature
+    signature_data = (
+        f'{{"signature": "{cbor2.dumps(signature).hex()}", '
+        f'"key": "{cbor2.dumps(bytes(key.verify_key)).hex()}"}}'
+    )
+    return SignatureRequest("cardano", message, signature_data, "addr_test1")
+
+
+@pytest.fixture(scope="module")
+def verifier():
+    verifier = SignatureVerifier(processes=2)
+    yield verifier
+    verifier.close()
+
+
+class TestSignatureVerifier:
+    """Batch verification through the process pool"""
+
+    def test_signature_kind(self):
+        assert signature_kind("metamask") == "evm"
+        assert signature_kind("HASHPACK") == "hedera"
+        assert signature_kind("LACE") == "cardano"
+        assert signature_kind("UNKNOWN") is None
+
+    async def test_verify_many_keeps_order(self, verifier):
+        requests = [
+            evm_request("login 1"),
+            cardano_request("login 2"),
+            evm_request("login 3", valid=False),
+            cardano_request("login 4", valid=False),
+            evm_request("login 5"),
+        ]
+
+        results = await verifier.verify_many(requests)
+
+        assert results == [True, True, False, False, True]
+
+    async def test_verify_single(self, verifier):
+        assert await verifier.verify(evm_request("login")) is True
+        assert await verifier.verify_many([]) == []
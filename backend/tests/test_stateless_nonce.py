@@ -0,0 +1,64 @@
+"""
+Tests for stateless HMAC-signed login nonces.
+"""
+
+import re
+import sys
+import os
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.stateless_nonce import BloomFilter, StatelessNonces
+from app.core.wallet_auth import WalletAuthenticator
+
+ADDRESS = "0.0.12345"
+NOW = 1_700_000_000
+
+
+@pytest.fixture
+def nonces():
+    return StatelessNonces(b"test-secret", ttl_seconds=300, capacity=1000)
+
+
+class TestStatelessNonce:
+    """Signature, expiry and replay checks"""
+
+    def test_nonce_fits_message_format(self, nonces):
+        nonce = nonces.issue(ADDRESS, now=NOW)
+        message = WalletAuthenticator.create_siwe_message(ADDRESS, nonce)
+
+        assert re.search(r'Nonce: ([a-f0-9]+)', message).group(1) == nonce
+
+    def test_valid_nonce_is_single_use(self, nonces):
+        nonce = nonces.issue(ADDRESS, now=NOW)
+
+        assert nonces.verify(nonce, ADDRESS, now=NOW + 10) is True
+        assert nonces.verify(nonce, ADDRESS, now=NOW + 20) is False
+
+    def test_rejects_other_address_and_tampering(self, nonces):
+        nonce = nonces.issue(ADDRESS, now=NOW)
+        tampered = nonce[:20] + ("0" if nonce[20] != "0" else "1") + nonce[21:]
+
+        assert nonces.verify(nonce, "0.0.99999", now=NOW) is False
+        assert nonces.verify(tampered, ADDRESS, now=NOW) is False
+        assert nonces.verify("abc123", ADDRESS, now=NOW) is False
+        assert StatelessNonces(b"other", 300, 1000).verify(nonce, ADDRESS, now=NOW) is False
+
+    def test_rejects_expired_and_future_nonces(self, nonces):
+        assert nonces.verify(nonces.issue(ADDRESS, now=NOW), ADDRESS, now=NOW + 301) is False
+        assert nonces.verify(nonces.issue(ADDRESS, now=NOW + 600), ADDRESS, now=NOW) is False
+
+    def test_old_buckets_are_dropped(self, nonces):
+        for offset in (0, 300, 600, 900):
+            assert nonces.verify(nonces.issue(ADDRESS, now=NOW + offset), ADDRESS, now=NOW + offset + 1)
+
+        assert len(nonces.replay_filter.buckets) <= 2
+
+    def test_bloom_filter(self):
+        bloom = BloomFilter(capacity=1000)
+
+        assert all(bloom.add(str(i).encode()) for i in range(1000))
+        assert not bloom.add(b"0")
@@ -0,0 +1,85 @@
+"""
+Tests for the authenticated user snapshot cache.
+"""
+
+import uuid
+import sys
+import os
+from datetime import datetime, timezone
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.user_cache import UserCache, _snapshot, _to_json, _from_json
+from app.models.user import User as UserModel, UserRole
+
+
+def make_user(**overrides):
+    fields = dict(
+        id=uuid.uuid4(),
+        email="farmer@example.com",
+        hashed_password="secret-hash",
+        full_name="Test Farmer",
+        role=UserRole.FARMER,
+        hedera_account_id="0.0.1234",
+        is_active=True,
+        is_verified=False,
+        created_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+    )
+    fields.update(overrides)
+    return UserModel(**fields)
+
+
+class TestUserCache:
+    """In-process behaviour of UserCache (Redis not connected)"""
+
+    async def test_hit_returns_detached_copy(self):
+        cache = UserCache()
+        user = make_user()
+
+        await cache.set(str(user.id), user)
+        cached = await cache.get(str(user.id))
+
+        assert cached is not user
+        assert cached.id == user.id
+        assert cached.role == UserRole.FARMER
+        assert cached.hashed_password is None
+
+    async def test_invalidate_drops_entry(self):
+        cache = UserCache()
+        user = make_user()
+
+        await cache.set(str(user.id), user)
+        await cache.invalidate(user.id)
+
+        assert await cache.get(str(user.id)) is None
+
+    async def test_expired_entries_are_ignored(self):
+        cache = UserCache(ttl_seconds=0)
+        user = make_user()
+
+        await cache.set(str(user.id), user)
+
+        assert await cache.get(str(user.id)) is None
+
+    async def test_lru_evicts_oldest(self):
+        cache = UserCache(max_size=2)
+        users = [make_user(hedera_account_id=f"0.0.{i}") for i in range(3)]
+
+        for user in users:
+            await cache.set(str(user.id), user)
+
+        assert await cache.get(str(users[0].id)) is None
+        assert (await cache.get(str(users[2].id))).id == users[2].id
+
+    def test_json_round_trip_restores_types(self):
+        user = make_user()
+
+        restored = _from_json(_to_json(_snapshot(user)))
+
+        assert restored["id"] == user.id
+        assert restored["role"] == UserRole.FARMER
+        assert restored["created_at"] == user.created_at
+        assert "hashed_password" not in restored
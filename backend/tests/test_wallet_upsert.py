@@ -0,0 +1,147 @@
+"""
+Tests for the single-statement wallet login upsert.
+"""
+
+import sys
+import os
+import uuid
+from types import SimpleNamespace
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy.dialects import postgresql
+
+from app.models.user import User
+from app.services.multi_wallet_auth import MultiWalletAuthService
+
+ACCOUNT = "0.0.4515312"
+
+
+class FakeResult:
+    def __init__(self, row):
+        self.row = row
+
+    def first(self):
+        return self.row
+
+
+class FakeSession:
+    """Returns one queued row per execute and records commits"""
+
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.statements = []
+        self.commits = 0
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return FakeResult(self.rows.pop(0))
+
+    async def commit(self):
+        self.commits += 1
+
+
+def compile_sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class TestResolveWalletUserStatement:
+    def _sql(self, create_user=True):
+        service = MultiWalletAuthService(FakeSession([]))
+        return compile_sql(service._resolve_wallet_user_statement(
+            ACCOUNT, ACCOUNT, "HASHPACK", None, create_user
+        ))
+
+    def test_is_one_statement_with_all_steps(self):
+        sql = self._sql()
+        assert sql.count(";") == 0
+        for cte in ("found_wallet", "touched", "new_user", "resolved", "new_wallet"):
+            assert f"{cte} AS" in sql
+
+    def test_inserts_are_conflict_safe(self):
+        sql = self._sql()
+        assert "ON CONFLICT (hedera_account_id) DO NOTHING" in sql
+        assert "ON CONFLICT (wallet_address, wallet_type) DO UPDATE" in sql
+
+    def test_looks_up_wallet_by_address_and_type(self):
+        sql = self._sql()
+        found = sql[sql.index("found_wallet AS"):sql.index("touched AS")]
+        assert "user_wallets.wallet_address = " in found
+        assert "user_wallets.wallet_type = " in found
+
+    def test_returns_user_columns_and_markers(self):
+        sql = self._sql()
+        assert "is_new_user" in sql
+        assert "resolved_wallet_id" in sql
+        assert "UNION ALL" in sql
+
+
+class TestResolveWalletUser:
+    async def test_returns_resolved_row(self):
+        user = User(id=uuid.uuid4(), hedera_account_id=ACCOUNT)
+        wallet_id = uuid.uuid4()
+        db = FakeSession([(user, True, wallet_id)])
+
+        result = await MultiWalletAuthService(db).resolve_wallet_user(ACCOUNT, ACCOUNT, "HASHPACK")
+
+        assert result == (user, True, wallet_id)
+        assert len(db.statements) == 1
+        # The request's unit of work commits
+        assert db.commits == 0
+
+    async def test_retries_once_after_concurrent_insert(self):
+        user = User(id=uuid.uuid4(), hedera_account_id=ACCOUNT)
+        wallet_id = uuid.uuid4()
+        db = FakeSession([None, (user, False, wallet_id)])
+
+        result = await MultiWalletAuthService(db).resolve_wallet_user(ACCOUNT, ACCOUNT, "HASHPACK")
+
+        assert result == (user, False, wallet_id)
+        assert len(db.statements) == 2
+
+    async def test_gives_up_after_second_miss(self):
+        db = FakeSession([None, None])
+
+        result = await MultiWalletAuthService(db).resolve_wallet_user(ACCOUNT, ACCOUNT, "HASHPACK")
+
+        assert result == (None, False, None)
+        assert len(db.statements) == 2
+
+    async def test_lookup_only_does_not_retry(self):
+        db = FakeSession([None])
+
+        result = await MultiWalletAuthService(db).resolve_wallet_user(
+            ACCOUNT, ACCOUNT, "HASHPACK", create_user=False
+        )
+
+        assert result == (None, False, None)
+        assert len(db.statements) == 1
+
+
+class RowcountSession(FakeSession):
+    """Reports a queued rowcount per execute"""
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return SimpleNamespace(rowcount=self.rows.pop(0))
+
+
+class TestSetPrimaryWallet:
+    async def test_promotes_then_demotes_others(self):
+        db = RowcountSession([1, 2])
+
+        assert await MultiWalletAuthService(db).set_primary_wallet(str(uuid.uuid4()), str(uuid.uuid4()))
+
+        promote, demote = [compile_sql(statement) for statement in db.statements]
+        assert "user_wallets.id = " in promote
+        assert "user_wallets.id != " in demote
+        assert db.commits == 0
+
+    async def test_foreign_wallet_leaves_primary_untouched(self):
+        db = RowcountSession([0])
+
+        assert not await MultiWalletAuthService(db).set_primary_wallet(str(uuid.uuid4()), str(uuid.uuid4()))
+
+        assert len(db.statements) == 1
+        assert db.commits == 0
@@ -0,0 +1,118 @@
+"""
+Postgres integration tests for the single-statement wallet login upsert.
+
+Runs against the database in TEST_DATABASE_URL (a disposable database; the
+users and user_wallets tables are created if missing) and is skipped when
+it is not set or not reachable.
+"""
+
+import sys
+import os
+import asyncio
+import uuid
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.database import Base
+from app.models.user import User
+from app.models.user_wallet import UserWallet
+from app.services.multi_wallet_auth import MultiWalletAuthService
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL", "")
+
+pytestmark = pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL not set")
+
+
+@pytest.fixture
+async def sessions():
+    url = TEST_DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
+    engine = create_async_engine(url)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=[User.__table__, UserWallet.__table__])
+    except Exception as e:
+        await engine.dispose()
+        pytest.skip(f"Postgres not reachable: {e}")
+
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    created = []
+    yield factory, created
+
+    async with factory() as db:
+        await db.execute(delete(User).where(User.hedera_account_id.in_(created)))
+        await db.commit()
+    await engine.dispose()
+
+
+async def resolve(factory, account, wallet_type="HASHPACK"):
+    async with factory() as db:
+        result = await MultiWalletAuthService(db).resolve_wallet_user(account, account, wallet_type)
+        await db.commit()
+        return result
+
+
+async def count_rows(factory, account):
+    async with factory() as db:
+        users = await db.scalar(select(func.count()).select_from(User).where(User.hedera_account_id == account))
+        wallets = await db.scalar(select(func.count()).select_from(UserWallet).where(UserWallet.wallet_address == account))
+        return users, wallets
+
+
+def new_account(created):
+    account = f"0.0.{uuid.uuid4().int % 10**9}"
+    created.append(account)
+    return account
+
+
+class TestResolveWalletUserPostgres:
+    async def test_new_wallet_creates_user_and_primary_wallet(self, sessions):
+        factory, created = sessions
+        account = new_account(created)
+
+        user, is_new_user, wallet_id = await resolve(factory, account)
+
+        assert is_new_user
+        assert user.hedera_account_id == account
+        assert wallet_id is not None
+        assert await count_rows(factory, account) == (1, 1)
+
+    async def test_existing_wallet_resolves_to_same_user(self, sessions):
+        factory, created = sessions
+        account = new_account(created)
+        first_user, _, first_wallet = await resolve(factory, account)
+
+        user, is_new_user, wallet_id = await resolve(factory, account)
+
+        assert not is_new_user
+        assert user.id == first_user.id
+        assert wallet_id == first_wallet
+        assert await count_rows(factory, account) == (1, 1)
+
+    async def test_same_address_other_type_is_a_separate_wallet(self, sessions):
+        factory, created = sessions
+        account = new_account(created)
+        first_user, _, first_wallet = await resolve(factory, account, "HASHPACK")
+
+        user, is_new_user, wallet_id = await resolve(factory, account, "BLADE")
+
+        assert not is_new_user
+        assert user.id == first_user.id
+        assert wallet_id != first_wallet
+        assert await count_rows(factory, account) == (1, 2)
+
+    async def test_concurrent_first_logins_share_one_user(self, sessions):
+        factory, created = sessions
+        account = new_account(created)
+
+        results = await asyncio.gather(*[resolve(factory, account) for _ in range(4)])
+
+        assert len({user.id for user, _, _ in results}) == 1
+        assert len({wallet_id for _, _, wallet_id in results}) == 1
+        assert sum(is_new_user for _, is_new_user, _ in results) == 1
+        assert await count_rows(factory, account) == (1, 1)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+EVM signature recovery microbenchmark for HarvestLedger
+
+Compares eth_account's recover_message with the coincurve/pycryptodome
+fast path used by WalletAuthenticator.verify_evm_signature, both cold
+(unique signatures) and warm (duplicate submissions served by the LRU).
+
+Usage:
+    python scripts/benchmark_ecrecover.py --signatures 2000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add the backend directory to the Python path
+backend_path = Path(__file__).parent.parent / "backend"
+sys.path.insert(0, str(backend_path))
+
+try:
+    from eth_account import Account
+    from eth_account.messages import encode_defunct
+    from app.core import evm_signatures
+except ImportError as e:
+    print(f"❌ Failed to import HarvestLedger modules: {e}")
+    print("cd backend && pip install -r requirements.txt")
+    sys.exit(1)
+
+
+def measure(label, call, samples):
+    started = time.perf_counter()
+    for message, signature, address in samples:
+        if call(message, signature) != address:
+            raise RuntimeError(f"{label}: recovered the wrong address")
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28} {len(samples) / elapsed:10.0f} verifies/s   {elapsed / len(samples) * 1e6:8.1f} µs/verify")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark EVM signature recovery")
+    parser.add_argument("--signatures", type=int, default=2000)
+    args = parser.parse_args()
+
+    if not evm_signatures.FAST_ECRECOVER_AVAILABLE:
+        print("❌ coincurve and pycryptodome are required for the fast path")
+        sys.exit(1)
+
+    print(f"🔐 Signing {args.signatures} login messages...")
+    account = Account.create()
+    samples = []
+    for i in range(args.signatures):
+        message = f"localhost:3000 wants you to sign in with your Hedera account:\nNonce: {i:032x}"
+        signed = Account.sign_message(encode_defunct(text=message), account.key)
+        samples.append((message, bytes(signed.signature), account.address.lower()))
+    print("=" * 72)
+
+    def eth_account_recover(message, signature):
+        return Account.recover_message(encode_defunct(text=message), signature=signature).lower()
+
+    def fast_recover(message, signature):
+        return evm_signatures.recover_address(evm_signatures.personal_message_hash(message), signature)
+
+    measure("eth_account", eth_account_recover, samples)
+    evm_signatures.recover_address.cache_clear()
+    measure("coincurve (cold cache)", fast_recover, samples[:4096])
+    measure("coincurve (duplicates)", fast_recover, samples[:4096])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+GraphQL throughput benchmark for HarvestLedger
+
+Drives the /graphql endpoint with many concurrent clients and reports
+requests per second and latency percentiles. Run it against a backend
+started with `make dev` (or any reachable deployment).
+
+Usage:
+    python scripts/benchmark_graphql.py --clients 100 --duration 30
+    python scripts/benchmark_graphql.py --query "{ harvests { edges { node { id cropType } } } }"
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+
+try:
+    import httpx
+except ImportError:
+    print("❌ httpx is required: pip install httpx")
+    sys.exit(1)
+
+
+DEFAULT_QUERY = "{ harvests { edges { node { id cropType quantity status } } } }"
+
+
+async def run_client(client, url, payload, deadline, latencies, errors):
+    """Issue requests back-to-back until the deadline passes"""
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            response = await client.post(url, json=payload)
+            if response.status_code != 200 or "errors" in response.json():
+                errors.append(response.status_code)
+                continue
+        except httpx.HTTPError as e:
+            errors.append(type(e).__name__)
+            continue
+        latencies.append(time.perf_counter() - started)
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not values:
+        return 0.0
+    index = max(0, min(len(values) - 1, int(round(pct / 100 * len(values))) - 1))
+    return values[index]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark the GraphQL endpoint")
+    parser.add_argument("--url", default="http://localhost:8000/graphql")
+    parser.add_argument("--clients", type=int, default=100, help="Concurrent clients")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run")
+    parser.add_argument("--query", default=DEFAULT_QUERY)
+    parser.add_argument("--token", help="Bearer token for authenticated queries")
+    args = parser.parse_args()
+
+    headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+    payload = {"query": args.query}
+    limits = httpx.Limits(max_connections=args.clients, max_keepalive_connections=args.clients)
+
+    print(f"🚀 {args.clients} clients → {args.url} for {args.duration:.0f}s")
+
+    latencies = []
+    errors = []
+    async with httpx.AsyncClient(headers=headers, limits=limits, timeout=30.0) as client:
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(*[
+            run_client(client, args.url, payload, deadline, latencies, errors)
+            for _ in range(args.clients)
+        ])
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print("=" * 60)
+    print(f"Requests:   {len(latencies)} ok, {len(errors)} failed")
+    print(f"Throughput: {len(latencies) / elapsed:.1f} req/s")
+    if latencies:
+        print(f"Latency:    p50 {percentile(latencies, 50) * 1000:.1f} ms, "
+              f"p99 {percentile(latencies, 99) * 1000:.1f} ms, "
+              f"mean {statistics.mean(latencies) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Bulk harvest import benchmark for HarvestLedger
+
+Streams a generated CSV season log to POST /harvests/import and reports
+rows per second. Run it against a backend started with `make dev`.
+
+Usage:
+    python scripts/benchmark_harvest_import.py --rows 100000 --token <jwt>
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+
+try:
+    import httpx
+except ImportError:
+    print("❌ httpx is required: pip install httpx")
+    sys.exit(1)
+
+
+CROPS = ["corn", "wheat", "soybeans", "rice", "cotton", "tomatoes", "potatoes"]
+
+
+async def generate_csv(rows, invalid_every):
+    """Yield the CSV body in ~64KB chunks"""
+    lines = ["crop_type,variety,quantity,unit,farm_location,harvest_date,organic_certified\n"]
+    size = len(lines[0])
+    for i in range(rows):
+        quantity = "n/a" if invalid_every and i % invalid_every == 0 else f"{random.uniform(0.5, 40):.2f}"
+        line = f"{random.choice(CROPS)},Season {i % 12},{quantity},tons,Farm {i % 500},2024-06-01,false\n"
+        lines.append(line)
+        size += len(line)
+        if size >= 64 * 1024:
+            yield "".join(lines).encode()
+            lines, size = [], 0
+    if lines:
+        yield "".join(lines).encode()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark the bulk harvest import endpoint")
+    parser.add_argument("--url", default="http://localhost:8000/harvests/import")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--invalid-every", type=int, default=1000, help="Make every Nth row invalid (0 = none)")
+    parser.add_argument("--token", required=True, help="Bearer token of the importing farmer")
+    args = parser.parse_args()
+
+    headers = {"Authorization": f"Bearer {args.token}", "Content-Type": "text/csv"}
+    print(f"🚀 Importing {args.rows} rows into {args.url}")
+    print("=" * 60)
+
+    started = time.perf_counter()
+    async with httpx.AsyncClient(timeout=None) as client:
+        response = await client.post(args.url, content=generate_csv(args.rows, args.invalid_every), headers=headers)
+    elapsed = time.perf_counter() - started
+
+    if response.status_code != 200:
+        print(f"❌ Import failed: {response.status_code} {response.text[:200]}")
+        sys.exit(1)
+
+    result = response.json()
+    print(f"Inserted:   {result['inserted']}")
+    print(f"Rejected:   {result['failed']}")
+    print(f"Elapsed:    {elapsed:.2f} s")
+    print(f"Throughput: {args.rows / elapsed:.0f} rows/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Mirror node client benchmark for HarvestLedger
+
+Compares the pooled HederaClient mirror node client against opening a new
+httpx.AsyncClient per query (the previous behaviour). Both run 1k sequential
+and 1k concurrent queries against a local stub server with simulated
+latency, and p50/p99 latencies are reported.
+
+Usage:
+    python scripts/benchmark_mirror_node.py --queries 1000 --latency 0.005
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add the backend directory to the Python path
+backend_path = Path(__file__).parent.parent / "backend"
+sys.path.insert(0, str(backend_path))
+
+try:
+    import httpx
+    from app.core.hedera import HederaClient
+    from tests.stub_servers import StubServer, StubStats, create_mirror_node_app
+except ImportError as e:
+    print(f"❌ Failed to import HarvestLedger modules: {e}")
+    print("cd backend && pip install -r requirements.txt")
+    sys.exit(1)
+
+from benchmark_graphql import percentile
+
+
+async def timed(call):
+    started = time.perf_counter()
+    result = await call()
+    if result is None:
+        raise RuntimeError("Mirror query failed")
+    return time.perf_counter() - started
+
+
+def report(label, latencies, elapsed):
+    latencies = sorted(latencies)
+    print(f"{label:<28} p50 {percentile(latencies, 50) * 1000:7.2f} ms   "
+          f"p99 {percentile(latencies, 99) * 1000:7.2f} ms   "
+          f"{len(latencies) / elapsed:8.1f} req/s")
+
+
+async def run(label, query, queries, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with semaphore:
+            return await timed(lambda: query(i))
+
+    started = time.perf_counter()
+    if concurrency == 1:
+        latencies = [await timed(lambda: query(i)) for i in range(queries)]
+    else:
+        latencies = await asyncio.gather(*[one(i) for i in range(queries)])
+    report(label, latencies, time.perf_counter() - started)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark mirror node queries")
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.005, help="Stub latency in seconds")
+    args = parser.parse_args()
+
+    stats = StubStats()
+    stats.reset(latency=args.latency)
+    server = StubServer(create_mirror_node_app(stats)).start()
+
+    async def per_call_client(i):
+        # Previous behaviour: new client (and connection) for every query
+        async with httpx.AsyncClient() as client:
+            response = await client.get(f"{server.url}/tokens/0.0.{10000 + i}")
+            response.raise_for_status()
+            return response.json()
+
+    hedera = HederaClient()
+    hedera.mirror = HederaClient._create_mirror_client(server.url)
+
+    async def pooled_client(i):
+        return await hedera.get_token_info(f"0.0.{10000 + i}")
+
+    print(f"🚀 {args.queries} mirror queries, stub latency {args.latency * 1000:.1f} ms")
+    print("=" * 80)
+    try:
+        await run("per-call client, sequential", per_call_client, args.queries, 1)
+        await run("pooled client, sequential", pooled_client, args.queries, 1)
+        await run(f"per-call client, x{args.concurrency}", per_call_client, args.queries, args.concurrency)
+        await run(f"pooled client, x{args.concurrency}", pooled_client, args.queries, args.concurrency)
+    finally:
+        await hedera.close()
+        server.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Redis auth round-trip benchmark for HarvestLedger
+
+Times each auth step against a local Redis two ways: the previous
+command-by-command sequences (GET + DEL nonce, GET/GET/INCR/DEL OTP
+checks, two SETEXs, GET/GET/DEL/DEL email lookup) and the current
+GETDEL / pipeline / EVALSHA versions in RedisClient and OTPService.
+
+Usage:
+    python scripts/benchmark_redis_auth.py --url redis://localhost:6379/15 --iterations 2000
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add the backend directory to the Python path
+backend_path = Path(__file__).parent.parent / "backend"
+sys.path.insert(0, str(backend_path))
+
+try:
+    import redis.asyncio as redis
+    from app.core.redis_client import redis_client
+    from app.services.otp_service import OTPService
+except ImportError as e:
+    print(f"❌ Failed to import HarvestLedger modules: {e}")
+    print("cd backend && pip install -r requirements.txt")
+    sys.exit(1)
+
+
+async def measure(label, setup, step, iterations):
+    timings = []
+    for i in range(iterations):
+        await setup(i)
+        started = time.perf_counter()
+        await step(i)
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    p50 = statistics.median(timings) * 1e6
+    p99 = timings[int(len(timings) * 0.99) - 1] * 1e6
+    print(f"{label:<36} p50 {p50:8.1f} µs   p99 {p99:8.1f} µs")
+
+
+async def legacy_get_nonce(conn, i):
+    address = await conn.get(f"nonce:{i}")
+    if address:
+        await conn.delete(f"nonce:{i}")
+    return address
+
+
+async def legacy_verify_otp(conn, i):
+    key, attempts_key = f"otp:verification:{i}", f"otp_attempts:verification:{i}"
+    stored = await conn.get(key)
+    attempts = int(await conn.get(attempts_key) or 0)
+    if attempts >= OTPService.MAX_ATTEMPTS:
+        await conn.delete(key)
+        await conn.delete(attempts_key)
+        return False
+    if stored != "123456":
+        await conn.incr(attempts_key)
+        return False
+    await conn.delete(key)
+    await conn.delete(attempts_key)
+    return True
+
+
+async def legacy_store_verified_email(conn, i):
+    await conn.setex(f"verified_email:token{i}", 1800, f"user{i}@example.com")
+    await conn.setex(f"email_verification_token:user{i}@example.com", 1800, f"token{i}")
+
+
+async def legacy_consume_verified_email(conn, i):
+    token = await conn.get(f"email_verification_token:user{i}@example.com")
+    if token and await conn.get(f"verified_email:{token}"):
+        await conn.delete(f"email_verification_token:user{i}@example.com")
+        await conn.delete(f"verified_email:{token}")
+        return True
+    return False
+
+
+async def run(args):
+    conn = redis.from_url(args.url, decode_responses=True)
+    try:
+        await conn.ping()
+    except Exception as e:
+        print(f"❌ Cannot reach Redis at {args.url}: {e}")
+        sys.exit(1)
+    redis_client.attach(conn)
+    await redis_client.preload_scripts()
+
+    async def store_nonce(i):
+        await conn.setex(f"nonce:{i}", 300, "0xaddress")
+
+    async def store_otp(i):
+        await OTPService.store_otp(str(i), "123456")
+
+    async def store_email(i):
+        await OTPService.store_verified_email(f"user{i}@example.com")
+
+    async def noop(i):
+        pass
+
+    n = args.iterations
+    print(f"🔁 {n} iterations per step against {args.url}")
+    print("=" * 72)
+    await measure("nonce: GET + DEL", store_nonce, lambda i: legacy_get_nonce(conn, i), n)
+    await measure("nonce: GETDEL", store_nonce, lambda i: redis_client.get_nonce(str(i)), n)
+    await measure("otp verify: GET/GET/DEL/DEL", store_otp, lambda i: legacy_verify_otp(conn, i), n)
+    await measure("otp verify: EVALSHA", store_otp, lambda i: OTPService.verify_otp(str(i), "123456"), n)
+    await measure("verified email: 2x SETEX", noop, lambda i: legacy_store_verified_email(conn, i), n)
+    await measure("verified email: MULTI/EXEC", noop, lambda i: OTPService.store_verified_email(f"user{i}@example.com"), n)
+    await measure("email lookup: GET/GET/DEL/DEL", store_email, lambda i: legacy_consume_verified_email(conn, i), n)
+    await measure("email lookup: EVALSHA", store_email, lambda i: OTPService.consume_verified_email(f"user{i}@example.com"), n)
+
+    await conn.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Redis auth round-trips")
+    parser.add_argument("--url", default="redis://localhost:6379/15", help="Redis URL (use a scratch database)")
+    parser.add_argument("--iterations", type=int, default=2000)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
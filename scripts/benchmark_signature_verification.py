@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Wallet signature verification benchmark for HarvestLedger
+
+Signs a mix of EVM (secp256k1) and Cardano (CIP-30 Ed25519) login
+messages, then verifies them inline on one core and through the
+SignatureVerifier process pool. Reports verifications per second overall
+and per worker process.
+
+Usage:
+    python scripts/benchmark_signature_verification.py --signatures 2000 --processes 4
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add the backend directory to the Python path
+backend_path = Path(__file__).parent.parent / "backend"
+sys.path.insert(0, str(backend_path))
+
+try:
+    import cbor2
+    from eth_account import Account
+    from eth_account.messages import encode_defunct
+    from nacl.signing import SigningKey
+    from app.core.signature_verifier import SignatureRequest, SignatureVerifier, verify_signature
+except ImportError as e:
+    print(f"❌ Failed to import HarvestLedger modules: {e}")
+    print("cd backend && pip install -r requirements.txt")
+    sys.exit(1)
+
+
+def make_requests(count):
+    """Half EVM, half Cardano signatures over distinct messages"""
+    evm_account = Account.create()
+    cardano_key = SigningKey.generate()
+    cardano_public = cbor2.dumps(bytes(cardano_key.verify_key)).hex()
+
+    requests = []
+    for i in range(count):
+        message = f"localhost:3000 wants you to sign in\nNonce: {i:032x}"
+        if i % 2 == 0:
+            signed = Account.sign_message(encode_defunct(text=message), evm_account.key)
+            requests.append(SignatureRequest("evm", message, signed.signature.hex(), evm_account.address))
+        else:
+            signature = cardano_key.sign(message.encode("utf-8")).signature
+            signature_data = f'{{"signature": "{cbor2.dumps(signature).hex()}", "key": "{cardano_public}"}}'
+            requests.append(SignatureRequest("cardano", message, signature_data, f"addr_test{i}"))
+    return requests
+
+
+def report(label, count, elapsed, workers):
+    rate = count / elapsed
+    print(f"{label:<26} {rate:9.1f} sig/s   {rate / workers:9.1f} sig/s per core")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark wallet signature verification")
+    parser.add_argument("--signatures", type=int, default=2000)
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    print(f"🔐 Signing {args.signatures} messages...")
+    requests = make_requests(args.signatures)
+    print("=" * 70)
+
+    # Silence the per-signature logging from WalletAuthenticator, including
+    # in the worker processes, which inherit file descriptor 1
+    sys.stdout.flush()
+    saved_stdout = os.dup(1)
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    try:
+        started = time.perf_counter()
+        inline = [verify_signature(request) for request in requests]
+        inline_elapsed = time.perf_counter() - started
+
+        verifier = SignatureVerifier(processes=args.processes)
+        await verifier.verify_many(requests[:args.processes])  # start workers
+
+        started = time.perf_counter()
+        pooled = await verifier.verify_many(requests)
+        pooled_elapsed = time.perf_counter() - started
+        verifier.close()
+    finally:
+        sys.stdout.flush()
+        os.dup2(saved_stdout, 1)
+        os.close(devnull)
+        os.close(saved_stdout)
+
+    if not all(inline) or pooled != inline:
+        print("❌ Verification results disagree or signatures failed")
+        sys.exit(1)
+
+    report("inline (event loop)", args.signatures, inline_elapsed, 1)
+    report(f"process pool x{args.processes}", args.signatures, pooled_elapsed, args.processes)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
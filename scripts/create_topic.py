@@ -45,7 +45,7 @@ async def create_supply_chain_topic():
     client = HederaClient()
     await client.initialize()
     
-    if not client.client:
+    if not await client.connect():
         print("❌ Failed to initialize Hedera client")
         return None
     
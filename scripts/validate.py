@@ -92,9 +92,9 @@ async def test_hedera_connection():
         backend_path = Path(__file__).parent.parent / "backend"
         sys.path.insert(0, str(backend_path))
         
-        from app.core.hedera import HederaClient, HEDERA_AVAILABLE
+        from app.core.hedera import HederaClient, load_sdk
         
-        if not HEDERA_AVAILABLE:
+        if not load_sdk().available:
             print("⚠️  Hedera SDK not available - using mock implementation")
             print("✅ Mock mode working (suitable for development)")
             return True
@@ -102,7 +102,7 @@ async def test_hedera_connection():
         client = HederaClient()
         await client.initialize()
         
-        if client.client:
+        if await client.connect():
             print("✅ Hedera client initialized successfully")
             return True
         else: